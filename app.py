@@ -1,5 +1,7 @@
 # === Python Modules ===
 import os
+import json
+import time
 import streamlit as st
 import requests
 from dotenv import load_dotenv
@@ -7,7 +9,6 @@ from dotenv import load_dotenv
 # === Utils ===
 from rag_pipeline.utils.common import (
     init_session,
-    stream_text,
     load_yaml
 )
 
@@ -15,6 +16,78 @@ from rag_pipeline.utils.common import (
 load_dotenv()
 API_URL = os.getenv("API_URL")
 
+# === Poll an Ingestion Job Until It Finishes ===
+def wait_for_ingestion(
+        job_id: str,
+        poll_interval: float = 0.5
+) -> dict:
+    """
+    Polls `/upload/status/{job_id}` and renders per-stage progress until the job ends.
+    """
+    progress_bar = st.progress(0.0, text = "Queued...")
+
+    while True:
+        job = requests.get(f"{API_URL}/upload/status/{job_id}", timeout = 30).json()
+        if job.get("status") != "success" or job.get("job_status") in ("completed", "failed"):
+            progress_bar.empty()
+            return job
+
+        stages = job.get("stages", [])
+        running = next((s for s in stages if s["status"] == "running"), None)
+        overall = sum(s["progress"] for s in stages) / max(len(stages), 1)
+        label = f"{running['name'].capitalize()}... {running['progress']:.0%}" if running else "Queued..."
+        progress_bar.progress(min(overall, 1.0), text = label)
+
+        time.sleep(poll_interval)
+
+# === Stream an Answer from the Backend ===
+def stream_answer(
+        session_id: str,
+        user_query: str,
+        status_box
+):
+    """
+    Reads server-sent events of `/query/stream`: node progress goes to `status_box`,
+    answer tokens are yielded as they arrive (for `st.write_stream`).
+    """
+    with requests.post(
+        url = f"{API_URL}/query/stream",
+        json = {
+            "session_id": session_id,
+            "user_query": user_query
+        },
+        stream = True,
+        timeout = 120
+    ) as resp:
+        if resp.status_code != 200:
+            yield f"❌ Server responded with status {resp.status_code}"
+            return
+
+        event, streamed = None, False
+        for line in resp.iter_lines(decode_unicode = True):
+            if line.startswith("event: "):
+                event = line[len("event: "):]
+                continue
+            if not line.startswith("data: "):
+                continue
+
+            data = json.loads(line[len("data: "):])
+            if event == "node":
+                status_box.caption(f"⚙️ {data['node'].replace('_node', '').replace('_', ' ')} done")
+
+            elif event == "token":
+                streamed = True
+                yield data["delta"]
+
+            elif event == "done":
+                status_box.empty()
+                if not streamed:
+                    yield data.get("answer", "No answer returned.")
+
+            elif event == "error":
+                status_box.empty()
+                yield f"⚠️ {data.get('message', 'Query failed')}"
+
 # === Main UI Body ===
 def main():
     """
@@ -65,7 +138,12 @@ def main():
                             data = resp.json()
                             if data.get("status") == "success":
                                 st.session_state.session_id = data["session_id"]
-                                st.success(f"✅ Uploaded {len(uploaded_files)} files under session **{data['session_id']}**")
+                                job = wait_for_ingestion(data["job_id"])
+
+                                if job.get("job_status") == "completed":
+                                    st.success(f"✅ Uploaded {len(uploaded_files)} files under session **{data['session_id']}**")
+                                else:
+                                    st.error(f"⚠️ Ingestion failed: {job.get('error') or job.get('message')}")
                             else:
                                 st.error(f"⚠️ {data.get('message', 'Upload failed')}")
 
@@ -88,18 +166,10 @@ def main():
     if "messages" not in st.session_state:
         st.session_state.messages = []
 
-    if "pending_stream" not in st.session_state:
-        st.session_state.pending_stream = None
-
     # === Display Chat History ===
     for msg in st.session_state.messages:
         with st.chat_message(msg["role"]):
-            if msg["role"] == "assistant" and msg["content"] == st.session_state["pending_stream"]:
-                st.write_stream(stream_text(msg["content"]))
-                st.session_state.pending_stream = None
-
-            else:
-                st.markdown(msg["content"])
+            st.markdown(msg["content"])
 
     # === User Input ===
     user_query = st.chat_input("Ask your question here...")
@@ -118,31 +188,23 @@ def main():
         with st.chat_message("user"):
             st.markdown(user_query)
 
-        # Show a spinner for the assistant reply while processing
+        # Render the answer tokens as the backend streams them
         with st.chat_message("assistant"):
-            with st.spinner("🤖 Thinking..."):
-                try:
-                    resp = requests.post(
-                        url = f"{API_URL}/query/",
-                        json = {
-                            "session_id": st.session_state["session_id"],
-                            "user_query": user_query
-                        },
-                        timeout = 120
+            status_box = st.empty()
+            status_box.caption("🤖 Thinking...")
+            try:
+                bot_reply = st.write_stream(
+                    stream_answer(
+                        session_id = st.session_state["session_id"],
+                        user_query = user_query,
+                        status_box = status_box
                     )
+                )
 
-                    if resp.status_code == 200:
-                        data = resp.json()
-                        if data.get("status") == "success":
-                            bot_reply = data.get("answer", "No answer returned.")
-                        else:
-                            bot_reply = f"⚠️ {data.get('message', 'Query failed')}"
-
-                    else:
-                        bot_reply = f"❌ Server responded with status {resp.status_code}"
-
-                except Exception as e:
-                    bot_reply = f"⚠️ Error connecting to backend: {str(e)}"
+            except Exception as e:
+                status_box.empty()
+                bot_reply = f"⚠️ Error connecting to backend: {str(e)}"
+                st.markdown(bot_reply)
 
         # Store assistant message
         st.session_state.messages.append(
@@ -151,9 +213,6 @@ def main():
                 "content": bot_reply
             }
         )
-        st.session_state.pending_stream = bot_reply
-
-        st.rerun()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
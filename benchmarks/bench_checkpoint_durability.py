@@ -0,0 +1,103 @@
+"""
+Benchmark: per-query latency and checkpoint store operations by durability mode.
+
+Runs the compiled RAG graph (fake LLMs, deterministic embeddings) against a
+local MongoDB stand-in: an in-memory saver that sleeps `--latency-ms` per
+operation (one round trip) and counts reads, checkpoint writes and write batches.
+Compared: LangGraph durability "sync", "async" and "exit", each with and without
+the BufferedCheckpointer (hot threads in memory, batched flushes).
+
+Run from the repository root:
+    python -m benchmarks.bench_checkpoint_durability --queries 30 --threads 5 --latency-ms 3
+"""
+# === Python Modules ===
+import time
+import asyncio
+import argparse
+import contextlib
+import numpy as np
+from langgraph.checkpoint.memory import InMemorySaver
+
+# === Local Imports ===
+from graph import run_graph
+from benchmarks.bench_checkpoint_size import FakeClients, build_retriever
+from rag_pipeline.components.checkpointing import BufferedCheckpointer
+
+# === MongoDB Stand-in: one round trip per operation ===
+class LatencySaver(InMemorySaver):
+    def __init__(self, latency_s: float):
+        super().__init__()
+        self.latency_s = latency_s
+        self.ops = {"reads": 0, "puts": 0, "put_writes": 0}
+
+    async def aget_tuple(self, config):
+        self.ops["reads"] += 1
+        await asyncio.sleep(self.latency_s)
+        return self.get_tuple(config)
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        self.ops["puts"] += 1
+        await asyncio.sleep(self.latency_s)
+        return self.put(config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config, writes, task_id, task_path = ""):
+        self.ops["put_writes"] += 1
+        await asyncio.sleep(self.latency_s)
+        return self.put_writes(config, writes, task_id, task_path)
+
+async def measure(
+        retriever,
+        durability: str,
+        buffered: bool,
+        n_queries: int,
+        n_threads: int,
+        latency_s: float
+) -> dict:
+    backing = LatencySaver(latency_s)
+    checkpointer = BufferedCheckpointer(backing, flush_interval_s = 0.05) if buffered else backing
+    graph = run_graph(checkpointer = checkpointer)
+
+    latencies = []
+    with contextlib.redirect_stdout(None):
+        for q in range(n_queries):
+            config = {"configurable": {"retriever": retriever, "llm_clients": FakeClients(), "thread_id": f"thread-{q % n_threads}"}}
+            start = time.perf_counter()
+            await graph.ainvoke({"question": f"Which supplier report covers part PN-{q:05d}?"}, config, durability = durability)
+            latencies.append(time.perf_counter() - start)
+
+        if buffered:
+            await checkpointer.aclose()
+
+    return {
+        "mean_ms": float(np.mean(latencies) * 1000),
+        "p95_ms": float(np.percentile(latencies, 95) * 1000),
+        **{f"{name}_per_query": count / n_queries for name, count in backing.ops.items()}
+    }
+
+# === Benchmark Runner ===
+def run(
+        n_queries: int = 30,
+        n_threads: int = 5,
+        latency_ms: float = 3.0
+) -> dict:
+    retriever = build_retriever(200, 512)
+    report = {}
+    for durability in ("sync", "async", "exit"):
+        for buffered in (False, True):
+            name = f"{durability}{' + buffer' if buffered else ''}"
+            report[name] = asyncio.run(measure(retriever, durability, buffered, n_queries, n_threads, latency_ms / 1000))
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type = int, default = 30)
+    parser.add_argument("--threads", type = int, default = 5)
+    parser.add_argument("--latency-ms", type = float, default = 3.0)
+    args = parser.parse_args()
+
+    r = run(args.queries, args.threads, args.latency_ms)
+    print(f"\n{args.queries} queries over {args.threads} threads, {args.latency_ms} ms per store operation")
+    print(f"{'mode':<16} {'mean ms':>8} {'p95 ms':>8} {'reads/q':>8} {'puts/q':>7} {'writes/q':>9}")
+    for name, m in r.items():
+        print(f"{name:<16} {m['mean_ms']:>8.1f} {m['p95_ms']:>8.1f} {m['reads_per_query']:>8.2f} "
+              f"{m['puts_per_query']:>7.2f} {m['put_writes_per_query']:>9.2f}")
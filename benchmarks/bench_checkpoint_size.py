@@ -0,0 +1,113 @@
+"""
+Benchmark: checkpoint bytes per query with full Documents vs chunk references in AgentState.
+
+Runs the compiled RAG graph (fake LLMs, deterministic embeddings, an in-memory
+checkpointer using the same serializer as the MongoDB saver) over a session of
+C chunks of ~T tokens, and counts the bytes serialized per query. "documents"
+puts the retrieved Documents in the state as before; "refs" stores
+(session_id, chunk_id, score) only.
+
+Run from the repository root:
+    python -m benchmarks.bench_checkpoint_size --queries 20 --chunk-tokens 512
+"""
+# === Python Modules ===
+import random
+import asyncio
+import argparse
+from unittest import mock
+from langchain_community.vectorstores import FAISS
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+# === Local Imports ===
+from graph import run_graph
+from benchmarks.synthetic import sentences
+from rag_pipeline.agents import doc_retriever, query_rewriter
+from rag_pipeline.schema.schema import DocGrader
+
+# === Serializer that counts what the checkpointer writes ===
+class CountingSerializer(JsonPlusSerializer):
+    def __init__(self):
+        super().__init__()
+        self.bytes = 0
+        self.writes = 0
+
+    def dumps_typed(self, obj):
+        type_, data = super().dumps_typed(obj)
+        self.bytes += len(data)
+        self.writes += 1
+        return type_, data
+
+# === Fake LLM clients (grader says yes, generator streams a short answer) ===
+class FakeGrader:
+    async def ainvoke(self, messages):
+        return DocGrader(score = "Yes")
+
+class FakeGenerator:
+    async def astream(self, messages):
+        yield {"answer": "The report lists the part.", "answer_history": "Report lists the part."}
+
+class FakeClients:
+    def get_structured(self, model_name, temperature, schema):
+        return FakeGrader()
+
+    def get_json_stream(self, model_name, temperature, schema):
+        return FakeGenerator()
+
+def build_retriever(
+        n_chunks: int,
+        chunk_tokens: int
+):
+    rng = random.Random(0)
+    texts = [
+        f"Part PN-{i:05d}. " + " ".join(sentences(rng, max(1, chunk_tokens // 14)))
+        for i in range(n_chunks)
+    ]
+    metadatas = [{"source": "report.pdf", "page_number": i // 4 + 1, "chunk_index": i % 4} for i in range(n_chunks)]
+    db = FAISS.from_texts(texts, DeterministicFakeEmbedding(size = 64), metadatas = metadatas)
+    return db.as_retriever(search_kwargs = {"k": 5})
+
+async def measure(
+        retriever,
+        n_queries: int
+) -> dict:
+    serde = CountingSerializer()
+    graph = run_graph(checkpointer = InMemorySaver(serde = serde))
+    config = {"configurable": {"retriever": retriever, "llm_clients": FakeClients(), "thread_id": "bench"}}
+
+    for q in range(n_queries):
+        await graph.ainvoke({"question": f"Which supplier report covers part PN-{q:05d}?"}, config)
+
+    return {"bytes_per_query": serde.bytes / n_queries, "writes_per_query": serde.writes / n_queries}
+
+# === Benchmark Runner ===
+def run(
+        n_queries: int = 20,
+        n_chunks: int = 200,
+        chunk_tokens: int = 512
+) -> dict:
+    retriever = build_retriever(n_chunks, chunk_tokens)
+    report = {}
+
+    keep_documents = lambda documents, session_id = None: documents
+    with mock.patch.object(doc_retriever, "to_refs", keep_documents), \
+            mock.patch.object(query_rewriter, "to_refs", keep_documents):
+        report["documents"] = asyncio.run(measure(retriever, n_queries))
+
+    report["refs"] = asyncio.run(measure(retriever, n_queries))
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type = int, default = 20)
+    parser.add_argument("--chunks", type = int, default = 200)
+    parser.add_argument("--chunk-tokens", type = int, default = 512)
+    args = parser.parse_args()
+
+    r = run(args.queries, args.chunks, args.chunk_tokens)
+    print(f"\n{args.queries} queries, top-5 of {args.chunks} chunks x ~{args.chunk_tokens} tokens")
+    print(f"{'state':<10} {'bytes/query':>12} {'writes/query':>13}")
+    for mode in ("documents", "refs"):
+        print(f"{mode:<10} {r[mode]['bytes_per_query']:>12.0f} {r[mode]['writes_per_query']:>13.1f}")
+    print(f"reduction: {r['documents']['bytes_per_query'] / r['refs']['bytes_per_query']:.1f}x")
@@ -0,0 +1,94 @@
+"""
+Benchmark: token-budgeted chunking throughput on a large synthetic corpus, and
+chunk-size distribution against the previous "merge 2 paragraphs" text splitting.
+
+Run from the repository root:
+    python -m benchmarks.bench_chunking --paragraphs 50000 --max-tokens 512 --overlap 64
+"""
+# === Python Modules ===
+import time
+import random
+import argparse
+import numpy as np
+
+# === Local Imports ===
+from benchmarks.synthetic import sentences
+from rag_pipeline.utils.chunking import chunk_texts, get_token_counter
+
+def build_items(
+        n_paragraphs: int,
+        paragraphs_per_item: int = 500,
+        seed: int = 0
+) -> list:
+    """
+    Text "files" of blank-line separated paragraphs with a heavy tail of long paragraphs.
+    """
+    rng = random.Random(seed)
+    paragraphs = [
+        " ".join(sentences(rng, rng.choice([2, 4, 6, 40, 120])))
+        for _ in range(n_paragraphs)
+    ]
+    return [
+        {
+            "content": "\n\n".join(paragraphs[i:i + paragraphs_per_item]),
+            "metadata": {"source": f"doc_{i // paragraphs_per_item}.txt", "type": "text"}
+        }
+        for i in range(0, n_paragraphs, paragraphs_per_item)
+    ]
+
+def _sizes(texts: list, count) -> np.ndarray:
+    return np.array(count(texts))
+
+# === Benchmark Runner ===
+def run(
+        n_paragraphs: int = 50000,
+        max_tokens: int = 512,
+        overlap_tokens: int = 64
+) -> dict:
+    items = build_items(n_paragraphs)
+    count = get_token_counter()
+    n_bytes = sum(len(item["content"].encode("utf-8")) for item in items)
+
+    start = time.perf_counter()
+    chunks = chunk_texts(items, max_tokens = max_tokens, overlap_tokens = overlap_tokens)
+    elapsed = time.perf_counter() - start
+
+    ## === Previous splitting: paragraphs merged two at a time, no size bound ===
+    legacy = [
+        " ".join(paragraphs[i:i + 2])
+        for item in items
+        for paragraphs in [item["content"].split("\n\n")]
+        for i in range(0, len(paragraphs), 2)
+    ]
+
+    new_sizes = np.array([chunk["metadata"]["token_count"] for chunk in chunks])
+    legacy_sizes = _sizes(legacy, count)
+
+    return {
+        "mib": n_bytes / 2 ** 20,
+        "seconds": elapsed,
+        "chunks": len(chunks),
+        "new": new_sizes,
+        "legacy": legacy_sizes,
+        "new_total": int(new_sizes.sum()),
+        "legacy_total": int(legacy_sizes.sum())
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--paragraphs", type = int, default = 50000)
+    parser.add_argument("--max-tokens", type = int, default = 512)
+    parser.add_argument("--overlap", type = int, default = 64)
+    args = parser.parse_args()
+
+    r = run(args.paragraphs, args.max_tokens, args.overlap)
+    print(f"\nCorpus: {r['mib']:.1f} MiB, {args.paragraphs} paragraphs")
+    print(f"Chunking: {r['seconds']:.2f} s ({r['mib'] / r['seconds']:.1f} MiB/s, {r['chunks'] / r['seconds']:.0f} chunks/s)")
+    for name in ("legacy", "new"):
+        sizes = r[name]
+        print(
+            f"{name:>6}: {len(sizes):>7} chunks, tokens p50 {np.percentile(sizes, 50):.0f} "
+            f"p99 {np.percentile(sizes, 99):.0f} max {sizes.max()}"
+        )
+    print(f"Tokens embedded: legacy {r['legacy_total']} -> chunked {r['new_total']} "
+          f"(overlap adds {r['new_total'] / r['legacy_total'] - 1:+.1%})")
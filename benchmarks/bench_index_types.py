@@ -0,0 +1,92 @@
+"""
+Benchmark: recall@k vs query latency vs memory of the FAISS index types chosen by
+`retriever.index` (flat, HNSW, IVF; unquantized, SQ8 and PQ) on synthetic clustered
+unit vectors. Recall is measured against the exact flat index.
+
+Run from the repository root:
+    python -m benchmarks.bench_index_types --vectors 50000 --dim 256 --queries 500
+"""
+# === Python Modules ===
+import time
+import argparse
+import numpy as np
+
+# === Local Imports ===
+from rag_pipeline.components.index_factory import build_index, index_bytes
+
+CONFIGS = {
+    "flat": {"type": "flat"},
+    "flat-sq8": {"type": "flat", "quantization": "sq8"},
+    "hnsw": {"type": "hnsw"},
+    "hnsw-sq8": {"type": "hnsw", "quantization": "sq8"},
+    "ivf": {"type": "ivf"},
+    "ivf-sq8": {"type": "ivf", "quantization": "sq8"},
+    "ivf-pq": {"type": "ivf", "quantization": "pq", "pq_m": 32}
+}
+
+def synthetic_vectors(
+        n: int,
+        dim: int,
+        n_clusters: int = 200,
+        seed: int = 0
+) -> np.ndarray:
+    """
+    Unit vectors around random cluster centres (embeddings of a corpus are clustered by topic).
+    """
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((n_clusters, dim)).astype(np.float32)
+    vectors = centres[rng.integers(0, n_clusters, n)] + 0.6 * rng.standard_normal((n, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis = 1, keepdims = True)
+
+# === Benchmark Runner ===
+def run(
+        n_vectors: int = 50000,
+        dim: int = 256,
+        n_queries: int = 500,
+        k: int = 10,
+        configs: dict = CONFIGS
+) -> dict:
+    vectors = synthetic_vectors(n_vectors + n_queries, dim)
+    corpus, queries = vectors[:n_vectors], vectors[n_vectors:]
+
+    results = {}
+    truth = None
+    for name, settings in configs.items():
+        settings = {"min_train_vectors": 0, **settings}
+
+        start = time.perf_counter()
+        index = build_index(corpus, settings)
+        build_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for query in queries:
+            _, rows = index.search(query[None, :], k)
+        query_ms = (time.perf_counter() - start) / n_queries * 1000
+
+        _, rows = index.search(queries, k)
+        if truth is None:
+            truth = rows
+        recall = np.mean([len(set(r) & set(t)) / k for r, t in zip(rows, truth)])
+
+        results[name] = {
+            "build_s": build_s,
+            "query_ms": query_ms,
+            "recall": float(recall),
+            "mib": index_bytes(index) / 2 ** 20
+        }
+
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--vectors", type = int, default = 50000)
+    parser.add_argument("--dim", type = int, default = 256)
+    parser.add_argument("--queries", type = int, default = 500)
+    parser.add_argument("--k", type = int, default = 10)
+    args = parser.parse_args()
+
+    results = run(args.vectors, args.dim, args.queries, args.k)
+    print(f"\n{args.vectors} vectors x {args.dim} dims, {args.queries} single-vector queries, recall@{args.k} vs flat")
+    print(f"{'index':<10} {'recall':>7} {'ms/query':>9} {'MiB':>8} {'build s':>8}")
+    for name, r in results.items():
+        print(f"{name:<10} {r['recall']:>7.3f} {r['query_ms']:>9.3f} {r['mib']:>8.1f} {r['build_s']:>8.1f}")
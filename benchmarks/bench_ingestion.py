@@ -0,0 +1,237 @@
+"""
+Benchmark: offline ingestion, one timing per stage, on synthetic PDF/TXT corpora.
+
+Stages (each fed with the previous stage's output, as in the indexer):
+    extract_pdf   - extract_from_pdf (settings of the `extraction` section)
+    extract_txt   - extract_from_text_files (whole files, chunked next)
+    chunking      - chunk_texts + build_documents
+    embedding     - deterministic fake embedder, `--latency-ms` per request of `--batch-size` texts
+    faiss_build   - build_vectorstore (index type per `retriever.index`)
+    save_local    - FAISS.save_local
+    load_local    - FAISS.load_local
+
+Nothing calls the network. Results (median and min over `--repeat` runs) can be
+written as JSON and compared with a previous run: stages slower than the baseline
+by more than `--threshold` are reported and the exit code is 1.
+
+Run from the repository root:
+    python -m benchmarks.bench_ingestion --sizes small medium --repeat 3 --output ingestion.json
+    python -m benchmarks.bench_ingestion --sizes small medium --repeat 3 --baseline ingestion.json
+"""
+# === Python Modules ===
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import statistics
+from pathlib import Path
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+import faiss
+import numpy as np
+from langchain_community.vectorstores import FAISS
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+# === Local Imports ===
+from benchmarks.synthetic import write_corpus
+from rag_pipeline.components.retriever import build_documents
+from rag_pipeline.components.index_factory import build_vectorstore
+from rag_pipeline.utils.chunking import chunk_texts
+from rag_pipeline.utils.extract_doc import extract_from_pdf, extract_from_text_files
+
+STAGES = ("extract_pdf", "extract_txt", "chunking", "embedding", "faiss_build", "save_local", "load_local")
+
+# === Corpus Sizes ===
+SIZES = {
+    "small": {"n_pdfs": 2, "pages_per_pdf": 5, "n_txts": 2, "paragraphs_per_txt": 100},
+    "medium": {"n_pdfs": 4, "pages_per_pdf": 20, "n_txts": 4, "paragraphs_per_txt": 500},
+    "large": {"n_pdfs": 8, "pages_per_pdf": 80, "n_txts": 8, "paragraphs_per_txt": 2000}
+}
+
+# === Deterministic Embedder Standing in for the Embedding API ===
+class LatencyFakeEmbedding(DeterministicFakeEmbedding):
+    """
+    Same vector for the same text; sleeps `latency_ms` per request of `batch_size`
+    texts, like a remote embedding API called in batches.
+    """
+    latency_ms: float = 0.0
+    batch_size: int = 1000
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors = []
+        for start in range(0, len(texts), self.batch_size):
+            if self.latency_ms:
+                time.sleep(self.latency_ms / 1000)
+            vectors.extend(super().embed_documents(texts[start:start + self.batch_size]))
+        return vectors
+
+def _timed(
+        fn: Callable[[], Any]
+) -> tuple:
+    start = time.perf_counter()
+    value = fn()
+    return value, time.perf_counter() - start
+
+# === Function to Run Every Stage Once ===
+def run_stages(
+        corpus: Path,
+        work_dir: Path,
+        embeddings: LatencyFakeEmbedding
+) -> tuple:
+    """
+    Runs the ingestion stages over `corpus` once.
+
+    Returns:
+        tuple: Seconds per stage, and the corpus counts (pages, chunks).
+    """
+    seconds: Dict[str, float] = {}
+
+    (pdf_texts, tables, _), seconds["extract_pdf"] = _timed(lambda: extract_from_pdf(folder_path = corpus))
+    (txt_texts, _), seconds["extract_txt"] = _timed(lambda: extract_from_text_files(folder_path = corpus, merge_n = None))
+
+    docs, seconds["chunking"] = _timed(
+        lambda: build_documents(texts = chunk_texts(pdf_texts + txt_texts), tables = tables)
+    )
+    vectors, seconds["embedding"] = _timed(
+        lambda: np.asarray(embeddings.embed_documents([doc.page_content for doc in docs]), dtype = np.float32)
+    )
+    db, seconds["faiss_build"] = _timed(lambda: build_vectorstore(docs, embeddings, vectors = vectors))
+
+    index_dir = work_dir / "index"
+    _, seconds["save_local"] = _timed(lambda: db.save_local(str(index_dir)))
+    loaded, seconds["load_local"] = _timed(
+        lambda: FAISS.load_local(str(index_dir), embeddings, allow_dangerous_deserialization = True)
+    )
+    assert loaded.index.ntotal == len(docs), "reloaded index lost vectors"
+
+    return seconds, {"pages": len(pdf_texts), "text_items": len(txt_texts), "chunks": len(docs)}
+
+# === Benchmark Runner ===
+def run(
+        sizes: tuple = ("small", "medium"),
+        repeat: int = 3,
+        latency_ms: float = 0.0,
+        batch_size: int = 1000,
+        dim: int = 1536
+) -> dict:
+    """
+    Times every stage on each corpus size (one discarded warm-up run, then `repeat` runs).
+
+    Returns:
+        dict: {"meta": {...}, "results": {size: {"corpus": {...}, "stages": {stage: {"median_s", "min_s"}}}}}
+    """
+    report: Dict[str, Any] = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "faiss": faiss.__version__,
+            "machine": platform.machine(),
+            "repeat": repeat,
+            "embedding": {"latency_ms": latency_ms, "batch_size": batch_size, "dim": dim}
+        },
+        "results": {}
+    }
+
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            corpus = write_corpus(Path(tmp) / "corpus", **SIZES[size])
+            embeddings = LatencyFakeEmbedding(size = dim, latency_ms = latency_ms, batch_size = batch_size)
+
+            runs = []
+            for attempt in range(repeat + 1):
+                seconds, counts = run_stages(corpus, Path(tmp) / f"run_{attempt}", embeddings)
+                if attempt > 0:
+                    runs.append(seconds)
+
+            report["results"][size] = {
+                "corpus": {**SIZES[size], **counts},
+                "stages": {
+                    stage: {
+                        "median_s": statistics.median(r[stage] for r in runs),
+                        "min_s": min(r[stage] for r in runs)
+                    }
+                    for stage in STAGES
+                }
+            }
+
+    return report
+
+# === Function to Compare a Run with a Baseline ===
+def compare(
+        current: dict,
+        baseline: dict,
+        threshold: float = 0.2,
+        min_delta_s: float = 0.005
+) -> List[Dict[str, Any]]:
+    """
+    Compares the median of every stage present in both reports.
+    A stage regresses when it is more than `threshold` (relative) and more than
+    `min_delta_s` (absolute, timer noise) slower than the baseline.
+
+    Returns:
+        List[Dict[str, Any]]: One row per (size, stage) with both medians, the ratio and a `regression` flag.
+    """
+    rows = []
+    for size, result in current["results"].items():
+        base_stages = baseline.get("results", {}).get(size, {}).get("stages", {})
+        for stage, timing in result["stages"].items():
+            if stage not in base_stages:
+                continue
+            now, before = timing["median_s"], base_stages[stage]["median_s"]
+            ratio = now / before if before > 0 else float("inf")
+            rows.append({
+                "size": size,
+                "stage": stage,
+                "baseline_s": before,
+                "current_s": now,
+                "ratio": ratio,
+                "regression": ratio > 1 + threshold and now - before > min_delta_s
+            })
+    return rows
+
+def _print_report(
+        report: dict
+) -> None:
+    for size, result in report["results"].items():
+        corpus = result["corpus"]
+        print(f"\n{size}: {corpus['pages']} PDF pages, {corpus['n_txts']} text files -> {corpus['chunks']} chunks")
+        print(f"{'stage':<12} {'median ms':>10} {'min ms':>9}")
+        for stage, timing in result["stages"].items():
+            print(f"{stage:<12} {timing['median_s'] * 1000:>10.1f} {timing['min_s'] * 1000:>9.1f}")
+
+def _print_comparison(
+        rows: List[Dict[str, Any]]
+) -> None:
+    print(f"\n{'size':<8} {'stage':<12} {'baseline ms':>12} {'current ms':>11} {'ratio':>7}")
+    for row in rows:
+        flag = "  ❌ regression" if row["regression"] else ""
+        print(f"{row['size']:<8} {row['stage']:<12} {row['baseline_s'] * 1000:>12.1f} "
+              f"{row['current_s'] * 1000:>11.1f} {row['ratio']:>7.2f}{flag}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", nargs = "+", choices = list(SIZES), default = ["small", "medium"])
+    parser.add_argument("--repeat", type = int, default = 3)
+    parser.add_argument("--latency-ms", type = float, default = 0.0, help = "fake embedding latency per request")
+    parser.add_argument("--batch-size", type = int, default = 1000, help = "texts per embedding request")
+    parser.add_argument("--dim", type = int, default = 1536)
+    parser.add_argument("--output", type = Path, default = None, help = "write the results as JSON")
+    parser.add_argument("--baseline", type = Path, default = None, help = "JSON of a previous run to compare with")
+    parser.add_argument("--threshold", type = float, default = 0.2, help = "relative slowdown counted as a regression")
+    args = parser.parse_args()
+
+    report = run(tuple(args.sizes), args.repeat, args.latency_ms, args.batch_size, args.dim)
+    _print_report(report)
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent = 2), encoding = "utf-8")
+        print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        rows = compare(report, json.loads(args.baseline.read_text(encoding = "utf-8")), args.threshold)
+        _print_comparison(rows)
+        regressions = [row for row in rows if row["regression"]]
+        print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}.")
+        sys.exit(1 if regressions else 0)
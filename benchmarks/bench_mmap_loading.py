@@ -0,0 +1,142 @@
+"""
+Benchmark: memory-mapped vs fully loaded session indexes.
+
+Writes N session indexes, then in W concurrent worker processes restores all of
+them through RetrieverManager and reports per-worker private heap (RssAnon),
+file-backed pages (RssFile), proportional set size (Pss: shared pages are split
+between the workers mapping them) and the latency of each session's first query
+(load + search) and of warm queries.
+
+Run from the repository root:
+    python -m benchmarks.bench_mmap_loading --sessions 20 --vectors 20000 --workers 2
+"""
+# === Python Modules ===
+import time
+import tempfile
+import argparse
+import numpy as np
+import multiprocessing
+from pathlib import Path
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+# === Local Imports ===
+from rag_pipeline.components.index_factory import build_vectorstore
+from rag_pipeline.components.retriever_manager import RetrieverManager
+
+def write_sessions(
+        base_dir: Path,
+        n_sessions: int,
+        n_vectors: int,
+        dim: int
+) -> None:
+    rng = np.random.default_rng(0)
+    embeddings = DeterministicFakeEmbedding(size = dim)
+    for s in range(n_sessions):
+        vectors = rng.standard_normal((n_vectors, dim)).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis = 1, keepdims = True)
+        docs = [Document(page_content = f"chunk {i}") for i in range(n_vectors)]
+        db = build_vectorstore(docs, embeddings, vectors = vectors, settings = {"type": "flat"})
+        db.save_local(str(base_dir / f"session_{s}"))
+
+def memory_mib() -> dict:
+    values = {}
+    for name in ("/proc/self/status", "/proc/self/smaps_rollup"):
+        try:
+            for line in open(name):
+                key, _, rest = line.partition(":")
+                if key in ("RssAnon", "RssFile", "Pss"):
+                    values[key] = int(rest.split()[0]) / 1024
+        except OSError:
+            pass
+    return values
+
+def worker(
+        base_dir: Path,
+        n_sessions: int,
+        dim: int,
+        mmap: bool,
+        barrier,
+        results
+) -> None:
+    manager = RetrieverManager(
+        base_dir = base_dir,
+        max_entries = n_sessions,
+        max_bytes = 2 ** 62,
+        top_k = 5,
+        embeddings_factory = lambda: DeterministicFakeEmbedding(size = dim),
+        mmap = mmap
+    )
+    before = memory_mib()
+
+    first, warm = [], []
+    for s in range(n_sessions):
+        start = time.perf_counter()
+        manager.get(f"session_{s}").invoke("first query")
+        first.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        manager.get(f"session_{s}").invoke("second query")
+        warm.append(time.perf_counter() - start)
+
+    ## === Measure while every worker holds all sessions ===
+    barrier.wait()
+    after = memory_mib()
+    barrier.wait()
+
+    results.put({
+        "heap_mib": after.get("RssAnon", 0) - before.get("RssAnon", 0),
+        "file_mib": after.get("RssFile", 0) - before.get("RssFile", 0),
+        "pss_mib": after.get("Pss", 0),
+        "first_query_ms": float(np.mean(first) * 1000),
+        "warm_query_ms": float(np.mean(warm) * 1000)
+    })
+
+# === Benchmark Runner ===
+def run(
+        n_sessions: int = 20,
+        n_vectors: int = 20000,
+        dim: int = 256,
+        n_workers: int = 2
+) -> dict:
+    ctx = multiprocessing.get_context("spawn")
+    report = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base_dir = Path(tmp)
+        write_sessions(base_dir, n_sessions, n_vectors, dim)
+
+        for mode, mmap in (("full", False), ("mmap", True)):
+            barrier, results = ctx.Barrier(n_workers), ctx.Queue()
+            procs = [
+                ctx.Process(target = worker, args = (base_dir, n_sessions, dim, mmap, barrier, results))
+                for _ in range(n_workers)
+            ]
+            for proc in procs:
+                proc.start()
+            rows = [results.get() for _ in procs]
+            for proc in procs:
+                proc.join()
+
+            report[mode] = {key: float(np.mean([row[key] for row in rows])) for key in rows[0]}
+            report[mode]["total_pss_mib"] = sum(row["pss_mib"] for row in rows)
+
+    report["index_mib"] = n_sessions * n_vectors * dim * 4 / 2 ** 20
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type = int, default = 20)
+    parser.add_argument("--vectors", type = int, default = 20000)
+    parser.add_argument("--dim", type = int, default = 256)
+    parser.add_argument("--workers", type = int, default = 2)
+    args = parser.parse_args()
+
+    r = run(args.sessions, args.vectors, args.dim, args.workers)
+    print(f"\n{args.sessions} sessions x {args.vectors} vectors x {args.dim} dims "
+          f"({r['index_mib']:.0f} MiB of vectors), {args.workers} workers")
+    print(f"{'mode':<5} {'heap MiB':>9} {'file MiB':>9} {'PSS/worker':>11} {'PSS total':>10} {'1st query ms':>13} {'warm ms':>8}")
+    for mode in ("full", "mmap"):
+        m = r[mode]
+        print(f"{mode:<5} {m['heap_mib']:>9.0f} {m['file_mib']:>9.0f} {m['pss_mib']:>11.0f} "
+              f"{m['total_pss_mib']:>10.0f} {m['first_query_ms']:>13.2f} {m['warm_query_ms']:>8.2f}")
@@ -0,0 +1,70 @@
+"""
+Benchmark: serial vs process-pool PDF extraction on a synthetic multi-hundred-page corpus.
+
+Run from the repository root:
+    python -m benchmarks.bench_pdf_extraction --pdfs 4 --pages 150 --workers 2 4 8
+"""
+# === Python Modules ===
+import os
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+# === Local Imports ===
+from benchmarks.synthetic import write_corpus
+from rag_pipeline.utils.extract_doc import extract_from_pdf, extract_from_pdf_parallel
+
+# === Benchmark Runner ===
+def run(
+        n_pdfs: int = 4,
+        pages_per_pdf: int = 150,
+        workers: tuple = (2, 4, 8),
+        pages_per_task: int = 16
+) -> dict:
+    """
+    Times serial extraction and parallel extraction for each worker count.
+
+    Returns:
+        dict: Seconds per configuration, plus corpus size.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = write_corpus(Path(tmp), n_pdfs = n_pdfs, pages_per_pdf = pages_per_pdf)
+        pdf_files = sorted(folder.glob("*.pdf"))
+
+        results = {"pages": n_pdfs * pages_per_pdf}
+
+        start = time.perf_counter()
+        serial = extract_from_pdf(folder_path = folder, parallel = False)
+        results["serial_s"] = time.perf_counter() - start
+
+        for n_workers in workers:
+            ## === Warm the pool so process start-up is not measured ===
+            extract_from_pdf_parallel(pdf_files[:1], max_workers = n_workers, pages_per_task = pages_per_task)
+
+            start = time.perf_counter()
+            parallel = extract_from_pdf_parallel(
+                pdf_files = pdf_files,
+                max_workers = n_workers,
+                pages_per_task = pages_per_task
+            )
+            results[f"parallel_{n_workers}w_s"] = time.perf_counter() - start
+
+            assert parallel == serial, "parallel output differs from serial output"
+
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pdfs", type = int, default = 4)
+    parser.add_argument("--pages", type = int, default = 150)
+    parser.add_argument("--workers", type = int, nargs = "+", default = [2, 4, os.cpu_count() or 1])
+    parser.add_argument("--pages-per-task", type = int, default = 16)
+    args = parser.parse_args()
+
+    results = run(args.pdfs, args.pages, tuple(args.workers), args.pages_per_task)
+
+    print(f"\nCorpus: {args.pdfs} PDFs x {args.pages} pages = {results.pop('pages')} pages")
+    serial = results["serial_s"]
+    for name, seconds in results.items():
+        print(f"{name:<20} {seconds:>8.2f} s   speedup x{serial / seconds:.2f}")
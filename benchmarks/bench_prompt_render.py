@@ -0,0 +1,68 @@
+"""
+Microbenchmark: prompt rendering and model lookup with and without the config registry.
+
+Run from the repository root:
+    python -m benchmarks.bench_prompt_render
+"""
+# === Python Modules ===
+import timeit
+import yaml
+from pathlib import Path
+
+# === Components ===
+from rag_pipeline.components.prompts import render_prompt
+from rag_pipeline.components.models import ModelConfig
+
+PROMPTS_PATH = Path("config/prompts.yaml")
+MODELS_PATH = Path("config/models.yaml")
+
+# === Previous behaviour: re-parse the YAML on every call ===
+def legacy_render_prompt(
+        prompt_name: str,
+        **kwargs
+) -> dict:
+    prompt_def = yaml.safe_load(
+        PROMPTS_PATH.read_text(encoding = "utf-8")
+    )["Prompts"][prompt_name]
+    return {
+        "system": prompt_def["system"],
+        "user": prompt_def["template"].format(**kwargs),
+        "output_schema": prompt_def["output_schema"]
+    }
+
+def legacy_model_name(
+        agent_name: str
+) -> str:
+    with open(MODELS_PATH, "r") as f:
+        config = yaml.safe_load(f)
+    return config["llm_models"][config["agent_model_mapping"][agent_name]]["name"]
+
+# === Benchmark Runner ===
+def run(
+        number: int = 2000
+) -> dict:
+    """
+    Times each variant and returns the mean cost per call in microseconds.
+    """
+    kwargs = {
+        "question": "What does the report say about revenue?",
+        "document": "Revenue grew 12% year over year. " * 20
+    }
+    cases = {
+        "render_prompt (legacy, parse per call)": lambda: legacy_render_prompt("retrieval_grader", **kwargs),
+        "render_prompt (registry)": lambda: render_prompt("retrieval_grader", **kwargs),
+        "model lookup (legacy, parse per call)": lambda: legacy_model_name("retrieval_grader"),
+        "model lookup (registry)": lambda: ModelConfig().get_agent_model("retrieval_grader")["name"],
+    }
+
+    results = {}
+    for name, fn in cases.items():
+        fn()
+        seconds = min(timeit.repeat(fn, number = number, repeat = 3))
+        results[name] = seconds / number * 1e6
+
+    return results
+
+if __name__ == "__main__":
+    for name, micros in run().items():
+        print(f"{name:<42} {micros:>10.2f} µs/call")
@@ -0,0 +1,161 @@
+"""
+Benchmark: one FAISS folder per session vs the shared multi-tenant vector store.
+
+Writes N sessions of C chunks both ways, then reports the files and bytes on disk,
+the time to write them, and, in a fresh process per layout, the memory (private heap
+and mapped file pages) and latency of opening Q random sessions (cold: open + first
+search) and searching them again (warm). Per-session indexes are memory-mapped, as
+restored by RetrieverManager.
+
+Run from the repository root:
+    python -m benchmarks.bench_shared_store --sessions 1000 10000 --chunks 50 --dim 128
+"""
+# === Python Modules ===
+import time
+import tempfile
+import argparse
+import numpy as np
+import multiprocessing
+from pathlib import Path
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+# === Local Imports ===
+from rag_pipeline.components.index_factory import build_vectorstore, load_vectorstore
+from rag_pipeline.components.shared_store import SharedVectorStore
+
+def _session(
+        rng: np.random.Generator,
+        s: int,
+        n_chunks: int,
+        dim: int
+):
+    vectors = rng.standard_normal((n_chunks, dim)).astype(np.float32)
+    docs = [Document(page_content = f"session {s} chunk {i}") for i in range(n_chunks)]
+    ids = [f"s{s}-{i}" for i in range(n_chunks)]
+    return docs, ids, vectors
+
+def write_per_session(
+        base_dir: Path,
+        n_sessions: int,
+        n_chunks: int,
+        dim: int
+) -> None:
+    rng = np.random.default_rng(0)
+    embeddings = DeterministicFakeEmbedding(size = dim)
+    for s in range(n_sessions):
+        docs, ids, vectors = _session(rng, s, n_chunks, dim)
+        db = build_vectorstore(docs, embeddings, ids = ids, vectors = vectors, settings = {"type": "flat"})
+        db.save_local(str(base_dir / f"session_{s}"))
+
+def write_shared(
+        path: Path,
+        n_sessions: int,
+        n_chunks: int,
+        dim: int
+) -> None:
+    rng = np.random.default_rng(0)
+    store = SharedVectorStore(path)
+    for s in range(n_sessions):
+        docs, ids, vectors = _session(rng, s, n_chunks, dim)
+        store.update_session(f"session_{s}", docs, ids, vectors)
+
+def disk_usage(
+        path: Path
+) -> tuple:
+    files = [p for p in Path(path).rglob("*") if p.is_file()]
+    return len(files), sum(p.stat().st_size for p in files)
+
+def memory_mib() -> dict:
+    values = {}
+    for line in open("/proc/self/status"):
+        key, _, rest = line.partition(":")
+        if key in ("RssAnon", "RssFile"):
+            values[key] = int(rest.split()[0]) / 1024
+    return values
+
+def worker(
+        layout: str,
+        path: Path,
+        n_sessions: int,
+        n_queries: int,
+        dim: int,
+        results
+) -> None:
+    embeddings = DeterministicFakeEmbedding(size = dim)
+    store = SharedVectorStore(path) if layout == "shared" else None
+    sessions = np.random.default_rng(1).choice(n_sessions, min(n_queries, n_sessions), replace = False)
+    query = embeddings.embed_query("benchmark query")
+    before = memory_mib()
+
+    views, cold, warm = [], [], []
+    for s in sessions:
+        start = time.perf_counter()
+        if store is not None:
+            db = store.session(f"session_{s}", embeddings)
+        else:
+            db = load_vectorstore(path / f"session_{s}", embeddings, mmap = True)
+        db.similarity_search_with_score_by_vector(query, k = 5)
+        cold.append(time.perf_counter() - start)
+        views.append(db)
+
+    for db in views:
+        start = time.perf_counter()
+        db.similarity_search_with_score_by_vector(query, k = 5)
+        warm.append(time.perf_counter() - start)
+
+    results.put({
+        "heap_mib": memory_mib()["RssAnon"] - before["RssAnon"],
+        "file_mib": memory_mib()["RssFile"] - before["RssFile"],
+        "cold_ms": float(np.median(cold) * 1000),
+        "warm_ms": float(np.median(warm) * 1000)
+    })
+
+# === Benchmark Runner ===
+def run(
+        n_sessions: int = 1000,
+        n_chunks: int = 50,
+        dim: int = 128,
+        n_queries: int = 500
+) -> dict:
+    ctx = multiprocessing.get_context("spawn")
+    report = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        layouts = {
+            "per_session": (Path(tmp) / "models", write_per_session),
+            "shared": (Path(tmp) / "shared", write_shared)
+        }
+        for layout, (path, write) in layouts.items():
+            start = time.perf_counter()
+            write(path, n_sessions, n_chunks, dim)
+            write_s = time.perf_counter() - start
+            n_files, n_bytes = disk_usage(path)
+
+            results = ctx.Queue()
+            proc = ctx.Process(target = worker, args = (layout, path, n_sessions, n_queries, dim, results))
+            proc.start()
+            row = results.get()
+            proc.join()
+
+            report[layout] = {"write_s": write_s, "files": n_files, "disk_mib": n_bytes / 2 ** 20, **row}
+
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type = int, nargs = "+", default = [1000, 10000])
+    parser.add_argument("--chunks", type = int, default = 50)
+    parser.add_argument("--dim", type = int, default = 128)
+    parser.add_argument("--queries", type = int, default = 500)
+    args = parser.parse_args()
+
+    for n_sessions in args.sessions:
+        r = run(n_sessions, args.chunks, args.dim, args.queries)
+        print(f"\n{n_sessions} sessions x {args.chunks} chunks x {args.dim} dims, "
+              f"{min(args.queries, n_sessions)} sessions opened")
+        print(f"{'layout':<12} {'write s':>8} {'files':>7} {'disk MiB':>9} {'heap MiB':>9} {'file MiB':>9} {'cold ms':>8} {'warm ms':>8}")
+        for layout in ("per_session", "shared"):
+            m = r[layout]
+            print(f"{layout:<12} {m['write_s']:>8.1f} {m['files']:>7} {m['disk_mib']:>9.1f} "
+                  f"{m['heap_mib']:>9.1f} {m['file_mib']:>9.1f} {m['cold_ms']:>8.3f} {m['warm_ms']:>8.3f}")
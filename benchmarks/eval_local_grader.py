@@ -0,0 +1,190 @@
+"""
+Offline evaluation of the local grading mode against LLM grader verdicts.
+
+Uses a labeled fixture (question, retrieved chunk, FAISS similarity, LLM verdict) and
+reports agreement, LLM calls saved and grading latency with a simulated LLM grader.
+`--calibrate` searches thresholds reaching a target agreement with the fewest LLM calls.
+Thresholds are tuned on grader_fixture.json, so its agreement is optimistic; the
+held-out grader_fixture_holdout.json (never calibrated on) is reported alongside.
+
+Run from the repository root:
+    python -m benchmarks.eval_local_grader
+    python -m benchmarks.eval_local_grader --calibrate --min-agreement 0.95
+"""
+# === Python Modules ===
+import json
+import time
+import asyncio
+import argparse
+import numpy as np
+from pathlib import Path
+from langchain_core.documents import Document
+
+# === Local Imports ===
+from rag_pipeline.agents.grader import grade_documents_local, grade_documents_parallel
+from rag_pipeline.components.models import ModelConfig
+from rag_pipeline.components.relevance import local_relevance, classify_relevance
+from rag_pipeline.schema.schema import DocGrader
+
+FIXTURE = Path(__file__).parent / "fixtures" / "grader_fixture.json"
+HOLDOUT = Path(__file__).parent / "fixtures" / "grader_fixture_holdout.json"
+
+# === Simulated LLM Grader (answers with the fixture label) ===
+class OracleGrader:
+    def __init__(self, labels: dict, latency_s: float):
+        self.labels = labels
+        self.latency_s = latency_s
+        self.calls = 0
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        await asyncio.sleep(self.latency_s)
+        content = messages[-1].content
+        return DocGrader(score = next(label for text, label in self.labels.items() if text in content))
+
+def load_fixture(path: Path = FIXTURE) -> list:
+    return json.loads(Path(path).read_text(encoding = "utf-8"))["queries"]
+
+def _documents(query: dict) -> list:
+    return [
+        Document(page_content = chunk["content"], metadata = {"retrieval_score": chunk["retrieval_score"]})
+        for chunk in query["chunks"]
+    ]
+
+# === Agreement of Local Decisions with the LLM Verdicts ===
+def evaluate(
+        queries: list,
+        settings: dict
+) -> dict:
+    decided = correct = total = 0
+    for query in queries:
+        results = grade_documents_local(query["question"], _documents(query), settings)
+        for result, chunk in zip(results, query["chunks"]):
+            total += 1
+            if result is not None:
+                decided += 1
+                correct += result == (chunk["label"] == "Yes")
+
+    return {
+        "chunks": total,
+        "decided_locally": decided,
+        "coverage": decided / total,
+        "local_agreement": correct / decided if decided else 1.0,
+        ## === Borderline chunks are graded by the LLM, so they agree by construction ===
+        "overall_agreement": (correct + total - decided) / total,
+        "llm_calls": total - decided,
+        "llm_calls_saved": decided
+    }
+
+# === Threshold Search ===
+def calibrate(
+        queries: list,
+        min_agreement: float = 0.95,
+        weights = (0.0, 0.1, 0.2, 0.3, 0.4, 0.5)
+) -> dict:
+    """
+    Returns the (lexical_weight, accept, reject) with the highest local coverage
+    whose local decisions agree with the LLM at least `min_agreement` of the time.
+    Ties prefer the widest borderline band (most conservative thresholds).
+    """
+    labels = np.array([chunk["label"] == "Yes" for q in queries for chunk in q["chunks"]])
+    best = None
+
+    for weight in weights:
+        scores = np.concatenate([
+            local_relevance(
+                question = q["question"],
+                texts = [c["content"] for c in q["chunks"]],
+                retrieval_scores = [c["retrieval_score"] for c in q["chunks"]],
+                lexical_weight = weight
+            )
+            for q in queries
+        ])
+        grid = np.round(np.arange(0.20, 0.95, 0.01), 2)
+        for reject in grid:
+            for accept in grid[grid > reject]:
+                decisions = classify_relevance(scores, accept, reject)
+                mask = decisions >= 0
+                if not mask.any():
+                    continue
+                agreement = float(((decisions[mask] == 1) == labels[mask]).mean())
+                if agreement < min_agreement:
+                    continue
+                key = (int(mask.sum()), float(accept - reject))
+                if best is None or key > best["_key"]:
+                    best = {
+                        "_key": key,
+                        "lexical_weight": weight,
+                        "accept_threshold": float(accept),
+                        "reject_threshold": float(reject),
+                        "coverage": float(mask.mean()),
+                        "local_agreement": agreement
+                    }
+
+    if best is not None:
+        best.pop("_key")
+    return best
+
+# === Grading Latency: All-LLM vs Local + Borderline LLM ===
+async def measure_latency(
+        queries: list,
+        settings: dict,
+        llm_latency_s: float,
+        max_concurrency: int = 5
+) -> dict:
+    labels = {chunk["content"]: chunk["label"] for q in queries for chunk in q["chunks"]}
+    timings = {"parallel_s": 0.0, "local_s": 0.0}
+
+    for query in queries:
+        documents = _documents(query)
+
+        oracle = OracleGrader(labels, llm_latency_s)
+        start = time.perf_counter()
+        await grade_documents_parallel(oracle, query["question"], documents, max_concurrency)
+        timings["parallel_s"] += time.perf_counter() - start
+
+        oracle = OracleGrader(labels, llm_latency_s)
+        start = time.perf_counter()
+        results = grade_documents_local(query["question"], documents, settings)
+        borderline = [doc for doc, result in zip(documents, results) if result is None]
+        if borderline:
+            await grade_documents_parallel(oracle, query["question"], borderline, max_concurrency)
+        timings["local_s"] += time.perf_counter() - start
+
+    return {name: seconds / len(queries) for name, seconds in timings.items()}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fixture", type = Path, default = FIXTURE)
+    parser.add_argument("--holdout", type = Path, default = HOLDOUT, help = "Fixture kept out of calibration.")
+    parser.add_argument("--llm-latency", type = float, default = 0.4, help = "Simulated seconds per grader call.")
+    parser.add_argument("--calibrate", action = "store_true")
+    parser.add_argument("--min-agreement", type = float, default = 0.95)
+    args = parser.parse_args()
+
+    queries = load_fixture(args.fixture)
+    settings = ModelConfig().get_agent_settings("retrieval_grader").get("local") or {}
+
+    if args.calibrate:
+        best = calibrate(queries, args.min_agreement)
+        print(f"\nCalibrated thresholds (local agreement >= {args.min_agreement:.0%}):")
+        print(json.dumps(best, indent = 2))
+        if best:
+            settings = {k: best[k] for k in ("lexical_weight", "accept_threshold", "reject_threshold")}
+
+    report = evaluate(queries, settings)
+    latency = asyncio.run(measure_latency(queries, settings, args.llm_latency))
+
+    print(f"\nSettings: {settings}")
+    print(f"Chunks graded:            {report['chunks']}")
+    print(f"Decided locally:          {report['decided_locally']} ({report['coverage']:.0%})")
+    print(f"Local agreement with LLM: {report['local_agreement']:.1%}")
+    print(f"Overall agreement:        {report['overall_agreement']:.1%}")
+    print(f"LLM calls:                {report['llm_calls']} (saved {report['llm_calls_saved']})")
+    print(f"Grading latency / query:  all-LLM {latency['parallel_s'] * 1000:.0f} ms -> local {latency['local_s'] * 1000:.0f} ms")
+
+    holdout = evaluate(load_fixture(args.holdout), settings)
+    print(f"\nHeld-out fixture ({args.holdout.name}, not used for calibration):")
+    print(f"Decided locally:          {holdout['decided_locally']} of {holdout['chunks']} ({holdout['coverage']:.0%})")
+    print(f"Local agreement with LLM: {holdout['local_agreement']:.1%}")
+    print(f"Overall agreement:        {holdout['overall_agreement']:.1%}")
@@ -0,0 +1,140 @@
+"""
+Deterministic synthetic corpora (PDF / TXT) for benchmarks and tests.
+PDFs are written by hand (text + a ruled table per page), so no PDF library is needed.
+"""
+# === Python Modules ===
+import random
+from pathlib import Path
+from typing import List
+
+WORDS = (
+    "revenue margin forecast quarter retrieval index vector embedding latency throughput "
+    "contract clause invoice supplier warehouse shipment policy compliance audit report "
+    "customer segment region growth decline baseline metric threshold capacity cluster"
+).split()
+
+# === Function to Generate Pseudo-random Sentences ===
+def sentences(
+        rng: random.Random,
+        n: int,
+        words_per_sentence: int = 12
+) -> List[str]:
+    return [
+        " ".join(rng.choice(WORDS) for _ in range(words_per_sentence)).capitalize() + "."
+        for _ in range(n)
+    ]
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def _page_stream(
+        rng: random.Random,
+        page_no: int,
+        lines_per_page: int,
+        with_table: bool
+) -> bytes:
+    ops = ["BT", "/F1 9 Tf", "11 TL", "40 800 Td", f"(Page {page_no} - part number PN-{page_no:05d}) Tj"]
+    for line in sentences(rng, lines_per_page, words_per_sentence = 10):
+        ops.append(f"T* ({_escape(line)}) Tj")
+    ops.append("ET")
+
+    ## === A 3x4 ruled table at the bottom of the page ===
+    if with_table:
+        x0, y0, w, h = 40, 60, 120, 18
+        for r in range(4):
+            for c in range(3):
+                ops.append(f"{x0 + c * w} {y0 + r * h} {w} {h} re S")
+                ops.append(f"BT /F1 8 Tf {x0 + c * w + 4} {y0 + r * h + 5} Td (R{r}C{c}-{rng.randint(0, 999)}) Tj ET")
+
+    return "\n".join(ops).encode("latin-1")
+
+# === Function to Write a Synthetic PDF ===
+def write_synthetic_pdf(
+        path: Path,
+        n_pages: int,
+        lines_per_page: int = 40,
+        with_tables: bool = True,
+        seed: int = 0
+) -> Path:
+    """
+    Writes a valid multi-page PDF with text lines and (optionally) one ruled table per page.
+    """
+    rng = random.Random(seed)
+    objects: List[bytes] = []
+
+    def add(obj: bytes) -> int:
+        objects.append(obj)
+        return len(objects)
+
+    catalog = add(b"")            # placeholder, filled below
+    pages = add(b"")
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    page_ids = []
+    for page_no in range(1, n_pages + 1):
+        stream = _page_stream(rng, page_no, lines_per_page, with_tables)
+        content = add(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (pages, font, content)
+        ))
+
+    objects[catalog - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % pages
+    objects[pages - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % pid for pid in page_ids), len(page_ids)
+    )
+
+    ## === Serialize with a cross-reference table ===
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start = 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + obj + b"\nendobj\n"
+
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog, xref)
+
+    path = Path(path)
+    path.write_bytes(bytes(out))
+    return path
+
+# === Function to Write a Synthetic Text File ===
+def write_synthetic_txt(
+        path: Path,
+        n_paragraphs: int,
+        sentences_per_paragraph: int = 5,
+        seed: int = 0
+) -> Path:
+    """
+    Writes a text file of blank-line separated paragraphs.
+    """
+    rng = random.Random(seed)
+    paragraphs = [" ".join(sentences(rng, sentences_per_paragraph)) for _ in range(n_paragraphs)]
+
+    path = Path(path)
+    path.write_text("\n\n".join(paragraphs), encoding = "utf-8")
+    return path
+
+# === Function to Write a Mixed Corpus ===
+def write_corpus(
+        folder: Path,
+        n_pdfs: int,
+        pages_per_pdf: int,
+        n_txts: int = 0,
+        paragraphs_per_txt: int = 50,
+        seed: int = 0
+) -> Path:
+    """
+    Writes `n_pdfs` PDFs and `n_txts` text files into `folder`.
+    """
+    folder = Path(folder)
+    folder.mkdir(parents = True, exist_ok = True)
+
+    for i in range(n_pdfs):
+        write_synthetic_pdf(folder / f"doc_{i:03d}.pdf", pages_per_pdf, seed = seed + i)
+    for i in range(n_txts):
+        write_synthetic_txt(folder / f"notes_{i:03d}.txt", paragraphs_per_txt, seed = seed + 1000 + i)
+
+    return folder
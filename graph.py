@@ -4,8 +4,6 @@ from langgraph.graph.state import StateGraph
 from langgraph.graph import END
 from langchain_core.runnables import RunnableLambda
 from dotenv import load_dotenv
-from langgraph.checkpoint.mongodb import AsyncMongoDBSaver
-from pymongo import AsyncMongoClient
 
 # === Agent State ===
 from rag_pipeline.agent_state import AgentState
@@ -13,6 +11,9 @@ from rag_pipeline.agent_state import AgentState
 ## === Question Rewriter ===
 from rag_pipeline.agents.query_rewriter import query_rewriter
 
+## === Answer Cache ===
+from rag_pipeline.agents.answer_cache import answer_cache_lookup, answer_cache_store
+
 ## === Document Retriever ===
 from rag_pipeline.agents.doc_retriever import doc_retriever
 
@@ -29,28 +30,30 @@ from rag_pipeline.agents.fallback import fallback_agent
 from rag_pipeline.agents.answer import final_answer
 
 ## === Routes ===
-from rag_pipeline.router.routes import no_relevant_docs
+from rag_pipeline.router.routes import no_relevant_docs, answer_cache_hit
+
+## === Data Store (shared MongoDB client) ===
+from rag_pipeline.components.mongo import get_data_store
 
 load_dotenv()
 
 # === Env Imports ===
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-MONGODB_URI = os.getenv("MONGODB_URI")
-DB_NAME = os.getenv("DB_NAME")
-COLLECTION_NAME = os.getenv("COLLECTION_NAME")
 
-def run_graph():
+def run_graph(
+        checkpointer = None
+):
     """
     Runs the state graph for the RAG pipeline.
+
+    Args:
+        checkpointer (optional): Checkpoint saver to compile the graph with (defaults to the
+                                 AsyncMongoDBSaver of the process-wide data store, buffered in
+                                 memory when `checkpointing.buffer.enabled`).
     """
-    # === Initialize MongoDB Saver ===
-    # === MongoClient ===
-    mongo_client = AsyncMongoClient(MONGODB_URI)
-    checkpointer = AsyncMongoDBSaver(
-        client = mongo_client,
-        db_name = DB_NAME,
-        checkpoint_collection_name = COLLECTION_NAME
-    )
+    # === MongoDB Saver on the shared client ===
+    if checkpointer is None:
+        checkpointer = get_data_store().checkpointer()
 
     # === Initialize the state graph ===
     workflow = StateGraph(AgentState)
@@ -66,6 +69,16 @@ def run_graph():
         )
     )
 
+    ## === 1b. Answer Cache Lookup ===
+    workflow.add_node(
+        "answer_cache_lookup_node",
+        RunnableLambda(answer_cache_lookup).with_config(
+            {
+                "run_async": True
+            }
+        )
+    )
+
     ## === 2. Retriever ===
     workflow.add_node(
         "doc_retriever_node",
@@ -96,6 +109,16 @@ def run_graph():
         )
     )
 
+    ## === 4b. Answer Cache Store ===
+    workflow.add_node(
+        "answer_cache_store_node",
+        RunnableLambda(answer_cache_store).with_config(
+            {
+                "run_async": True
+            }
+        )
+    )
+
     ## === 5. Fallback ===
     workflow.add_node(
         "fallback_agent_node",
@@ -117,7 +140,15 @@ def run_graph():
     )
 
     workflow.set_entry_point("query_rewriter_node")
-    workflow.add_edge("query_rewriter_node", "doc_retriever_node")
+    workflow.add_edge("query_rewriter_node", "answer_cache_lookup_node")
+    workflow.add_conditional_edges(
+        "answer_cache_lookup_node",
+        answer_cache_hit,
+        {
+            "cache_hit": "final_answer_node",
+            "retrieve": "doc_retriever_node"
+        }
+    )
     workflow.add_edge("doc_retriever_node", "doc_grader_node")
     workflow.add_conditional_edges(
         "doc_grader_node",
@@ -127,7 +158,8 @@ def run_graph():
             "fallback": "fallback_agent_node"
         }
     ) 
-    workflow.add_edge("answer_generation_node", "final_answer_node")
+    workflow.add_edge("answer_generation_node", "answer_cache_store_node")
+    workflow.add_edge("answer_cache_store_node", "final_answer_node")
     workflow.add_edge("fallback_agent_node", "final_answer_node")
     workflow.add_edge("final_answer_node", END)
 
@@ -1,21 +1,38 @@
 # === Python Modules ===
+import json
+import time
 import uuid
 from pathlib import Path
-from typing import List
-from fastapi import FastAPI, UploadFile, Form, File
+from typing import Any, AsyncIterator, Dict, List, Tuple
+from fastapi import FastAPI, UploadFile, Form, File, BackgroundTasks
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from dotenv import load_dotenv
-import aiofiles
 
 # === Local Imports ===
-from rag_pipeline.pipeline.data_extract import extract_data_pipeline
 from rag_pipeline.components.upload import upload_file_metadata
-from rag_pipeline.components.retriever import create_retriever
+from rag_pipeline.components.indexer import update_session_index
+from rag_pipeline.components.llm_clients import LLMClientRegistry
+from rag_pipeline.components.retriever_manager import RetrieverManager
+from rag_pipeline.components.jobs import IngestionJobManager, IngestionJob
+from rag_pipeline.components.answer_cache import AnswerCache
+from rag_pipeline.components.registry import get_settings
+from rag_pipeline.components.checkpointing import checkpoint_durability
+from rag_pipeline.components.mongo import get_data_store, set_data_store
+from rag_pipeline.utils.metrics import pipeline_metrics
+from rag_pipeline.components.storage import (
+    UploadLimits,
+    UploadTooLarge,
+    stream_upload_to_disk,
+    commit_uploads,
+    discard_uploads
+)
 
 # === Schema Imports ===
 from src.rag_pipeline.schema.response import (
     UploadResponse,
+    UploadStatusResponse,
     UserQueryResponse
 )
 from rag_pipeline.schema.requests import QueryRequest
@@ -32,12 +49,33 @@ async def lifespan(
     app: FastAPI
 ):
     """
-    Initiates the graph
+    Initiates the data store (one pooled MongoDB client), the graph, the shared LLM
+    client pool, the session retriever cache, the ingestion job runner and the answer cache
     """
     print("Starting up the graph...")
-    app.state.graph = run_graph()
+    app.state.data = get_data_store()
+    try:
+        await app.state.data.ensure_indexes()
+    except Exception as e:
+        print(f"⚠️ Could not create MongoDB indexes: {e}")
+
+    app.state.graph = run_graph(checkpointer = app.state.data.checkpointer())
+    app.state.llm_clients = LLMClientRegistry()
+    app.state.retrievers = RetrieverManager()
+    app.state.jobs = IngestionJobManager()
+    app.state.answer_cache = AnswerCache() if get_settings("answer_cache").get("enabled", True) else None
     yield
     print("Shutting down the graph...")
+    app.state.jobs.shutdown()
+    await app.state.llm_clients.aclose()
+
+    ## === Write checkpoints still buffered in memory ===
+    flush = getattr(app.state.graph.checkpointer, "aclose", None)
+    if flush is not None:
+        await flush()
+
+    await app.state.data.aclose()
+    set_data_store(None)
 
 # === Initialize FastAPI ===
 app = FastAPI(
@@ -60,16 +98,62 @@ BASE_DATA_PATH.mkdir(
     exist_ok = True
 )
 
+# === Lazily Created App-state Components ===
+def get_retrievers() -> RetrieverManager:
+    if not hasattr(app.state, "retrievers"):
+        app.state.retrievers = RetrieverManager()
+    return app.state.retrievers
+
+def get_jobs() -> IngestionJobManager:
+    if not hasattr(app.state, "jobs"):
+        app.state.jobs = IngestionJobManager()
+    return app.state.jobs
+
+# === Background Ingestion of a Session ===
+async def ingest_session(
+    job: IngestionJob,
+    session_id: str,
+    session_folder: Path,
+    known_hashes: Dict[str, str] | None = None
+) -> None:
+    """
+    Indexes the session folder on the ingestion pool (off the event loop),
+    publishes the new retriever and stores file metadata in MongoDB.
+    """
+    # === Index only new/changed files of this session folder ===
+    retriever, metadata, _ = await get_jobs().run_in_pool(
+        update_session_index,
+        session_id = session_id,
+        session_folder = session_folder,
+        known_hashes = known_hashes,
+        progress = job.progress
+    )
+
+    # === Store retriever in FastAPI app state; cached answers refer to the old index ===
+    get_retrievers()[session_id] = retriever
+    answer_cache = getattr(app.state, "answer_cache", None)
+    if answer_cache is not None:
+        answer_cache.invalidate(session_id)
+
+    # === Upload metadata to MongoDB ===
+    async with job.stage("metadata"):
+        await upload_file_metadata(
+            session_id = session_id,
+            file_metadata = metadata
+        )
+
 # === Upload Endpoint ===
 @app.post("/upload/", response_model = UploadResponse)
 async def upload_files(
+    background_tasks: BackgroundTasks,
     session_id: str = Form(None),
     files: List[UploadFile] = File(...)
 ):
     """
     Upload multiple files into a session-specific folder inside `data/`.
     If no session_id is provided, a new one is generated.
-    Extracts metadata and stores it in MongoDB.
+    Returns a job id right away; indexing and metadata storage run in the background
+    and can be followed with `/upload/status/{job_id}`.
     """
     # === Generate session_id if not provided ===
     if not session_id:
@@ -82,41 +166,32 @@ async def upload_files(
         exist_ok = True
     )
 
-    saved_files = []
+    stored = []
+    job = get_jobs().create(session_id)
 
     try:
-        # === Save all uploaded files asynchronously ===
-        for file in files:
-            file_path = session_folder / file.filename
-            async with aiofiles.open(
-                file_path,
-                "wb"
-            ) as f:
-                await f.write(await file.read())
-            saved_files.append(file.filename)
-
-        # === Extract text, tables, metadata from ONLY this session folder ===
-        texts, tables, metadata = extract_data_pipeline(
-            session_folder = Path(session_folder)
-        )
+        # === Stream uploads to disk in chunks, hashing and enforcing limits on the way ===
+        async with job.stage("save"):
+            limits = UploadLimits()
+            for file in files:
+                stored.append(await stream_upload_to_disk(
+                    file = file,
+                    folder = session_folder,
+                    limits = limits
+                ))
+            known_hashes = commit_uploads(stored)
+            saved_files = [upload.file_name for upload in stored]
 
-        # === Create retriever for this session ===
-        retriever, _ = create_retriever(
-            texts = texts,
-            tables = tables,
-            session_id = session_id
-        )
-
-        # === Store retriever in FastAPI app state ===
-        if not hasattr(app.state, "retrievers"):
-            app.state.retrievers = {}
-
-        app.state.retrievers[session_id] = retriever
-
-        # === Upload metadata to MongoDB ===
-        await upload_file_metadata(
-            session_id = session_id,
-            file_metadata = metadata
+        # === Hand the heavy work to the ingestion job ===
+        background_tasks.add_task(
+            get_jobs().run,
+            job,
+            lambda job: ingest_session(
+                job = job,
+                session_id = session_id,
+                session_folder = Path(session_folder),
+                known_hashes = known_hashes
+            )
         )
 
         return UploadResponse(
@@ -124,16 +199,82 @@ async def upload_files(
             session_id = session_id,
             saved_path = str(session_folder.resolve()),
             uploaded_file = ", ".join(saved_files),
-            message = f"✅ Uploaded {len(saved_files)} files for session '{session_id}'."
+            job_id = job.job_id,
+            message = f"✅ Uploaded {len(saved_files)} files for session '{session_id}'. Ingestion job '{job.job_id}' started."
         )
 
     except Exception as e:
+        discard_uploads(stored)
+        get_jobs().fail(job, e)
+        if isinstance(e, UploadTooLarge):
+            return UploadResponse(
+                status = "failure",
+                session_id = session_id,
+                message = str(e)
+            )
         return UploadResponse(
             status = "failure",
             session_id = session_id,
             message = f"❌ Error in uploading files: {str(e)}"
         )
 
+# === Upload Status Endpoint ===
+@app.get("/upload/status/{job_id}", response_model = UploadStatusResponse)
+async def upload_status(job_id: str):
+    """
+    Reports the status of an ingestion job, with progress and timing per stage.
+    """
+    job = get_jobs().get(job_id)
+    if job is None:
+        return UploadStatusResponse(
+            status = "failure",
+            job_id = job_id,
+            message = f"Unknown job '{job_id}'."
+        )
+
+    return UploadStatusResponse(
+        status = "success",
+        **job.to_dict()
+    )
+
+# === Function to Resolve the Retriever of a Session ===
+async def resolve_session(
+    session_id: str
+) -> Tuple[Any, UserQueryResponse | None]:
+    """
+    Returns the session retriever (resident, or restored from models/<session_id>),
+    or the response to send when the session cannot be queried.
+    """
+    try:
+        return await get_retrievers().aget(session_id), None
+    except KeyError:
+        if get_jobs().is_ingesting(session_id):
+            return None, UserQueryResponse(
+                status = "not_ready",
+                session_id = session_id,
+                message = f"Session '{session_id}' is still being ingested. Please retry shortly."
+            )
+
+        return None, UserQueryResponse(
+            status = "failure",
+            session_id = session_id,
+            message = f"Unknown session '{session_id}'. Please upload files first."
+        )
+
+# === Function to Build the Graph Config of a Query ===
+def graph_config(
+    session_id: str,
+    retriever: Any
+) -> Dict[str, Any]:
+    return {
+        "configurable": {
+            "retriever": retriever,
+            "llm_clients": getattr(app.state, "llm_clients", None),
+            "answer_cache": getattr(app.state, "answer_cache", None),
+            "thread_id": session_id
+        }
+    }
+
 # === User Query Endpoint ===
 @app.post("/query/", response_model=UserQueryResponse)
 async def user_query(request: QueryRequest):
@@ -145,7 +286,10 @@ async def user_query(request: QueryRequest):
         session_id = request.session_id
         user_query = request.user_query
 
-        retriever = app.state.retrievers[session_id]
+        # === Resident retriever, or restored from models/<session_id> ===
+        retriever, error = await resolve_session(session_id)
+        if error is not None:
+            return error
 
         # === Step 1: Access pre-initialized LangGraph ===
         if not hasattr(app.state, "graph"):
@@ -160,12 +304,8 @@ async def user_query(request: QueryRequest):
         # === Step 2: Run the RAG pipeline ===
         response = await graph.ainvoke(
             input = {"question": user_query},
-            config = {
-                "configurable": {
-                    "retriever": retriever,
-                    "thread_id": session_id
-                }
-            }
+            config = graph_config(session_id, retriever),
+            durability = checkpoint_durability()
         )
 
         # === Step 3: Extract structured output ===
@@ -183,4 +323,100 @@ async def user_query(request: QueryRequest):
         return UserQueryResponse(
             status = "failure",
             message = f"Error while processing query: {e}"
-        )
\ No newline at end of file
+        )
+
+# === Function to Format a Server-sent Event ===
+def sse_event(
+    event: str,
+    data: Dict[str, Any]
+) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default = str)}\n\n"
+
+# === Streaming Query Events ===
+async def query_events(
+    session_id: str,
+    user_query: str
+) -> AsyncIterator[str]:
+    """
+    Runs the graph with `astream` and yields SSE events:
+    `node` when a node finishes, `token` for each answer delta, then `done`
+    (final answer, time to first token, total time) or `error`.
+    """
+    start = time.perf_counter()
+    ttft_ms = None
+    answer = None
+
+    try:
+        retriever, error = await resolve_session(session_id)
+        if error is not None:
+            yield sse_event("error", error.model_dump())
+            return
+
+        if not hasattr(app.state, "graph"):
+            yield sse_event("error", {"status": "failure", "message": "LangGraph not initialized. Please restart the server."})
+            return
+
+        async for mode, chunk in app.state.graph.astream(
+            input = {"question": user_query},
+            config = graph_config(session_id, retriever),
+            stream_mode = ["updates", "custom"],
+            durability = checkpoint_durability()
+        ):
+            ## === Answer tokens written by answer_generation ===
+            if mode == "custom" and chunk.get("type") == "token":
+                if ttft_ms is None:
+                    ttft_ms = round((time.perf_counter() - start) * 1000, 1)
+                yield sse_event("token", {"delta": chunk["delta"]})
+
+            ## === A node finished ===
+            elif mode == "updates":
+                for node, update in chunk.items():
+                    if isinstance(update, dict) and update.get("generated_answer"):
+                        answer = update["generated_answer"]
+                    yield sse_event("node", {"node": node})
+
+        total_ms = round((time.perf_counter() - start) * 1000, 1)
+        print(f"⏱️ Streamed query for '{session_id}': first token {ttft_ms} ms, total {total_ms} ms.")
+        yield sse_event("done", {
+            "status": "success",
+            "session_id": session_id,
+            "answer": answer or "No answer generated.",
+            "ttft_ms": ttft_ms,
+            "total_ms": total_ms
+        })
+
+    except Exception as e:
+        import traceback
+        print("⚠️ Error during streamed query:", traceback.format_exc())
+        yield sse_event("error", {"status": "failure", "session_id": session_id, "message": f"Error while processing query: {e}"})
+
+# === Streaming User Query Endpoint ===
+@app.post("/query/stream")
+async def user_query_stream(request: QueryRequest):
+    """
+    Same pipeline as `/query/`, streamed as server-sent events:
+    node progress first, then the answer tokens as they are generated.
+    """
+    return StreamingResponse(
+        query_events(
+            session_id = request.session_id,
+            user_query = request.user_query
+        ),
+        media_type = "text/event-stream",
+        headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# === Metrics Endpoint ===
+@app.get("/metrics/")
+async def metrics():
+    """
+    Reports runtime counters of the serving components.
+    """
+    retrievers = getattr(app.state, "retrievers", None)
+    answer_cache = getattr(app.state, "answer_cache", None)
+
+    return {
+        "retrievers": retrievers.stats() if retrievers is not None else {},
+        "answer_cache": answer_cache.stats() if answer_cache is not None else {},
+        "pipeline": pipeline_metrics.snapshot()
+    }
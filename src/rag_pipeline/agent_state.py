@@ -15,13 +15,17 @@ class AgentState(TypedDict):
     ## === Rephrased Question ===
     rephrased_question: str | None
 
-    ## === Documents ===
+    ## === Documents (chunk references: session_id, chunk_id, score; never the text) ===
     documents: list | None
+    retrieved_for: str | None
     proceed_to_generate: bool
 
     ## === Fallback ===
     fallback_message: str | None
     fallback_used: bool
 
+    ## === Answer Cache ===
+    answer_cache_hit: bool
+
     ## === Generated Answer ===
     generated_answer: str | None
\ No newline at end of file
@@ -0,0 +1,83 @@
+# === Agent State ===
+from rag_pipeline.agent_state import AgentState
+
+# === Components ===
+from rag_pipeline.components.answer_cache import query_embeddings
+from rag_pipeline.components.retriever import embed_query
+
+# === Utils ===
+from rag_pipeline.utils.conversation import update_recent_chats
+
+def _cache_and_session(
+        config
+) -> tuple:
+    configurable = (config or {}).get("configurable", {})
+    return configurable.get("answer_cache"), configurable.get("thread_id"), configurable.get("retriever")
+
+# === Answer Cache Lookup Agent ===
+async def answer_cache_lookup(
+        state: AgentState,
+        config = None
+) -> AgentState:
+    """
+    Looks up the rephrased question in the session's answer cache.
+    On a hit the cached answer is used and the graph skips to the final answer.
+
+    Args:
+        state (AgentState): The current state holding the rephrased question.
+        config: Graph config; `configurable.answer_cache` is the shared cache (disabled if missing).
+
+    Returns:
+        AgentState: The state with `answer_cache_hit` set (and the answer on a hit).
+    """
+    state["answer_cache_hit"] = False
+
+    cache, session_id, retriever = _cache_and_session(config)
+    embeddings = query_embeddings(retriever)
+    question = state.get("rephrased_question")
+    if cache is None or embeddings is None or not session_id or not question:
+        return state
+
+    vector = await embed_query(retriever, question)
+    entry = cache.lookup(
+        session_id = session_id,
+        question = question,
+        vector = vector
+    )
+
+    if entry is not None:
+        print(f"⚡ Answer cache hit for session '{session_id}' (saved ~{entry.cost_s:.2f}s).")
+        state["answer_cache_hit"] = True
+        state["generated_answer"] = entry.answer
+        state["messages"] = update_recent_chats(
+            recent_chats = state.get("messages", []),
+            latest_question = question,
+            latest_answer = entry.answer_history
+        )
+
+    return state
+
+# === Answer Cache Store Agent ===
+async def answer_cache_store(
+        state: AgentState,
+        config = None
+) -> AgentState:
+    """
+    Stores a freshly generated answer in the session's answer cache.
+    """
+    cache, session_id, _ = _cache_and_session(config)
+    if cache is None or not session_id or not state.get("generated_answer"):
+        return state
+
+    ## === The last chat-memory entry holds this turn's concise answer ===
+    messages = state.get("messages") or {}
+    last_turn = list(messages.values())[-1] if messages else {}
+
+    cache.store(
+        session_id = session_id,
+        question = state.get("rephrased_question"),
+        answer = state["generated_answer"],
+        answer_history = last_turn.get("answer", state["generated_answer"])
+    )
+
+    return state
@@ -1,6 +1,76 @@
+# === Python Modules ===
+import asyncio
+import numpy as np
+from typing import Any, List, Tuple
+
 # === Agent State ===
 from rag_pipeline.agent_state import AgentState
 
+# === Components ===
+from rag_pipeline.components.retriever import embed_query, search_by_vector, supports_vector_search
+from rag_pipeline.components.chunk_refs import to_refs
+
+# === Utils ===
+from rag_pipeline.utils.metrics import pipeline_metrics
+
+# === Function to Retrieve and Keep the Query Vector ===
+async def retrieve_with_vector(
+        retriever: Any,
+        query: str
+) -> Tuple[list, List[float]]:
+    """
+    Embeds the query once and searches with that vector.
+
+    Returns:
+        Tuple[list, List[float]]: Retrieved documents and the query embedding.
+    """
+    vector = await embed_query(retriever, query)
+    return await search_by_vector(retriever, vector, query), vector
+
+# === Function to Settle a Speculative Retrieval ===
+async def resolve_speculation(
+        retriever: Any,
+        question: str,
+        rephrased_question: str,
+        speculation: "asyncio.Task",
+        threshold: float
+) -> list:
+    """
+    Decides whether documents retrieved for the raw question can stand in for the
+    rephrased question: kept if both are textually equal or their embeddings have
+    cosine similarity >= threshold, otherwise retrieval is re-issued with the
+    rephrased question's vector.
+
+    Args:
+        retriever: Session retriever supporting vector search.
+        question (str): Raw user question (speculatively retrieved).
+        rephrased_question (str): Output of the rewriter.
+        speculation (asyncio.Task): Task returning `retrieve_with_vector(retriever, question)`.
+        threshold (float): Minimum cosine similarity to keep the speculative documents.
+
+    Returns:
+        list: Documents for the rephrased question.
+    """
+    documents, question_vector = await speculation
+
+    if " ".join(question.lower().split()) == " ".join(rephrased_question.lower().split()):
+        pipeline_metrics.incr("speculative_retrieval.kept_exact")
+        return documents
+
+    rephrased_vector = np.asarray(await embed_query(retriever, rephrased_question), dtype = np.float32)
+    question_vector = np.asarray(question_vector, dtype = np.float32)
+    similarity = float(
+        rephrased_vector @ question_vector
+        / ((np.linalg.norm(rephrased_vector) * np.linalg.norm(question_vector)) or 1.0)
+    )
+
+    if similarity >= threshold:
+        pipeline_metrics.incr("speculative_retrieval.kept_similar")
+        return documents
+
+    pipeline_metrics.incr("speculative_retrieval.reissued")
+    return await search_by_vector(retriever, rephrased_vector.tolist(), rephrased_question)
+
 # === Main Retriever Agent ===
 async def doc_retriever(
         state: AgentState,
@@ -8,6 +78,10 @@ async def doc_retriever(
 ) -> AgentState:
     """
     Main function to retrieve documents based on the current state and configuration.
+    Documents already retrieved for the rephrased question (speculative retrieval
+    in the rewriter) are reused as is. The state keeps chunk references, not text
+    (see `chunk_refs.to_refs`).
+
     Args:
         state (AgentState): The current state of the agent.
         config: Configuration parameters for the retrieval process.
@@ -17,11 +91,19 @@ async def doc_retriever(
     """
     ## === Getting the retriever and query ===
     retriever = config.get("configurable", {}).get("retriever", None)
+    session_id = config.get("configurable", {}).get("thread_id")
     query = state.get("rephrased_question", "")
 
-    # === Retrieving documents ===
-    documents = await retriever.ainvoke(query)
+    if state.get("retrieved_for") is not None and state.get("retrieved_for") == query:
+        return state
+
+    # === Retrieving documents (reusing a memoized query embedding when possible) ===
+    if supports_vector_search(retriever):
+        documents = await search_by_vector(retriever, await embed_query(retriever, query), query)
+    else:
+        documents = await retriever.ainvoke(query)
 
-    state["documents"] = documents
+    state["documents"] = to_refs(documents, session_id)
+    state["retrieved_for"] = query
 
-    return state
\ No newline at end of file
+    return state
@@ -1,6 +1,6 @@
 # === Python Modules ===
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import SystemMessage, HumanMessage
+from langgraph.config import get_stream_writer
 
 # === Agent State ===
 from rag_pipeline.agent_state import AgentState
@@ -8,53 +8,103 @@ from rag_pipeline.agent_state import AgentState
 # === Components ===
 from rag_pipeline.components.prompts import render_prompt
 from rag_pipeline.components.models import ModelConfig
+from rag_pipeline.components.llm_clients import get_llm_clients
+from rag_pipeline.components.context_builder import build_context
+from rag_pipeline.components.chunk_refs import resolve_refs
 
 # === Schema ===
 from rag_pipeline.schema.schema import AnswerGeneration
 
 # === Utils ===
 from rag_pipeline.utils.conversation import update_recent_chats
+from rag_pipeline.utils.chunking import get_token_counter
+from rag_pipeline.utils.metrics import pipeline_metrics
+
+# === Function to Get the Graph's Custom Stream Writer ===
+def _stream_writer():
+    """
+    Returns LangGraph's writer for `stream_mode="custom"` events,
+    or a no-op when the agent runs outside a graph.
+    """
+    try:
+        return get_stream_writer()
+    except RuntimeError:
+        return lambda chunk: None
 
 # === Answer Generation Agent ===
 async def answer_generation(
-        state: AgentState
+        state: AgentState,
+        config = None
 ) -> AgentState:
     """
     Generates the final answer based on the rephrased question and relevant documents.
+    While the answer is generated, each new piece of the `answer` field is emitted as a
+    `{"type": "token", "delta": ...}` custom stream event.
 
     Args:
         state (AgentState): The current state of the agent containing the rephrased question and documents.
+        config: Graph config; `configurable.llm_clients` provides the shared LLM client registry
+                and `configurable.retriever` resolves chunk references.
 
     Returns:
         AgentState: The updated state with the generated answer.
     """
+    ## === Load Model Configuration ===
+    model = ModelConfig()
+    model_details = model.get_agent_model(
+        agent_name = "answer_generation"
+    )
+    model_name = model_details.get("name")
+
+    ## === Resolve the graded chunk references and pack them into the model's context budget ===
+    documents = resolve_refs(
+        items = state.get("documents") or [],
+        retriever = ((config or {}).get("configurable") or {}).get("retriever")
+    )
+    count = get_token_counter(model_details.get("encoding", "o200k_base"))
+    context, stats = build_context(
+        documents = documents,
+        max_tokens = model_details.get("context_tokens", 6000),
+        count = count
+    )
+    pipeline_metrics.incr("generation.context_tokens_before", stats["tokens_before"])
+    pipeline_metrics.incr("generation.context_tokens_after", stats["tokens"])
+    print(
+        f"🧾 Context: {stats['used']}/{stats['documents']} chunks ({stats['truncated']} truncated, "
+        f"{stats['dropped']} dropped, {stats['deduplicated']} duplicates), "
+        f"{stats['tokens_before']} -> {stats['tokens']} tokens."
+    )
+
     ## === Render Prompt ===
     prompt = render_prompt(
         prompt_name = "answer_generation",
         user_query = state.get("rephrased_question"),
-        documents = state.get("documents")
+        documents = context
     )
 
-    ## === Load Model Configuration ===
-    model = ModelConfig()
-    model_name = model.get_agent_model(
-        agent_name = "answer_generation"
-    ).get("name")
-
-    # === Initialize Language Model ===
-    llm = ChatOpenAI(
+    # === Initialize Language Model (streams partial JSON) ===
+    llm = get_llm_clients(config).get_json_stream(
         model_name = model_name,
-        temperature = 0.0
-    ).with_structured_output(AnswerGeneration)
+        temperature = 0.0,
+        schema = AnswerGeneration
+    )
 
     message = [
         SystemMessage(content = prompt["system"]),
         HumanMessage(content = prompt["user"])
     ]
 
-    response = await llm.ainvoke(
-        message
-    )
+    ## === Forward `answer` tokens to stream consumers as they arrive ===
+    writer = _stream_writer()
+    streamed = ""
+    partial = {}
+    async for partial in llm.astream(message):
+        answer = (partial or {}).get("answer") or ""
+        if len(answer) > len(streamed):
+            writer({"type": "token", "delta": answer[len(streamed):]})
+            streamed = answer
+
+    response = AnswerGeneration.model_validate(partial or {})
 
     ## === Outputs ===
     state["generated_answer"] = response.answer
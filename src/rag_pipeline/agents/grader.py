@@ -1,5 +1,5 @@
 # === Python Modules ===
-from langchain_openai import ChatOpenAI
+import asyncio
 from langchain_core.messages import SystemMessage, HumanMessage
 
 # === Agent State ===
@@ -8,58 +8,282 @@ from rag_pipeline.agent_state import AgentState
 # === Components ===
 from rag_pipeline.components.prompts import render_prompt
 from rag_pipeline.components.models import ModelConfig
+from rag_pipeline.components.llm_clients import get_llm_clients
+from rag_pipeline.components.relevance import local_relevance, classify_relevance
+from rag_pipeline.components.chunk_refs import resolve_ref
 
 # === Schema ===
-from rag_pipeline.schema.schema import DocGrader
+from rag_pipeline.schema.schema import DocGrader, DocGraderBatch
+
+# === Utils ===
+from rag_pipeline.utils.metrics import pipeline_metrics
+
+# === Grade a Single Document ===
+async def grade_document(
+        llm,
+        question: str,
+        document,
+        semaphore: asyncio.Semaphore
+) -> bool:
+    """
+    Grades a single document, holding a semaphore slot for the duration of the LLM call.
+
+    Args:
+        llm: Structured-output runnable returning a `DocGrader`.
+        question (str): The (rephrased) user question.
+        document: The retrieved LangChain document.
+        semaphore (asyncio.Semaphore): Limits the number of in-flight grader calls.
+
+    Returns:
+        bool: True if the grader marked the document as relevant.
+    """
+    ## === Prompt ===
+    prompt = render_prompt(
+        prompt_name = "retrieval_grader",
+        question = question,
+        document = document.page_content
+    )
+
+    messages = [
+        SystemMessage(content = prompt["system"]),
+        HumanMessage(content = prompt["user"])
+    ]
+
+    async with semaphore:
+        response = await llm.ainvoke(
+            messages
+        )
+
+    return response.score.strip().lower() == "yes"
+
+# === Grade All Documents in Parallel ===
+async def grade_documents_parallel(
+        llm,
+        question: str,
+        documents: list,
+        max_concurrency: int
+) -> list:
+    """
+    Grades every document with its own LLM call, bounded by `max_concurrency`.
+
+    Returns:
+        list: One entry per document, either a bool verdict or the raised exception.
+    """
+    semaphore = asyncio.Semaphore(
+        max(1, int(max_concurrency))
+    )
+    return await asyncio.gather(
+        *[
+            grade_document(
+                llm = llm,
+                question = question,
+                document = document,
+                semaphore = semaphore
+            )
+            for document in documents
+        ],
+        return_exceptions = True
+    )
+
+# === Grade All Documents in a Single Call ===
+async def grade_documents_batch(
+        llm,
+        question: str,
+        documents: list
+) -> list[bool] | None:
+    """
+    Grades all documents with one structured-output call.
+
+    Args:
+        llm: Structured-output runnable returning a `DocGraderBatch`.
+        question (str): The (rephrased) user question.
+        documents (list): The retrieved LangChain documents.
+
+    Returns:
+        list[bool] | None: One verdict per document in retrieval order,
+                           or None if the call failed or the output was malformed.
+    """
+    ## === Prompt ===
+    prompt = render_prompt(
+        prompt_name = "retrieval_grader_batch",
+        question = question,
+        documents = "\n\n".join(
+            f"[{idx}]\n{document.page_content}"
+            for idx, document in enumerate(documents)
+        )
+    )
+
+    messages = [
+        SystemMessage(content = prompt["system"]),
+        HumanMessage(content = prompt["user"])
+    ]
+
+    try:
+        response = await llm.ainvoke(
+            messages
+        )
+        grades = {grade.index: grade.score for grade in response.grades}
+    except Exception as e:
+        print(f"⚠️ Batched grading failed: {e}")
+        return None
+
+    ## === Every index must be graded exactly once ===
+    if len(response.grades) != len(documents) or set(grades) != set(range(len(documents))):
+        print(f"⚠️ Batched grading returned {len(response.grades)} verdicts for {len(documents)} documents.")
+        return None
+
+    return [grades[idx].strip().lower() == "yes" for idx in range(len(documents))]
+
+# === Grade Documents Locally from Scores ===
+def grade_documents_local(
+        question: str,
+        documents: list,
+        settings: dict
+) -> list:
+    """
+    Decides relevance from the FAISS similarity (`metadata["retrieval_score"]`) blended
+    with a lexical-overlap score, using the calibrated accept/reject thresholds.
+
+    Args:
+        question (str): The (rephrased) user question.
+        documents (list): The retrieved LangChain documents.
+        settings (dict): `lexical_weight`, `accept_threshold` and `reject_threshold`.
+
+    Returns:
+        list: One entry per document: True / False, or None when borderline (needs the LLM).
+    """
+    scores = local_relevance(
+        question = question,
+        texts = [document.page_content for document in documents],
+        retrieval_scores = [document.metadata.get("retrieval_score") for document in documents],
+        lexical_weight = settings.get("lexical_weight", 0.1)
+    )
+    decisions = classify_relevance(
+        scores = scores,
+        accept_threshold = settings.get("accept_threshold", 0.67),
+        reject_threshold = settings.get("reject_threshold", 0.50)
+    )
+
+    return [None if decision < 0 else bool(decision) for decision in decisions]
 
 # === Main Agent Body ===
 async def doc_grader(
-        state: AgentState
+        state: AgentState,
+        config = None
 ) -> AgentState:
     """
     Grades the relevance of retrieved documents to the user's query.
+    The grading mode is selected in models.yaml: "parallel" grades documents concurrently
+    (bounded by `max_concurrency`), "batch" grades all of them in a single call and falls
+    back to parallel grading if the batched output is unusable, and "local" decides from
+    retrieval and lexical scores, sending only borderline documents to the LLM.
+    The original retrieval order is preserved. Chunk references in the state are
+    resolved from the session retriever for grading, and the kept ones stay references.
 
     Args:
         state (AgentState): The current state of the agent, including the user's question and retrieved documents.
+        config: Graph config; `configurable.llm_clients` provides the shared LLM client registry
+                and `configurable.retriever` the session store the references point into.
 
     Returns:
         AgentState: The updated state with graded documents.
     """
-    relavant_docs: list = []
-    for document in state.get("documents"):
-        ## === Prompt ===
-        prompt = render_prompt(
-            prompt_name = "retrieval_grader",
-            question = state.get("rephrased_question"),
-            document = document.page_content
+    question = state.get("rephrased_question")
+
+    ## === Resolve chunk references (chunks removed since retrieval are skipped) ===
+    retriever = ((config or {}).get("configurable") or {}).get("retriever")
+    resolved = [(item, resolve_ref(item, retriever)) for item in state.get("documents") or []]
+    resolved = [(item, document) for item, document in resolved if document is not None]
+    items = [item for item, _ in resolved]
+    documents = [document for _, document in resolved]
+
+    ## === Get Model ===
+    model = ModelConfig()
+    model_name = model.get_agent_model(
+        agent_name = "retrieval_grader"
+    ).get("name")
+    settings = model.get_agent_settings(
+        agent_name = "retrieval_grader"
+    )
+    llm_clients = get_llm_clients(config)
+
+    grading_mode = settings.get("grading_mode", "parallel")
+
+    ## === Local grading; only borderline documents go to the LLM ===
+    if documents and grading_mode == "local":
+        results = grade_documents_local(
+            question = question,
+            documents = documents,
+            settings = settings.get("local") or {}
         )
+        borderline = [idx for idx, result in enumerate(results) if result is None]
+        pipeline_metrics.incr("grader.local_decided", len(documents) - len(borderline))
 
-        ## === Get Model ===
-        model = ModelConfig()
-        model_name = model.get_agent_model(
-            agent_name = "retrieval_grader"
-        ).get("name")
+        if borderline:
+            llm = llm_clients.get_structured(
+                model_name = model_name,
+                temperature = 0.0,
+                schema = DocGrader
+            )
+            pipeline_metrics.incr("grader.llm_calls", len(borderline))
+            llm_results = await grade_documents_parallel(
+                llm = llm,
+                question = question,
+                documents = [documents[idx] for idx in borderline],
+                max_concurrency = settings.get("max_concurrency", 5)
+            )
+            for idx, result in zip(borderline, llm_results):
+                results[idx] = result
 
-        ## === LLM ===
-        llm = ChatOpenAI(
-            model = model_name,
-            temperature = 0.0
-        ).with_structured_output(DocGrader)
+    ## === Batched grading (one request per query) ===
+    elif documents and grading_mode == "batch":
+        batch_llm = llm_clients.get_structured(
+            model_name = model_name,
+            temperature = 0.0,
+            schema = DocGraderBatch
+        )
 
-        messages = [
-            SystemMessage(content = prompt["system"]),
-            HumanMessage(content = prompt["user"])
-        ]
+        pipeline_metrics.incr("grader.llm_calls")
+        results = await grade_documents_batch(
+            llm = batch_llm,
+            question = question,
+            documents = documents
+        )
+        if results is None:
+            print("↩️ Falling back to per-document grading.")
 
-        response = await llm.ainvoke(
-            messages
+    else:
+        results = None
+
+    ## === Per-document grading ===
+    if results is None:
+        llm = llm_clients.get_structured(
+            model_name = model_name,
+            temperature = 0.0,
+            schema = DocGrader
+        )
+
+        pipeline_metrics.incr("grader.llm_calls", len(documents))
+        results = await grade_documents_parallel(
+            llm = llm,
+            question = question,
+            documents = documents,
+            max_concurrency = settings.get("max_concurrency", 5)
         )
 
-        if response.score.strip().lower() == "yes":
-            relavant_docs.append(document)
-    
+    ## === Keep relevant documents in retrieval order ===
+    keep_on_error = settings.get("on_error", "keep") == "keep"
+    relavant_docs: list = []
+    for item, result in zip(items, results):
+        if isinstance(result, Exception):
+            print(f"⚠️ Grading failed for a document ({'kept' if keep_on_error else 'dropped'}): {result}")
+            result = keep_on_error
+
+        if result:
+            relavant_docs.append(item)
+
     ## === Output ===
     state["documents"] = relavant_docs
     state["proceed_to_generate"] = len(relavant_docs) > 0
 
-    return state
\ No newline at end of file
+    return state
@@ -1,5 +1,6 @@
 # === Python Modules ===
-from langchain_openai import ChatOpenAI
+import re
+import asyncio
 from langchain_core.messages import SystemMessage, HumanMessage
 
 # === Agent State ===
@@ -8,19 +9,66 @@ from rag_pipeline.agent_state import AgentState
 # === Components ===
 from rag_pipeline.components.prompts import render_prompt
 from rag_pipeline.components.models import ModelConfig
+from rag_pipeline.components.llm_clients import get_llm_clients
+from rag_pipeline.components.retriever import supports_vector_search
+from rag_pipeline.components.chunk_refs import to_refs
+
+# === Agents ===
+from rag_pipeline.agents.doc_retriever import retrieve_with_vector, resolve_speculation
 
 # === Schema ===
 from rag_pipeline.schema.schema import QueryRewrite
 
 # === Utils ===
 from rag_pipeline.utils.conversation import format_conversation_for_llm
+from rag_pipeline.utils.metrics import pipeline_metrics
+
+# === Words and Openers That Refer Back to the Conversation ===
+ANAPHORA_PATTERN = re.compile(
+    r"\b(it|its|it's|itself|they|them|their|theirs|this|that|these|those|he|him|his|she|her|hers|"
+    r"former|latter|above|previous|previously|earlier|same|such|aforementioned|mentioned|"
+    r"again|else|other|another|one|ones|there|then)\b"
+    r"|^\s*(and|also|or|but|so|what about|how about|why not|same for|more|more on|elaborate|explain more|continue)\b",
+    re.IGNORECASE
+)
+
+# === Function to Check Whether a Question Needs the Conversation ===
+def needs_rewrite(
+        question: str,
+        conversation: str,
+        min_words: int = 4
+) -> bool:
+    """
+    Cheap local check deciding whether the rewriter LLM is needed.
+    Without history there is nothing to resolve; with history, a question is sent
+    to the LLM only if it is very short or contains a referring word
+    ("it", "that report", "the previous one", "what about ...").
+
+    Args:
+        question (str): The user's current question.
+        conversation (str): The formatted chat history ("" when there is none).
+        min_words (int): Questions shorter than this are treated as follow-ups.
+
+    Returns:
+        bool: True if the question should be rewritten by the LLM.
+    """
+    if not conversation.strip():
+        return False
+
+    if len(question.split()) < min_words:
+        return True
+
+    return ANAPHORA_PATTERN.search(question) is not None
 
 # === Main Agent Body ===
 async def query_rewriter(
-        state: AgentState
+        state: AgentState,
+        config = None
 ) -> AgentState:
     """
     Rewrites the user's query to be more specific and context-aware.
+    The LLM call is skipped when `needs_rewrite` finds nothing to resolve; when it
+    runs, retrieval on the raw question can run speculatively alongside it.
     """
     ## === Rephrased Question ===
     state["rephrased_question"] = None
@@ -30,6 +78,7 @@ async def query_rewriter(
 
     ## === Document List ===
     state["documents"] = []
+    state["retrieved_for"] = None
 
     ## === Fallback Message ===
     state["fallback_message"] = None
@@ -50,6 +99,17 @@ async def query_rewriter(
         recent_chats = state.get("messages", {})
     )
 
+    ## === Fast path: nothing to resolve, use the question as is ===
+    model = ModelConfig()
+    settings = model.get_agent_settings("question_rewriter")
+    fast_path = settings.get("fast_path", True)
+    if fast_path and current_question.strip() and not needs_rewrite(current_question, conversation):
+        pipeline_metrics.incr("query_rewriter.fast_path")
+        state["rephrased_question"] = current_question.strip()
+        return state
+
+    pipeline_metrics.incr("query_rewriter.llm_calls")
+
     ## === Prompt ===
     prompt = render_prompt(
         prompt_name = "question_rewriter",
@@ -58,27 +118,57 @@ async def query_rewriter(
     )
 
     ## === Get Model ===
-    model = ModelConfig()
     model_name = model.get_agent_model(
         agent_name = "question_rewriter"
     ).get("name")
 
     ## === LLM ===
-    llm = ChatOpenAI(
-        model = model_name,
-        temperature = 0.0
-    ).with_structured_output(QueryRewrite)
+    llm = get_llm_clients(config).get_structured(
+        model_name = model_name,
+        temperature = 0.0,
+        schema = QueryRewrite
+    )
 
     messages = [
         SystemMessage(content = prompt["system"]),
         HumanMessage(content = prompt["user"])
     ]
 
-    response = await llm.ainvoke(
-        messages
-    )
+    ## === Speculative retrieval on the raw question, overlapping the LLM call ===
+    retriever = ((config or {}).get("configurable") or {}).get("retriever")
+    speculation = None
+    if settings.get("speculative_retrieval", False) and supports_vector_search(retriever):
+        speculation = asyncio.create_task(
+            retrieve_with_vector(retriever, current_question)
+        )
+
+    try:
+        response = await llm.ainvoke(
+            messages
+        )
+    except BaseException:
+        if speculation is not None:
+            speculation.cancel()
+        raise
 
     ## === Output ===
     state["rephrased_question"] = response.rephrased_question
 
+    ## === Keep or re-issue the speculative documents (doc_retriever retries on failure) ===
+    if speculation is not None:
+        try:
+            documents = await resolve_speculation(
+                retriever = retriever,
+                question = current_question,
+                rephrased_question = response.rephrased_question,
+                speculation = speculation,
+                threshold = settings.get("speculation_threshold", 0.9)
+            )
+            state["documents"] = to_refs(documents, (config or {}).get("configurable", {}).get("thread_id"))
+            state["retrieved_for"] = response.rephrased_question
+
+        except Exception as e:
+            pipeline_metrics.incr("speculative_retrieval.failed")
+            print(f"⚠️ Speculative retrieval failed, retrieving after the rewrite: {e}")
+
     return state
\ No newline at end of file
@@ -0,0 +1,179 @@
+# === Python Modules ===
+import time
+import numpy as np
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+from langchain_core.embeddings import Embeddings
+
+# === Components ===
+from rag_pipeline.components.registry import get_settings
+
+# === A Cached Answer ===
+@dataclass
+class CachedAnswer:
+    question: str
+    vector: np.ndarray
+    answer: str
+    answer_history: str
+    cost_s: float
+    created_at: float
+
+# === Function to Get the Query Embedding Model of a Retriever ===
+def query_embeddings(
+        retriever: Any
+) -> Optional[Embeddings]:
+    """
+    Returns the embedding model of the retriever's vector store, if it has one.
+    """
+    vectorstore = getattr(retriever, "vectorstore", None)
+    return getattr(vectorstore, "embeddings", None)
+
+# === Per-session Semantic Answer Cache ===
+class AnswerCache:
+    def __init__(
+            self,
+            similarity_threshold: Optional[float] = None,
+            ttl_s: Optional[float] = None,
+            max_entries_per_session: Optional[int] = None,
+            max_sessions: Optional[int] = None
+    ):
+        """
+        Caches generated answers per session, keyed by the embedding of the rephrased
+        question. A lookup hits when a live entry has cosine similarity >= threshold.
+        Sessions and entries are evicted LRU; entries also expire after `ttl_s`.
+
+        Args:
+            similarity_threshold (float, optional): Minimum cosine similarity of a hit.
+            ttl_s (float, optional): Seconds an answer stays valid.
+            max_entries_per_session (int, optional): Answers kept per session.
+            max_sessions (int, optional): Sessions kept in the cache.
+        """
+        settings = get_settings("answer_cache")
+        self.similarity_threshold = similarity_threshold or settings.get("similarity_threshold", 0.95)
+        self.ttl_s = ttl_s or settings.get("ttl_s", 3600)
+        self.max_entries_per_session = max_entries_per_session or settings.get("max_entries_per_session", 256)
+        self.max_sessions = max_sessions or settings.get("max_sessions", 1024)
+
+        self._sessions: "OrderedDict[str, OrderedDict[str, CachedAnswer]]" = OrderedDict()
+        self._pending: "OrderedDict[Tuple[str, str], Tuple[np.ndarray, float]]" = OrderedDict()
+
+        self.counters: Dict[str, float] = {
+            "lookups": 0,
+            "hits": 0,
+            "stores": 0,
+            "invalidations": 0,
+            "latency_saved_s_total": 0.0
+        }
+
+    @staticmethod
+    def _normalize(
+            vector: List[float]
+    ) -> np.ndarray:
+        vector = np.asarray(vector, dtype = np.float32)
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm else vector
+
+    # === Function to Look Up a Question ===
+    def lookup(
+            self,
+            session_id: str,
+            question: str,
+            vector: List[float]
+    ) -> Optional[CachedAnswer]:
+        """
+        Returns the most similar live answer of the session, or None.
+        On a miss, the question is remembered so `store` can reuse its vector and
+        measure how long the full pipeline took.
+        """
+        self.counters["lookups"] += 1
+        vector = self._normalize(vector)
+        entries = self._sessions.get(session_id)
+
+        if entries:
+            self._sessions.move_to_end(session_id)
+
+            ## === Drop expired answers ===
+            now = time.time()
+            for key in [k for k, e in entries.items() if now - e.created_at > self.ttl_s]:
+                entries.pop(key)
+
+            if entries:
+                keys = list(entries)
+                matrix = np.stack([entries[k].vector for k in keys])
+                scores = matrix @ vector
+                best = int(np.argmax(scores))
+
+                if scores[best] >= self.similarity_threshold:
+                    entry = entries[keys[best]]
+                    entries.move_to_end(keys[best])
+                    self.counters["hits"] += 1
+                    self.counters["latency_saved_s_total"] += entry.cost_s
+                    return entry
+
+        self._pending[(session_id, question)] = (vector, time.perf_counter())
+        while len(self._pending) > self.max_sessions:
+            self._pending.popitem(last = False)
+
+        return None
+
+    # === Function to Store a Generated Answer ===
+    def store(
+            self,
+            session_id: str,
+            question: str,
+            answer: str,
+            answer_history: str
+    ) -> bool:
+        """
+        Caches the answer of a question previously missed by `lookup`.
+
+        Returns:
+            bool: False if the question was not looked up first (nothing stored).
+        """
+        pending = self._pending.pop((session_id, question), None)
+        if pending is None:
+            return False
+
+        vector, started = pending
+        entries = self._sessions.setdefault(session_id, OrderedDict())
+        self._sessions.move_to_end(session_id)
+
+        entries[question] = CachedAnswer(
+            question = question,
+            vector = vector,
+            answer = answer,
+            answer_history = answer_history,
+            cost_s = time.perf_counter() - started,
+            created_at = time.time()
+        )
+        entries.move_to_end(question)
+        self.counters["stores"] += 1
+
+        ## === LRU bounds ===
+        while len(entries) > self.max_entries_per_session:
+            entries.popitem(last = False)
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last = False)
+
+        return True
+
+    # === Function to Drop a Session's Answers (index changed) ===
+    def invalidate(
+            self,
+            session_id: str
+    ) -> None:
+        if self._sessions.pop(session_id, None) is not None:
+            self.counters["invalidations"] += 1
+        for key in [k for k in self._pending if k[0] == session_id]:
+            self._pending.pop(key)
+
+    # === Function to Report Cache Statistics ===
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.counters["lookups"]
+        return {
+            **self.counters,
+            "hit_rate": round(self.counters["hits"] / lookups, 4) if lookups else 0.0,
+            "sessions": len(self._sessions),
+            "entries": sum(len(entries) for entries in self._sessions.values())
+        }
@@ -0,0 +1,273 @@
+# === Python Modules ===
+import re
+import bisect
+import numpy as np
+from array import array
+from collections import Counter
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+BM25_FILE = "bm25.npz"
+TOKEN_PATTERN = re.compile(r"[^\W_]+(?:[-_./][^\W_]+)*")
+SPLIT_PATTERN = re.compile(r"[-_./]")
+
+# === Function to Tokenize Text for BM25 ===
+def bm25_tokens(
+        text: str
+) -> List[str]:
+    """
+    Lowercased word tokens. Identifiers such as "PN-00042" or "v2.1" are kept whole
+    and also split into their parts, so both exact and partial mentions match.
+    """
+    tokens = []
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        tokens.append(token)
+        if SPLIT_PATTERN.search(token):
+            tokens.extend(part for part in SPLIT_PATTERN.split(token) if part)
+    return tokens
+
+# === Strings Packed as UTF-8 Bytes + Offsets ===
+class PackedStrings(Sequence):
+    def __init__(
+            self,
+            data: np.ndarray,
+            offsets: np.ndarray
+    ):
+        """
+        A read-only list of strings stored as one uint8 buffer of concatenated UTF-8
+        and int64 offsets (string `i` is `data[offsets[i]:offsets[i + 1]]`), so each
+        string costs its own length instead of the longest one's.
+        """
+        self.data = data
+        self.offsets = offsets
+
+    @classmethod
+    def from_strings(
+            cls,
+            strings: Iterable[str]
+    ) -> "PackedStrings":
+        encoded = [s.encode("utf-8") for s in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype = np.int64)
+        np.cumsum([len(e) for e in encoded], out = offsets[1:])
+        return cls(np.frombuffer(b"".join(encoded), dtype = np.uint8).copy(), offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return self.data[self.offsets[i]:self.offsets[i + 1]].tobytes().decode("utf-8")
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.data.nbytes + self.offsets.nbytes)
+
+    def find(
+            self,
+            value: str
+    ) -> Optional[int]:
+        """
+        Position of `value` in a sorted PackedStrings (binary search), or None.
+        """
+        i = bisect.bisect_left(self, value)
+        return i if i < len(self) and self[i] == value else None
+
+# === Sparse BM25 Index in CSR Arrays ===
+class BM25Index:
+    def __init__(
+            self,
+            terms: PackedStrings,
+            indptr: np.ndarray,
+            postings: np.ndarray,
+            tfs: np.ndarray,
+            doc_lens: np.ndarray,
+            chunk_ids: PackedStrings,
+            k1: float = 1.5,
+            b: float = 0.75
+    ):
+        """
+        BM25 over an inverted index stored as CSR arrays: the postings of term `t`
+        are `postings[indptr[t]:indptr[t + 1]]` (document rows) with term
+        frequencies `tfs[...]` at the same positions.
+
+        Args:
+            terms (PackedStrings): Vocabulary, sorted (term id = position).
+            indptr (np.ndarray): int64 offsets into `postings`, one more than terms.
+            postings (np.ndarray): int32 document rows.
+            tfs (np.ndarray): uint16 term frequencies.
+            doc_lens (np.ndarray): int32 token count per document.
+            chunk_ids (PackedStrings): Chunk id (docstore id) per document row.
+            k1 (float): Term-frequency saturation.
+            b (float): Length normalization.
+        """
+        self.terms = terms
+        self.indptr = indptr
+        self.postings = postings
+        self.tfs = tfs
+        self.doc_lens = doc_lens
+        self.chunk_ids = chunk_ids
+        self.k1 = k1
+        self.b = b
+
+        n_docs = max(len(doc_lens), 1)
+        df = np.diff(indptr).astype(np.float32)
+        self.idf = np.log1p((n_docs - df + 0.5) / (df + 0.5)).astype(np.float32)
+        self._norm = (k1 * (1 - b + b * doc_lens / max(float(doc_lens.mean()) if len(doc_lens) else 1.0, 1.0))).astype(np.float32)
+
+    @property
+    def n_docs(self) -> int:
+        return len(self.doc_lens)
+
+    @property
+    def nbytes(self) -> int:
+        return int(sum(a.nbytes for a in (self.terms, self.indptr, self.postings, self.tfs, self.doc_lens, self.chunk_ids, self.idf, self._norm)))
+
+    # === Function to Build the Index ===
+    @classmethod
+    def build(
+            cls,
+            chunks: Iterable[Tuple[str, str]],
+            k1: float = 1.5,
+            b: float = 0.75
+    ) -> "BM25Index":
+        """
+        Builds the index from (chunk_id, text) pairs.
+        """
+        vocab: Dict[str, int] = {}
+        chunk_ids, doc_lens = [], []
+        rows, term_ids, counts = array("i"), array("i"), array("I")
+
+        for row, (chunk_id, text) in enumerate(chunks):
+            tokens = bm25_tokens(text)
+            chunk_ids.append(chunk_id)
+            doc_lens.append(len(tokens))
+
+            for term, tf in Counter(tokens).items():
+                rows.append(row)
+                term_ids.append(vocab.setdefault(term, len(vocab)))
+                counts.append(tf)
+
+        ## === Sort the vocabulary and group postings by term (CSR) ===
+        ## (code point order, which is also the byte order of the packed UTF-8)
+        terms = list(vocab)
+        sorted_terms = sorted(range(len(terms)), key = terms.__getitem__)
+        rank = np.empty(len(terms), dtype = np.int64)
+        rank[sorted_terms] = np.arange(len(terms))
+
+        term_rank = rank[np.frombuffer(term_ids, dtype = np.int32)] if len(term_ids) else np.array([], dtype = np.int64)
+        order = np.argsort(term_rank, kind = "stable")
+        indptr = np.zeros(len(terms) + 1, dtype = np.int64)
+        np.cumsum(np.bincount(term_rank, minlength = len(terms)), out = indptr[1:])
+
+        return cls(
+            terms = PackedStrings.from_strings(terms[i] for i in sorted_terms),
+            indptr = indptr,
+            postings = np.frombuffer(rows, dtype = np.int32)[order].astype(np.int32),
+            tfs = np.minimum(np.frombuffer(counts, dtype = np.uint32)[order], np.iinfo(np.uint16).max).astype(np.uint16),
+            doc_lens = np.asarray(doc_lens, dtype = np.int32),
+            chunk_ids = PackedStrings.from_strings(chunk_ids),
+            k1 = k1,
+            b = b
+        )
+
+    # === Function to Score a Query ===
+    def search(
+            self,
+            query: str,
+            k: int
+    ) -> List[Tuple[str, float]]:
+        """
+        Returns the top-k (chunk_id, BM25 score) pairs with a positive score.
+        """
+        scores = np.zeros(self.n_docs, dtype = np.float32)
+
+        for term in set(bm25_tokens(query)):
+            term_id = self.terms.find(term)
+            if term_id is None:
+                continue
+            start, end = self.indptr[term_id], self.indptr[term_id + 1]
+            rows = self.postings[start:end]
+            tf = self.tfs[start:end].astype(np.float32)
+            scores[rows] += self.idf[term_id] * tf * (self.k1 + 1) / (tf + self._norm[rows])
+
+        hits = np.flatnonzero(scores)
+        if len(hits) > k:
+            hits = hits[np.argpartition(-scores[hits], k - 1)[:k]]
+        hits = hits[np.argsort(-scores[hits], kind = "stable")]
+
+        return [(self.chunk_ids[int(row)], float(scores[row])) for row in hits]
+
+    # === Functions to Persist the Index ===
+    def save(
+            self,
+            folder: Path
+    ) -> Path:
+        path = Path(folder) / BM25_FILE
+        np.savez(
+            path,
+            terms = self.terms.data,
+            term_offsets = self.terms.offsets,
+            indptr = self.indptr,
+            postings = self.postings,
+            tfs = self.tfs,
+            doc_lens = self.doc_lens,
+            chunk_ids = self.chunk_ids.data,
+            chunk_id_offsets = self.chunk_ids.offsets,
+            params = np.array([self.k1, self.b], dtype = np.float32)
+        )
+        return path
+
+    @classmethod
+    def load(
+            cls,
+            folder: Path
+    ) -> Optional["BM25Index"]:
+        """
+        Loads `bm25.npz` from an index folder, or returns None if there is none.
+        """
+        path = Path(folder) / BM25_FILE
+        if not path.exists():
+            return None
+
+        with np.load(path, allow_pickle = False) as data:
+            k1, b = data["params"].tolist()
+            if "term_offsets" in data.files:
+                terms = PackedStrings(data["terms"], data["term_offsets"])
+                chunk_ids = PackedStrings(data["chunk_ids"], data["chunk_id_offsets"])
+            else:
+                ## === Files written before the packed layout hold fixed-width strings ===
+                terms = PackedStrings.from_strings(data["terms"].tolist())
+                chunk_ids = PackedStrings.from_strings(data["chunk_ids"].tolist())
+
+            return cls(
+                terms = terms,
+                indptr = data["indptr"],
+                postings = data["postings"],
+                tfs = data["tfs"],
+                doc_lens = data["doc_lens"],
+                chunk_ids = chunk_ids,
+                k1 = k1,
+                b = b
+            )
+
+# === Function to Build a BM25 Index from a FAISS Docstore ===
+def bm25_from_vectorstore(
+        db,
+        k1: float = 1.5,
+        b: float = 0.75
+) -> BM25Index:
+    """
+    Indexes every chunk of a FAISS vector store, keyed by its docstore id.
+    """
+    return BM25Index.build(
+        chunks = (
+            (doc_id, db.docstore.search(doc_id).page_content)
+            for doc_id in db.index_to_docstore_id.values()
+        ),
+        k1 = k1,
+        b = b
+    )
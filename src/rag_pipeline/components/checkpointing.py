@@ -0,0 +1,340 @@
+# === Python Modules ===
+import asyncio
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, Optional, Sequence, Tuple
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple
+)
+from langgraph.checkpoint.memory import InMemorySaver
+
+# === Components ===
+from rag_pipeline.components.registry import get_settings
+
+DURABILITY_MODES = ("sync", "async", "exit")
+
+# === Function to Read the Checkpoint Durability ===
+def checkpoint_durability() -> str:
+    """
+    LangGraph durability of a run (`checkpointing.durability`):
+        sync  - checkpoint after every node, before the next one starts
+        async - checkpoint after every node, written while the next one runs
+        exit  - checkpoint once, when the run ends (the state that outlives the request)
+    """
+    durability = get_settings("checkpointing").get("durability", "exit")
+    if durability not in DURABILITY_MODES:
+        raise ValueError(f"❌ Unknown checkpoint durability '{durability}', expected one of {DURABILITY_MODES}.")
+    return durability
+
+# === Checkpointer Keeping Hot Threads in Memory ===
+class BufferedCheckpointer(BaseCheckpointSaver):
+    def __init__(
+            self,
+            backing: BaseCheckpointSaver,
+            flush_interval_s: float = 1.0,
+            max_pending: int = 256,
+            max_threads: int = 1024
+    ):
+        """
+        Serves checkpoints of recently used threads from memory and writes them to
+        the backing saver (MongoDB) in batches, off the request path.
+
+        Every `flush_interval_s` (or once `max_pending` threads have unsaved
+        checkpoints) only the latest checkpoint of each thread is written, with the
+        pending writes of that checkpoint; intermediate checkpoints of the batch are
+        skipped. Threads not in memory are read from the backing saver once and then
+        stay hot, up to `max_threads` (least recently used are dropped after flushing).
+        Checkpoints not yet flushed are lost if the process dies; call `aclose` on shutdown.
+        A write that fails stays queued (unless a newer checkpoint of the thread
+        supersedes it) and is retried on the next flush.
+
+        Use it with a single worker process only: hot threads are served from this
+        process's memory, so checkpoints another worker writes for the same thread
+        are never seen.
+
+        Args:
+            backing (BaseCheckpointSaver): Durable saver (e.g. AsyncMongoDBSaver).
+            flush_interval_s (float): Maximum delay before a checkpoint is written.
+            max_pending (int): Threads with unsaved checkpoints that trigger an early flush.
+            max_threads (int): Hot threads kept in memory.
+        """
+        super().__init__(serde = backing.serde)
+        self.backing = backing
+        self.memory = InMemorySaver(serde = backing.serde)
+        self.flush_interval_s = flush_interval_s
+        self.max_pending = max_pending
+        self.max_threads = max_threads
+
+        self._pending: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._flushed: Dict[Tuple[str, str], str] = {}
+        self._hot: "OrderedDict[str, None]" = OrderedDict()
+        self._flush_lock = asyncio.Lock()
+        self._timer: Optional[asyncio.Task] = None
+        self._tasks: set = set()
+        self.stats = {
+            "puts": 0, "writes": 0, "flushes": 0, "flush_errors": 0,
+            "backing_puts": 0, "backing_writes": 0, "backing_reads": 0
+        }
+
+    @staticmethod
+    def _key(
+            config: RunnableConfig
+    ) -> Tuple[str, str]:
+        configurable = config["configurable"]
+        return configurable["thread_id"], configurable.get("checkpoint_ns", "")
+
+    def _touch(
+            self,
+            thread_id: str
+    ) -> None:
+        self._hot[thread_id] = None
+        self._hot.move_to_end(thread_id)
+
+        ## === Drop the coldest threads that have nothing left to flush ===
+        pending_threads = {thread for thread, _ in self._pending}
+        for cold in list(self._hot)[:max(0, len(self._hot) - self.max_threads)]:
+            if cold not in pending_threads:
+                del self._hot[cold]
+                self.memory.delete_thread(cold)
+                self._flushed = {key: value for key, value in self._flushed.items() if key[0] != cold}
+
+    def _spawn(
+            self,
+            coro
+    ) -> asyncio.Task:
+        ## === Keep a reference, so the task is neither collected nor forgotten on shutdown ===
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def _schedule(self) -> None:
+        if len(self._pending) >= self.max_pending:
+            self._spawn(self.flush())
+        elif self._timer is None or self._timer.done():
+            self._timer = self._spawn(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_interval_s)
+        self._timer = None
+        await self.flush()
+
+    # === Reads ===
+    async def aget_tuple(
+            self,
+            config: RunnableConfig
+    ) -> Optional[CheckpointTuple]:
+        thread_id, checkpoint_ns = self._key(config)
+        if thread_id in self._hot:
+            self._touch(thread_id)
+            found = self.memory.get_tuple(config)
+            if found is not None or config["configurable"].get("checkpoint_id"):
+                return found or await self._backing_get(config)
+
+        found = await self._backing_get(config)
+
+        ## === Seed memory with the thread's latest checkpoint ===
+        if found is not None and not config["configurable"].get("checkpoint_id"):
+            parent = found.parent_config or {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns}}
+            self.memory.put(
+                {"configurable": {"checkpoint_ns": checkpoint_ns, **parent["configurable"], "thread_id": thread_id}},
+                found.checkpoint,
+                found.metadata,
+                dict(found.checkpoint["channel_versions"])
+            )
+            self._flushed[(thread_id, checkpoint_ns)] = found.checkpoint["id"]
+            self._touch(thread_id)
+        return found
+
+    async def _backing_get(
+            self,
+            config: RunnableConfig
+    ) -> Optional[CheckpointTuple]:
+        self.stats["backing_reads"] += 1
+        return await self.backing.aget_tuple(config)
+
+    async def alist(
+            self,
+            config: Optional[RunnableConfig],
+            *,
+            filter: Optional[Dict[str, Any]] = None,
+            before: Optional[RunnableConfig] = None,
+            limit: Optional[int] = None
+    ) -> AsyncIterator[CheckpointTuple]:
+        saver = self.memory if config and config["configurable"].get("thread_id") in self._hot else self.backing
+        async for item in saver.alist(config, filter = filter, before = before, limit = limit):
+            yield item
+
+    # === Writes (buffered) ===
+    async def aput(
+            self,
+            config: RunnableConfig,
+            checkpoint: Checkpoint,
+            metadata: CheckpointMetadata,
+            new_versions: ChannelVersions
+    ) -> RunnableConfig:
+        next_config = self.memory.put(config, checkpoint, metadata, new_versions)
+        key = self._key(config)
+        self.stats["puts"] += 1
+
+        ## === A newer checkpoint supersedes the unsaved one (keep its parent, merge versions) ===
+        previous = self._pending.get(key) or {"put": None, "writes": []}
+        superseded = previous["put"]
+        self._pending[key] = {
+            "put": {
+                "config": superseded["config"] if superseded else config,
+                "checkpoint": checkpoint,
+                "metadata": metadata,
+                "new_versions": {**(superseded["new_versions"] if superseded else {}), **new_versions}
+            },
+            "writes": [
+                write for write in previous["writes"]
+                if superseded is None or write[0]["configurable"].get("checkpoint_id") != superseded["checkpoint"]["id"]
+            ]
+        }
+        self._touch(key[0])
+        self._schedule()
+        return next_config
+
+    async def aput_writes(
+            self,
+            config: RunnableConfig,
+            writes: Sequence[Tuple[str, Any]],
+            task_id: str,
+            task_path: str = ""
+    ) -> None:
+        self.memory.put_writes(config, writes, task_id, task_path)
+        key = self._key(config)
+        self.stats["writes"] += 1
+
+        ## === Only writes on the pending or the last saved checkpoint are worth saving ===
+        entry = self._pending.get(key)
+        pending_id = entry["put"]["checkpoint"]["id"] if entry and entry["put"] else None
+        if config["configurable"].get("checkpoint_id") in (pending_id, self._flushed.get(key)):
+            self._pending.setdefault(key, {"put": None, "writes": []})["writes"].append((config, writes, task_id, task_path))
+            self._schedule()
+
+    # === Function to Write Pending Checkpoints to the Backing Saver ===
+    async def flush(self) -> int:
+        """
+        Writes the latest unsaved checkpoint (and its writes) of every thread.
+        A thread leaves the buffer only once everything it had pending is written;
+        on a failure it stays queued and a retry is scheduled.
+
+        Returns:
+            int: Number of threads written.
+        """
+        async with self._flush_lock:
+            written, failed = set(), 0
+            for key, entry in list(self._pending.items()):
+                try:
+                    put = entry["put"]
+                    if put is not None:
+                        await self.backing.aput(put["config"], put["checkpoint"], put["metadata"], put["new_versions"])
+                        self._flushed[key] = put["checkpoint"]["id"]
+                        entry["put"] = None
+                        self.stats["backing_puts"] += 1
+                    while entry["writes"]:
+                        config, writes, task_id, task_path = entry["writes"][0]
+                        await self.backing.aput_writes(config, writes, task_id, task_path)
+                        entry["writes"].pop(0)
+                        self.stats["backing_writes"] += 1
+                except Exception as e:
+                    failed += 1
+                    self.stats["flush_errors"] += 1
+                    print(f"⚠️ Could not write checkpoint of thread '{key[0]}': {e}")
+                    continue
+
+                ## === A newer checkpoint may have arrived while writing; it stays queued ===
+                if self._pending.get(key) is entry:
+                    del self._pending[key]
+                written.add(key[0])
+
+            if written:
+                self.stats["flushes"] += 1
+                self._compact(written)
+            if failed and (self._timer is None or self._timer.done()):
+                self._timer = self._spawn(self._flush_later())
+            return len(written)
+
+    def _compact(
+            self,
+            threads: set
+    ) -> None:
+        """
+        Keeps only the latest checkpoint of saved hot threads in memory.
+        """
+        for thread_id in threads:
+            if any(thread == thread_id for thread, _ in self._pending):
+                continue
+            latest = [
+                (checkpoint_ns, self.memory.get_tuple({"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns}}))
+                for checkpoint_ns in list(self.memory.storage.get(thread_id, {}))
+            ]
+            self.memory.delete_thread(thread_id)
+            for checkpoint_ns, found in latest:
+                if found is None:
+                    continue
+                parent = found.parent_config or {"configurable": {}}
+                self.memory.put(
+                    {"configurable": {**parent["configurable"], "thread_id": thread_id, "checkpoint_ns": checkpoint_ns}},
+                    found.checkpoint,
+                    found.metadata,
+                    dict(found.checkpoint["channel_versions"])
+                )
+                for task_id, channel, value in found.pending_writes or []:
+                    self.memory.put_writes(found.config, [(channel, value)], task_id)
+
+    async def adelete_thread(
+            self,
+            thread_id: str
+    ) -> None:
+        self._pending = {key: entry for key, entry in self._pending.items() if key[0] != thread_id}
+        self._flushed = {key: value for key, value in self._flushed.items() if key[0] != thread_id}
+        self._hot.pop(thread_id, None)
+        self.memory.delete_thread(thread_id)
+        await self.backing.adelete_thread(thread_id)
+
+    def get_next_version(
+            self,
+            current: Optional[Any],
+            channel: None
+    ) -> Any:
+        return self.backing.get_next_version(current, channel)
+
+    # === Function to Flush on Shutdown ===
+    async def aclose(self) -> None:
+        ## === Let scheduled flushes finish, then write what is left ===
+        if self._timer is not None:
+            self._timer.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions = True)
+        await self.flush()
+
+        if self._timer is not None:
+            self._timer.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions = True)
+        if self._pending:
+            print(f"⚠️ {len(self._pending)} thread(s) with checkpoints that could not be written to the backing saver.")
+
+# === Function to Wrap the Durable Saver per the Settings ===
+def build_checkpointer(
+        backing: BaseCheckpointSaver,
+        settings: Optional[Dict[str, Any]] = None
+) -> BaseCheckpointSaver:
+    """
+    Returns `backing`, or a BufferedCheckpointer around it when `checkpointing.buffer.enabled`.
+    """
+    settings = (get_settings("checkpointing").get("buffer") or {}) if settings is None else settings
+    if not settings.get("enabled", False):
+        return backing
+
+    return BufferedCheckpointer(
+        backing = backing,
+        flush_interval_s = settings.get("flush_interval_s", 1.0),
+        max_pending = settings.get("max_pending", 256),
+        max_threads = settings.get("max_threads", 1024)
+    )
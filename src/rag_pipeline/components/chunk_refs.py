@@ -0,0 +1,81 @@
+# === Python Modules ===
+from typing import Any, Dict, List, Optional
+from langchain_core.documents import Document
+
+# === Function to Reference Retrieved Chunks in the Graph State ===
+def to_refs(
+        documents: List[Any],
+        session_id: Optional[str] = None
+) -> List[Any]:
+    """
+    Replaces retrieved documents by compact chunk references, so the checkpointed
+    graph state never holds chunk text:
+
+        {"session_id": "...", "chunk_id": "<docstore id>", "score": 0.83}
+
+    `score` is the dense similarity (`metadata["retrieval_score"]`, None for chunks
+    only BM25 found). Documents without an id cannot be resolved later and are kept as is.
+
+    Args:
+        documents (List[Any]): Retrieved documents, best first.
+        session_id (str, optional): Session whose store holds the chunks.
+
+    Returns:
+        List[Any]: One reference (or the unchanged item) per document.
+    """
+    refs = []
+    for document in documents:
+        if isinstance(document, Document) and document.id is not None:
+            refs.append({
+                "session_id": session_id,
+                "chunk_id": document.id,
+                "score": document.metadata.get("retrieval_score")
+            })
+        else:
+            refs.append(document)
+    return refs
+
+def is_ref(
+        item: Any
+) -> bool:
+    return isinstance(item, dict) and "chunk_id" in item
+
+# === Functions to Resolve References from the Session Store ===
+def resolve_ref(
+        item: Any,
+        retriever: Any
+) -> Optional[Any]:
+    """
+    Looks a chunk reference up in the docstore of the session retriever and returns
+    the document with its `retrieval_score` restored. Anything that is not a
+    reference (documents, strings) is returned unchanged.
+
+    Returns:
+        Optional[Any]: The document, or None if the chunk is no longer in the store.
+    """
+    if not is_ref(item):
+        return item
+
+    docstore = getattr(getattr(retriever, "vectorstore", None), "docstore", None)
+    document = docstore.search(item["chunk_id"]) if docstore is not None else None
+    if not isinstance(document, Document):
+        return None
+
+    metadata: Dict[str, Any] = dict(document.metadata)
+    if item.get("score") is not None:
+        metadata["retrieval_score"] = item["score"]
+    return Document(id = item["chunk_id"], page_content = document.page_content, metadata = metadata)
+
+def resolve_refs(
+        items: List[Any],
+        retriever: Any
+) -> List[Any]:
+    """
+    Resolves every reference in `items` (see `resolve_ref`), dropping chunks that were
+    removed from the session since they were retrieved.
+    """
+    resolved = [resolve_ref(item, retriever) for item in items]
+    missing = sum(document is None for document in resolved)
+    if missing:
+        print(f"⚠️ {missing} referenced chunk(s) no longer in the session store; skipped.")
+    return [document for document in resolved if document is not None]
@@ -0,0 +1,142 @@
+# === Python Modules ===
+import re
+from typing import Any, Dict, List, Optional, Tuple
+from langchain_core.documents import Document
+
+# === Utils ===
+from rag_pipeline.utils.chunking import SENTENCE_BREAK, TokenCounter, get_token_counter
+
+WHITESPACE = re.compile(r"\s+")
+MIN_TRUNCATED_TOKENS = 32
+
+# === Function to Render a Short Citation ===
+def citation(
+        metadata: Dict[str, Any]
+) -> str:
+    """
+    Short source label of a chunk, e.g. "report.pdf p.3" or "notes.txt table 2".
+    """
+    label = metadata.get("source") or "document"
+    if metadata.get("page_number") is not None:
+        label += f" p.{metadata['page_number']}"
+    elif metadata.get("table_id") is not None:
+        label += f" table {metadata['table_id']}"
+    return label
+
+def _sentences(
+        text: str
+) -> List[Tuple[str, str]]:
+    """
+    Splits text into (whitespace before, sentence) pairs, keeping the original
+    gaps (newlines, list and table layout) between sentences.
+    """
+    text = text.strip()
+    pieces, position, gap = [], 0, ""
+    for match in SENTENCE_BREAK.finditer(text):
+        pieces.append((gap, text[position:match.start()]))
+        gap, position = match.group(), match.end()
+    if text:
+        pieces.append((gap, text[position:]))
+    return pieces
+
+def _join(
+        sentences: List[Tuple[str, str]]
+) -> str:
+    return "".join((gap if idx else "") + sentence for idx, (gap, sentence) in enumerate(sentences))
+
+def _as_document(
+        document: Any
+) -> Document:
+    return document if isinstance(document, Document) else Document(page_content = str(document))
+
+# === Function to Pack Graded Documents into a Prompt Context ===
+def build_context(
+        documents: List[Any],
+        max_tokens: int,
+        count: Optional[TokenCounter] = None
+) -> Tuple[str, Dict[str, int]]:
+    """
+    Renders documents (best first) as numbered blocks with a short citation:
+
+        [1] report.pdf p.3
+        <text>
+
+    Sentences already present in a higher-ranked block (chunk overlap, repeated
+    boilerplate) are removed in place, so the remaining text keeps its original
+    line breaks and layout. Blocks are added in rank order until `max_tokens`;
+    the first block that does not fit is truncated at a sentence boundary if at
+    least MIN_TRUNCATED_TOKENS still fit, and every lower-ranked block is dropped.
+
+    Args:
+        documents (List[Any]): Graded documents (LangChain documents or strings), best first.
+        max_tokens (int): Token budget of the whole context.
+        count (TokenCounter, optional): Batch token counter (defaults to tiktoken cl100k_base).
+
+    Returns:
+        Tuple[str, Dict[str, int]]: The context and packing statistics (documents
+                                    in/used/truncated/dropped, tokens of every block
+                                    before packing and of the context after).
+    """
+    count = count or get_token_counter()
+    stats = {"documents": len(documents), "used": 0, "truncated": 0, "dropped": 0, "deduplicated": 0, "tokens_before": 0, "tokens": 0}
+
+    ## === Remove sentences seen in a higher-ranked document ===
+    seen = set()
+    blocks: List[Tuple[str, List[Tuple[str, str]]]] = []
+    for document in map(_as_document, documents):
+        kept = []
+        for gap, sentence in _sentences(document.page_content):
+            key = WHITESPACE.sub(" ", sentence).lower()
+            if key not in seen:
+                seen.add(key)
+                kept.append((gap, sentence))
+        if kept:
+            blocks.append((citation(document.metadata), kept))
+        else:
+            stats["deduplicated"] += 1
+
+    ## === Pack blocks in rank order within the budget ===
+    rendered = [f"[{idx}] {label}\n" + _join(sentences) for idx, (label, sentences) in enumerate(blocks, start = 1)]
+    sizes = count(rendered) if rendered else []
+    separator = count(["\n\n"])[0]
+    stats["tokens_before"] = sum(sizes) + separator * max(len(sizes) - 1, 0)
+
+    parts, used = [], 0
+    for idx, (block, size) in enumerate(zip(rendered, sizes)):
+        cost = size + (separator if parts else 0)
+        if used + cost <= max_tokens:
+            parts.append(block)
+            used += cost
+            continue
+
+        ## === Truncate the first block that does not fit, then stop ===
+        room = max_tokens - used - (separator if parts else 0)
+        label, sentences = blocks[idx]
+        header = f"[{idx + 1}] {label}\n"
+        if room >= MIN_TRUNCATED_TOKENS:
+            lengths = count([header] + [sentences[0][1]] + [gap + sentence for gap, sentence in sentences[1:]])
+            total, keep = lengths[0], 0
+            for length in lengths[1:]:
+                if total + length > room:
+                    break
+                total += length
+                keep += 1
+
+            ## === Pieces were counted apart; recount the assembled block ===
+            while keep:
+                block = header + _join(sentences[:keep])
+                total = count([block])[0]
+                if total <= room:
+                    break
+                keep -= 1
+            if keep:
+                parts.append(block)
+                used += total + (separator if len(parts) > 1 else 0)
+                stats["truncated"] += 1
+
+        stats["dropped"] = len(blocks) - len(parts)
+        break
+
+    stats["used"] = len(parts)
+    stats["tokens"] = used
+    return "\n\n".join(parts), stats
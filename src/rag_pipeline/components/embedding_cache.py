@@ -0,0 +1,301 @@
+# === Python Modules ===
+import os
+import re
+import json
+import hashlib
+import threading
+import unicodedata
+import numpy as np
+from pathlib import Path
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+from langchain_core.embeddings import Embeddings
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+# === Function to Hash a Chunk ===
+def text_key(
+        text: str
+) -> bytes:
+    """
+    Hashes the normalized chunk text (NFC, collapsed whitespace) into a 16-byte key.
+
+    Args:
+        text (str): Chunk text.
+
+    Returns:
+        bytes: 16-byte BLAKE2b digest.
+    """
+    normalized = " ".join(
+        unicodedata.normalize("NFC", text).split()
+    )
+    return hashlib.blake2b(
+        normalized.encode("utf-8"),
+        digest_size = 16
+    ).digest()
+
+# === Persistent Embedding Cache ===
+class EmbeddingCache:
+    KEY_BYTES = 16
+
+    def __init__(
+            self,
+            cache_dir: Path,
+            model_name: str
+    ):
+        """
+        On-disk cache of embedding vectors for one embedding model.
+
+        Layout of `<cache_dir>/<model_name>/`:
+            vectors.f32  - row-major float32 matrix, memory-mapped for reads
+            keys.bin     - one 16-byte text hash per row, in row order
+            meta.json    - vector dimension
+
+        Rows are append-only, so several workers can share a cache folder:
+        appends are serialized with a file lock and other workers pick new rows up
+        on their next lookup.
+
+        Args:
+            cache_dir (Path): Root folder of the cache.
+            model_name (str): Embedding model; each model gets its own folder.
+        """
+        self.model_name = model_name
+        self.path = Path(cache_dir) / re.sub(r"[^A-Za-z0-9_.-]", "_", model_name)
+        self.path.mkdir(parents = True, exist_ok = True)
+
+        self.vectors_path = self.path / "vectors.f32"
+        self.keys_path = self.path / "keys.bin"
+        self.meta_path = self.path / "meta.json"
+
+        self.dim: Optional[int] = None
+        if self.meta_path.exists():
+            self.dim = json.loads(self.meta_path.read_text())["dim"]
+
+        self._index: Dict[bytes, int] = {}
+        self._rows = 0
+        self._mmap: Optional[np.memmap] = None
+        self._lock = threading.Lock()
+
+        self._refresh()
+
+    # === Cross-process Append Lock ===
+    @contextmanager
+    def _file_lock(self):
+        with open(self.path / ".lock", "w") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    # === Function to Pick Up Rows Appended by Other Workers ===
+    def _refresh(self) -> None:
+        if not self.keys_path.exists() or self.dim is None:
+            return
+
+        key_rows = self.keys_path.stat().st_size // self.KEY_BYTES
+        vector_rows = self.vectors_path.stat().st_size // (self.dim * 4)
+        rows = min(key_rows, vector_rows)
+        if rows <= self._rows:
+            return
+
+        with open(self.keys_path, "rb") as f:
+            f.seek(self._rows * self.KEY_BYTES)
+            raw = f.read((rows - self._rows) * self.KEY_BYTES)
+
+        for offset in range(0, len(raw), self.KEY_BYTES):
+            self._index.setdefault(raw[offset:offset + self.KEY_BYTES], self._rows + offset // self.KEY_BYTES)
+
+        self._rows = rows
+        self._mmap = None
+
+    # === Function to Drop a Torn Append (call under the file lock) ===
+    def _repair(self) -> None:
+        """
+        An append interrupted between the vector and the key write leaves vector rows
+        without keys; later keys would then point at the wrong rows. Truncates both
+        files to the rows that have a key and a complete vector.
+        """
+        if self.dim is None or not self.vectors_path.exists():
+            return
+
+        key_rows = self.keys_path.stat().st_size // self.KEY_BYTES if self.keys_path.exists() else 0
+        rows = min(key_rows, self.vectors_path.stat().st_size // (self.dim * 4))
+        if self.vectors_path.stat().st_size != rows * self.dim * 4:
+            print(f"⚠️ Embedding cache '{self.model_name}': dropping an incomplete append.")
+            os.truncate(self.vectors_path, rows * self.dim * 4)
+        if self.keys_path.exists() and self.keys_path.stat().st_size != rows * self.KEY_BYTES:
+            os.truncate(self.keys_path, rows * self.KEY_BYTES)
+
+    def _matrix(self) -> np.memmap:
+        if self._mmap is None or self._mmap.shape[0] < self._rows:
+            self._mmap = np.memmap(
+                self.vectors_path,
+                dtype = np.float32,
+                mode = "r",
+                shape = (self._rows, self.dim)
+            )
+        return self._mmap
+
+    # === Function to Look Up Vectors ===
+    def lookup(
+            self,
+            keys: List[bytes]
+    ) -> List[Optional[List[float]]]:
+        """
+        Returns the cached vector for each key, or None for misses.
+        """
+        with self._lock:
+            self._refresh()
+            rows = [self._index.get(key) for key in keys]
+            if not any(row is not None for row in rows):
+                return [None] * len(keys)
+
+            matrix = self._matrix()
+            return [matrix[row].tolist() if row is not None else None for row in rows]
+
+    # === Function to Store New Vectors ===
+    def add(
+            self,
+            keys: List[bytes],
+            vectors: List[List[float]]
+    ) -> None:
+        """
+        Appends vectors for keys that are not cached yet.
+        """
+        if not keys:
+            return
+
+        matrix = np.asarray(vectors, dtype = np.float32)
+
+        with self._lock, self._file_lock():
+            if self.dim is None:
+                self.dim = int(matrix.shape[1])
+                self.meta_path.write_text(json.dumps({"dim": self.dim, "model": self.model_name}))
+            elif matrix.shape[1] != self.dim:
+                raise ValueError(f"❌ Embedding dim {matrix.shape[1]} does not match cache dim {self.dim}.")
+
+            self._repair()
+            self._refresh()
+            fresh, seen = [], set()
+            for i, key in enumerate(keys):
+                if key not in self._index and key not in seen:
+                    seen.add(key)
+                    fresh.append(i)
+
+            if not fresh:
+                return
+
+            ## === Vectors first, so a key never points at a missing row ===
+            with open(self.vectors_path, "ab") as f:
+                f.write(matrix[fresh].tobytes())
+            with open(self.keys_path, "ab") as f:
+                f.write(b"".join(keys[i] for i in fresh))
+
+            self._refresh()
+
+    def __len__(self) -> int:
+        return self._rows
+
+# === Embeddings Wrapper That Consults the Cache ===
+class CachedEmbeddings(Embeddings):
+    def __init__(
+            self,
+            embeddings: Embeddings,
+            cache: EmbeddingCache
+    ):
+        """
+        Wraps an embedding model so that only cache misses are sent to it.
+        Query embeddings are passed through untouched.
+
+        Args:
+            embeddings (Embeddings): The underlying embedding model.
+            cache (EmbeddingCache): Cache for the same embedding model.
+        """
+        self.embeddings = embeddings
+        self.cache = cache
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0}
+
+    # === Function to Report the Hit Ratio ===
+    def hit_ratio(self) -> float:
+        total = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / total if total else 0.0
+
+    def _split(
+            self,
+            texts: List[str]
+    ) -> tuple[List[bytes], List[Optional[List[float]]], List[str], List[bytes]]:
+        keys = [text_key(text) for text in texts]
+        cached = self.cache.lookup(keys)
+
+        ## === Unique misses only (repeated boilerplate is embedded once) ===
+        miss_texts: Dict[bytes, str] = {}
+        for key, text, vector in zip(keys, texts, cached):
+            if vector is None:
+                miss_texts.setdefault(key, text)
+
+        self.stats["hits"] += sum(vector is not None for vector in cached)
+        self.stats["misses"] += sum(vector is None for vector in cached)
+
+        return keys, cached, list(miss_texts.values()), list(miss_texts.keys())
+
+    def _merge(
+            self,
+            keys: List[bytes],
+            cached: List[Optional[List[float]]],
+            miss_keys: List[bytes],
+            miss_vectors: List[List[float]]
+    ) -> List[List[float]]:
+        self.cache.add(miss_keys, miss_vectors)
+        fresh = dict(zip(miss_keys, miss_vectors))
+        return [vector if vector is not None else list(fresh[key]) for key, vector in zip(keys, cached)]
+
+    def embed_documents(
+            self,
+            texts: List[str]
+    ) -> List[List[float]]:
+        keys, cached, miss_texts, miss_keys = self._split(texts)
+        miss_vectors = self.embeddings.embed_documents(miss_texts) if miss_texts else []
+        return self._merge(keys, cached, miss_keys, miss_vectors)
+
+    async def aembed_documents(
+            self,
+            texts: List[str]
+    ) -> List[List[float]]:
+        keys, cached, miss_texts, miss_keys = self._split(texts)
+        miss_vectors = await self.embeddings.aembed_documents(miss_texts) if miss_texts else []
+        return self._merge(keys, cached, miss_keys, miss_vectors)
+
+    def embed_query(
+            self,
+            text: str
+    ) -> List[float]:
+        return self.embeddings.embed_query(text)
+
+    async def aembed_query(
+            self,
+            text: str
+    ) -> List[float]:
+        return await self.embeddings.aembed_query(text)
+
+# === Shared Cache Instances ===
+_caches: Dict[str, EmbeddingCache] = {}
+_caches_lock = threading.Lock()
+
+def get_embedding_cache(
+        cache_dir: Path,
+        model_name: str
+) -> EmbeddingCache:
+    """
+    Returns the process-wide cache for (cache_dir, model_name).
+    """
+    key = f"{os.path.abspath(cache_dir)}::{model_name}"
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = EmbeddingCache(cache_dir = cache_dir, model_name = model_name)
+        return _caches[key]
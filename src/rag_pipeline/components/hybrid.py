@@ -0,0 +1,126 @@
+# === Python Modules ===
+import asyncio
+from typing import Any, Dict, List, Optional, Sequence
+from pydantic import ConfigDict
+from langchain_core.documents import Document
+from langchain_community.vectorstores.utils import DistanceStrategy
+from langchain_core.retrievers import BaseRetriever
+from langchain_core.callbacks import CallbackManagerForRetrieverRun, AsyncCallbackManagerForRetrieverRun
+
+# === Components ===
+from rag_pipeline.components.bm25 import BM25Index
+
+# === Function to Turn a FAISS Score into Cosine Similarity ===
+def similarity_from_distance(
+        vectorstore: Any,
+        distance: float
+) -> float:
+    """
+    Converts a FAISS score to cosine similarity: squared L2 distance of unit-length
+    embeddings (OpenAI) gives 1 - d / 2; inner-product indexes already return it.
+    """
+    strategy = getattr(vectorstore, "distance_strategy", DistanceStrategy.EUCLIDEAN_DISTANCE)
+    if strategy == DistanceStrategy.EUCLIDEAN_DISTANCE:
+        return 1.0 - float(distance) / 2.0
+    return float(distance)
+
+# === Function to Fuse Rankings ===
+def reciprocal_rank_fusion(
+        rankings: Sequence[Sequence[str]],
+        rrf_k: int = 60
+) -> Dict[str, float]:
+    """
+    Reciprocal rank fusion: score(d) = sum over rankings of 1 / (rrf_k + rank(d)), rank from 1.
+
+    Returns:
+        Dict[str, float]: Fused score per id, highest first.
+    """
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, start = 1):
+            scores[item] = scores.get(item, 0.0) + 1.0 / (rrf_k + rank)
+
+    return dict(sorted(scores.items(), key = lambda kv: kv[1], reverse = True))
+
+# === Dense + BM25 Retriever ===
+class HybridRetriever(BaseRetriever):
+    """
+    Retrieves `fetch_k` candidates from the FAISS index and from the BM25 index
+    and returns the top `k` after reciprocal rank fusion. Dense candidates carry
+    their cosine similarity in `metadata["retrieval_score"]`; sparse-only ones don't.
+    """
+    model_config = ConfigDict(arbitrary_types_allowed = True)
+
+    vectorstore: Any
+    bm25: BM25Index
+    search_type: str = "similarity"
+    search_kwargs: Dict[str, Any] = {"k": 5}
+    fetch_k: int = 20
+    rrf_k: int = 60
+
+    def _fuse(
+            self,
+            dense: list,
+            sparse: list
+    ) -> List[Document]:
+        dense_scores = {
+            doc.id: similarity_from_distance(self.vectorstore, distance)
+            for doc, distance in dense
+        }
+        fused = reciprocal_rank_fusion(
+            rankings = [list(dense_scores), [chunk_id for chunk_id, _ in sparse]],
+            rrf_k = self.rrf_k
+        )
+
+        documents = []
+        for chunk_id, rrf_score in list(fused.items())[:self.search_kwargs.get("k", 5)]:
+            doc = self.vectorstore.docstore.search(chunk_id)
+            if not isinstance(doc, Document):
+                continue
+            metadata = {**doc.metadata, "rrf_score": round(rrf_score, 6)}
+            if chunk_id in dense_scores:
+                metadata["retrieval_score"] = round(dense_scores[chunk_id], 6)
+            documents.append(Document(id = chunk_id, page_content = doc.page_content, metadata = metadata))
+
+        return documents
+
+    @property
+    def _fetch_k(self) -> int:
+        return max(self.fetch_k, self.search_kwargs.get("k", 5))
+
+    # === Functions to Search with a Precomputed Query Vector ===
+    async def asearch_with_vector(
+            self,
+            query: str,
+            vector: List[float]
+    ) -> List[Document]:
+        dense, sparse = await asyncio.gather(
+            self.vectorstore.asimilarity_search_with_score_by_vector(vector, k = self._fetch_k),
+            asyncio.to_thread(self.bm25.search, query, self._fetch_k)
+        )
+        return self._fuse(dense, sparse)
+
+    def search_with_vector(
+            self,
+            query: str,
+            vector: List[float]
+    ) -> List[Document]:
+        dense = self.vectorstore.similarity_search_with_score_by_vector(vector, k = self._fetch_k)
+        return self._fuse(dense, self.bm25.search(query, self._fetch_k))
+
+    async def _aget_relevant_documents(
+            self,
+            query: str,
+            *,
+            run_manager: Optional[AsyncCallbackManagerForRetrieverRun] = None
+    ) -> List[Document]:
+        vector = await self.vectorstore.embeddings.aembed_query(query)
+        return await self.asearch_with_vector(query, vector)
+
+    def _get_relevant_documents(
+            self,
+            query: str,
+            *,
+            run_manager: Optional[CallbackManagerForRetrieverRun] = None
+    ) -> List[Document]:
+        return self.search_with_vector(query, self.vectorstore.embeddings.embed_query(query))
@@ -0,0 +1,323 @@
+# === Python Modules ===
+import math
+import uuid
+import faiss
+import pickle
+import numpy as np
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
+
+# === Components ===
+from rag_pipeline.components.registry import get_settings
+
+INDEX_TYPES = ("flat", "hnsw", "ivf")
+QUANTIZATIONS = ("none", "sq8", "pq")
+
+# === Function to Read the Index Settings ===
+def index_settings() -> Dict[str, Any]:
+    return get_settings("retriever").get("index") or {}
+
+# === Function to Choose the Index Type of a Corpus ===
+def choose_index(
+        n_vectors: int,
+        dim: int,
+        settings: Optional[Dict[str, Any]] = None
+) -> Tuple[str, str]:
+    """
+    Picks (index type, quantization) for a corpus. With `type: auto` small corpora
+    stay on an exact flat index, mid-sized ones use HNSW and the largest IVF.
+    Quantization is only used once there are enough vectors to train it, and
+    product quantization needs `pq_m` to divide the dimension.
+
+    Returns:
+        Tuple[str, str]: One of INDEX_TYPES and one of QUANTIZATIONS.
+    """
+    settings = index_settings() if settings is None else settings
+    index_type = settings.get("type", "auto")
+    if index_type == "auto":
+        if n_vectors <= settings.get("flat_max_vectors", 20000):
+            index_type = "flat"
+        elif n_vectors <= settings.get("hnsw_max_vectors", 200000):
+            index_type = "hnsw"
+        else:
+            index_type = "ivf"
+
+    quantization = settings.get("quantization", "none") or "none"
+    if quantization != "none" and n_vectors < settings.get("min_train_vectors", 10000):
+        quantization = "none"
+    if quantization == "pq" and dim % settings.get("pq_m", 16):
+        quantization = "sq8"
+
+    return index_type, quantization
+
+def _ivf_nlist(
+        n_vectors: int,
+        settings: Dict[str, Any]
+) -> int:
+    ## === ~4 sqrt(n) lists, with at least 39 training points per list ===
+    nlist = settings.get("ivf_nlist") or int(4 * math.sqrt(n_vectors))
+    return max(1, min(nlist, n_vectors // 39))
+
+# === Function to Describe an Index for faiss.index_factory ===
+def factory_string(
+        index_type: str,
+        quantization: str,
+        n_vectors: int,
+        settings: Optional[Dict[str, Any]] = None
+) -> str:
+    settings = index_settings() if settings is None else settings
+    codec = {
+        "none": "Flat",
+        "sq8": "SQ8",
+        "pq": f"PQ{settings.get('pq_m', 16)}"
+    }[quantization]
+
+    if index_type == "hnsw":
+        prefix = f"HNSW{settings.get('hnsw_m', 32)}"
+        return prefix if quantization == "none" else f"{prefix}_{codec}"
+    if index_type == "ivf":
+        return f"IVF{_ivf_nlist(n_vectors, settings)},{codec}"
+    return codec
+
+# === Function to Apply Query-time Parameters ===
+def configure_search(
+        index: Any,
+        settings: Optional[Dict[str, Any]] = None
+) -> None:
+    """
+    Sets HNSW `efSearch` / IVF `nprobe` from the settings (they may change after the index was built).
+    """
+    settings = index_settings() if settings is None else settings
+    if isinstance(index, faiss.IndexHNSW):
+        index.hnsw.efSearch = settings.get("hnsw_ef_search", 64)
+    elif isinstance(index, faiss.IndexIVF):
+        index.nprobe = min(settings.get("ivf_nprobe", 16), index.nlist)
+
+# === Function to Build and Fill an Index ===
+def build_index(
+        vectors: np.ndarray,
+        settings: Optional[Dict[str, Any]] = None
+) -> Any:
+    """
+    Creates the index chosen for `vectors`, trains it if needed and adds the vectors.
+    Training uses at most `max_train_vectors` randomly sampled vectors.
+    """
+    settings = index_settings() if settings is None else settings
+    vectors = np.ascontiguousarray(vectors, dtype = np.float32)
+    n_vectors, dim = vectors.shape
+
+    index_type, quantization = choose_index(n_vectors, dim, settings)
+    index = faiss.index_factory(dim, factory_string(index_type, quantization, n_vectors, settings))
+
+    if isinstance(index, faiss.IndexHNSW):
+        index.hnsw.efConstruction = settings.get("hnsw_ef_construction", 200)
+
+    if not index.is_trained:
+        max_train = settings.get("max_train_vectors", 100000)
+        sample = vectors
+        if n_vectors > max_train:
+            rows = np.random.default_rng(0).choice(n_vectors, max_train, replace = False)
+            sample = vectors[np.sort(rows)]
+        index.train(sample)
+
+    index.add(vectors)
+    configure_search(index, settings)
+    return index
+
+# === Functions to Inspect an Index ===
+def index_kind(
+        index: Any
+) -> Tuple[str, str]:
+    """
+    Returns the (index type, quantization) of an existing index.
+    """
+    if isinstance(index, faiss.IndexHNSW):
+        index_type, codes = "hnsw", faiss.downcast_index(index.storage)
+    elif isinstance(index, faiss.IndexIVF):
+        index_type, codes = "ivf", index
+    else:
+        index_type, codes = "flat", index
+
+    if isinstance(codes, (faiss.IndexScalarQuantizer, faiss.IndexIVFScalarQuantizer)):
+        return index_type, "sq8"
+    if isinstance(codes, (faiss.IndexPQ, faiss.IndexIVFPQ)):
+        return index_type, "pq"
+    return index_type, "none"
+
+def supports_removal(
+        index: Any
+) -> bool:
+    """
+    Only flat-coded indexes (flat, SQ, PQ) can drop vectors in place: they compact
+    their rows, matching how LangChain renumbers `index_to_docstore_id` after a delete.
+    HNSW graphs cannot drop vectors, and IVF keeps the original labels of the
+    remaining vectors, which would then point at the wrong docstore ids.
+    """
+    return isinstance(index, faiss.IndexFlatCodes)
+
+def index_bytes(
+        index: Any
+) -> int:
+    """
+    Estimates the memory of an index: vector codes, ids, graph links and centroids.
+    """
+    if isinstance(index, faiss.IndexHNSW):
+        links = index.ntotal * index.hnsw.nb_neighbors(0) * 4
+        return index_bytes(faiss.downcast_index(index.storage)) + links
+    if isinstance(index, faiss.IndexIVF):
+        return index.ntotal * (index.code_size + 8) + index.nlist * index.d * 4
+    code_size = getattr(index, "code_size", index.d * 4)
+    return int(index.ntotal) * int(code_size)
+
+# === Function to Build a FAISS Vector Store with the Configured Index ===
+def build_vectorstore(
+        documents: List[Document],
+        embeddings: Embeddings,
+        ids: Optional[Sequence[str]] = None,
+        vectors: Optional[np.ndarray] = None,
+        settings: Optional[Dict[str, Any]] = None
+) -> FAISS:
+    """
+    Embeds the documents (unless `vectors` are given) and wraps the chosen FAISS index
+    in a LangChain vector store, like `FAISS.from_documents` but not always flat.
+
+    Args:
+        documents (List[Document]): Chunks to index.
+        embeddings (Embeddings): Embedding model (also used for queries).
+        ids (Sequence[str], optional): Docstore ids of the chunks.
+        vectors (np.ndarray, optional): Precomputed embeddings, one row per document.
+        settings (Dict[str, Any], optional): Index settings (defaults to `retriever.index`).
+
+    Returns:
+        FAISS: The vector store.
+    """
+    if vectors is None:
+        vectors = np.asarray(embeddings.embed_documents([doc.page_content for doc in documents]), dtype = np.float32)
+
+    index = build_index(vectors, settings)
+    ids = list(ids) if ids is not None else [doc.id or str(uuid.uuid4()) for doc in documents]
+
+    docstore = InMemoryDocstore({
+        doc_id: Document(id = doc_id, page_content = doc.page_content, metadata = doc.metadata)
+        for doc_id, doc in zip(ids, documents)
+    })
+    db = FAISS(
+        embedding_function = embeddings,
+        index = index,
+        docstore = docstore,
+        index_to_docstore_id = dict(enumerate(ids))
+    )
+
+    index_type, quantization = index_kind(index)
+    print(f"🧮 Built {index_type} index ({quantization}) over {index.ntotal} vectors.")
+    return db
+
+# === Function to Rebuild a Vector Store (drop vectors, change index type) ===
+def rebuild_vectorstore(
+        db: FAISS,
+        embeddings: Embeddings,
+        drop_ids: Sequence[str] = (),
+        settings: Optional[Dict[str, Any]] = None
+) -> FAISS:
+    """
+    Rebuilds `db` without `drop_ids` using the index chosen for its new size.
+    Vectors of an unquantized flat index are reconstructed exactly; other indexes
+    re-embed their chunks, which the content-hash embedding cache answers locally.
+    """
+    drop = set(drop_ids)
+    rows = [(row, doc_id) for row, doc_id in sorted(db.index_to_docstore_id.items()) if doc_id not in drop]
+    documents = [db.docstore.search(doc_id) for _, doc_id in rows]
+    ids = [doc_id for _, doc_id in rows]
+
+    vectors = None
+    if index_kind(db.index) == ("flat", "none") and rows:
+        vectors = db.index.reconstruct_n(0, db.index.ntotal)[[row for row, _ in rows]]
+
+    return build_vectorstore(documents, embeddings, ids = ids, vectors = vectors, settings = settings)
+
+# === Function to Remove Chunks from a Vector Store ===
+def remove_from_vectorstore(
+        db: FAISS,
+        embeddings: Embeddings,
+        drop_ids: Sequence[str]
+) -> FAISS:
+    """
+    Deletes `drop_ids` in place when the index supports it, otherwise rebuilds it without them.
+    """
+    if supports_removal(db.index):
+        db.delete(list(drop_ids))
+        return db
+    return rebuild_vectorstore(db, embeddings, drop_ids = drop_ids)
+
+# === Function to Check if an Index Should Be Rebuilt ===
+def needs_rebuild(
+        db: FAISS,
+        settings: Optional[Dict[str, Any]] = None
+) -> bool:
+    """
+    True when the index type or quantization chosen for the current size differs from the built one.
+    """
+    return index_kind(db.index) != choose_index(db.index.ntotal, db.index.d, settings)
+
+# === FAISS Vector Store Backed by a Read-only Memory-mapped Index ===
+class MappedFAISS(FAISS):
+    """
+    A session index loaded with `IO_FLAG_MMAP_IFC`: vector codes, graph links and
+    inverted lists stay in the file and are paged in on demand, so cold sessions
+    cost page cache instead of heap and every worker on a host shares the same
+    physical pages. The mapping is read-only; updates go through the indexer,
+    which works on its own fully loaded copy.
+    """
+    MMAP_FLAGS = faiss.IO_FLAG_MMAP_IFC | faiss.IO_FLAG_READ_ONLY
+
+    @classmethod
+    def load_mapped(
+            cls,
+            folder_path: Path,
+            embeddings: Embeddings,
+            index_name: str = "index"
+    ) -> FAISS:
+        """
+        Like `FAISS.load_local` (for indexes written by this pipeline), but memory-maps
+        the index. Falls back to a full load if the index cannot be mapped.
+        """
+        path = Path(folder_path)
+        try:
+            index = faiss.read_index(str(path / f"{index_name}.faiss"), cls.MMAP_FLAGS)
+            store = cls
+        except RuntimeError as e:
+            print(f"⚠️ Cannot memory-map {path / index_name}.faiss ({e}); loading it into memory.")
+            index = faiss.read_index(str(path / f"{index_name}.faiss"))
+            store = FAISS
+
+        with open(path / f"{index_name}.pkl", "rb") as f:
+            docstore, index_to_docstore_id = pickle.load(f)
+
+        return store(embeddings, index, docstore, index_to_docstore_id)
+
+    def _read_only(self, *args, **kwargs):
+        raise ValueError("❌ Memory-mapped session indexes are read-only; update them through the indexer.")
+
+    add_texts = add_embeddings = delete = merge_from = _read_only
+
+# === Function to Load a Persisted Session Index ===
+def load_vectorstore(
+        folder_path: Path,
+        embeddings: Embeddings,
+        mmap: bool = True
+) -> FAISS:
+    """
+    Loads a session index for querying: memory-mapped (read-only) or fully into memory.
+    """
+    if mmap:
+        return MappedFAISS.load_mapped(folder_path, embeddings)
+
+    return FAISS.load_local(
+        str(folder_path),
+        embeddings,
+        allow_dangerous_deserialization = True
+    )
@@ -0,0 +1,342 @@
+# === Python Modules ===
+import json
+import hashlib
+import numpy as np
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from langchain_community.vectorstores import FAISS
+from langchain_core.embeddings import Embeddings
+
+# === Pipeline ===
+from rag_pipeline.pipeline.data_extract import extract_data_pipeline
+
+# === Components ===
+from rag_pipeline.components.registry import get_settings
+from rag_pipeline.components.bm25 import BM25Index, BM25_FILE
+from rag_pipeline.components.index_factory import (
+    needs_rebuild,
+    rebuild_vectorstore,
+    remove_from_vectorstore
+)
+from rag_pipeline.components.shared_store import (
+    SharedVectorStore,
+    get_shared_store,
+    shared_store_enabled
+)
+from rag_pipeline.components.retriever import (
+    MANIFEST_NAME,
+    build_bm25,
+    build_documents,
+    get_ingestion_embeddings,
+    report_embedding_cache,
+    as_session_retriever,
+    replace_dir_atomically,
+    save_session_index
+)
+
+SUPPORTED_SUFFIXES = (".pdf", ".txt")
+
+# === Function to Hash a File ===
+def file_sha256(
+        path: Path,
+        chunk_size: int = 1024 * 1024
+) -> str:
+    """
+    Computes the SHA-256 of a file without loading it into memory.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+# === Function to Read a Session Manifest ===
+def load_manifest(
+        index_dir: Path
+) -> Dict[str, Any]:
+    """
+    Reads `manifest.json` of a session index (files, hashes, chunk ids, file metadata).
+
+    Returns:
+        Dict[str, Any]: The manifest, or an empty one if the session has none yet.
+    """
+    manifest_path = Path(index_dir) / MANIFEST_NAME
+    if not manifest_path.exists():
+        return {"version": 1, "files": {}}
+
+    return json.loads(manifest_path.read_text(encoding = "utf-8"))
+
+# === Function to Extract and Chunk Files ===
+def build_file_chunks(
+        file_paths: List[Path],
+        file_hashes: Dict[str, str]
+) -> Dict[str, Tuple[list, List[str], Dict[str, Any]]]:
+    """
+    Extracts the given files in one pass (so the parallel extractor can spread them
+    across its pool) and returns, per file name, its documents with deterministic
+    chunk ids derived from the file name and content (identical files under
+    different names get distinct ids) and its file metadata.
+
+    Args:
+        file_paths (List[Path]): Files to extract, all in the same session folder.
+        file_hashes (Dict[str, str]): SHA-256 per file name.
+
+    Returns:
+        Dict[str, Tuple[list, List[str], Dict[str, Any]]]: Documents, chunk ids and file metadata per file name.
+    """
+    if not file_paths:
+        return {}
+
+    texts, tables, metadata = extract_data_pipeline(
+        session_folder = Path(file_paths[0]).parent,
+        files = list(file_paths)
+    )
+
+    texts_by_file: Dict[str, list] = {}
+    for item in texts:
+        texts_by_file.setdefault(item["metadata"]["source"], []).append(item)
+
+    ## === Tables come back in file order; PDF metadata counts them per file ===
+    tables_by_file: Dict[str, list] = {}
+    metadata_by_file: Dict[str, Dict[str, Any]] = {}
+    offset = 0
+    for file_info in metadata:
+        n_tables = file_info.get("total_tables", 0) if file_info.get("type") == "pdf" else 0
+        tables_by_file[file_info["file_name"]] = tables[offset:offset + n_tables]
+        metadata_by_file[file_info["file_name"]] = file_info
+        offset += n_tables
+
+    chunks = {}
+    for file_path in file_paths:
+        name = Path(file_path).name
+        docs = build_documents(
+            texts = texts_by_file.get(name),
+            tables = tables_by_file.get(name),
+            source = name
+        )
+        file_key = hashlib.sha256(f"{name}\0{file_hashes[name]}".encode("utf-8")).hexdigest()
+        ids = [f"{file_key[:16]}-{idx}" for idx in range(len(docs))]
+        chunks[name] = (docs, ids, metadata_by_file.get(name, {"file_name": name}))
+
+    return chunks
+
+# === Function to Incrementally Update a Session Index ===
+def update_session_index(
+        session_id: str,
+        session_folder: Path,
+        base_dir: Path = Path("models"),
+        model_name: str = "text-embedding-3-small",
+        embeddings: Optional[Embeddings] = None,
+        known_hashes: Optional[Dict[str, str]] = None,
+        progress: Optional[Callable[[str, int, int], None]] = None,
+        shared_store: Optional[SharedVectorStore] = None
+) -> Tuple[Any, List[Dict[str, Any]], Dict[str, List[str]]]:
+    """
+    Brings `models/<session_id>` in sync with the files in the session folder.
+    New files are appended with `add_documents`, replaced or deleted files have
+    their vectors removed by chunk id, and unchanged files are neither
+    re-extracted nor re-embedded. The updated index is swapped in atomically.
+    HNSW indexes cannot drop vectors, so removals rebuild them, and the index is
+    rebuilt whenever its size calls for another type (see `retriever.index`).
+    With `retriever.store: shared` the session's partition of the shared store is
+    updated instead of a per-session folder.
+
+    Args:
+        session_id (str): Session identifier.
+        session_folder (Path): Folder containing the session's uploaded files.
+        base_dir (Path): Folder holding one index folder per session.
+        model_name (str): Embedding model name.
+        embeddings (Embeddings, optional): Embedding model to use instead of OpenAIEmbeddings(model_name).
+        known_hashes (Dict[str, str], optional): SHA-256 per file name already computed during upload.
+        progress (Callable, optional): Called as progress(stage, done, total) for the
+                                       "extract", "embed" and "persist" stages.
+        shared_store (SharedVectorStore, optional): Shared store to update (defaults to the
+                                                    process-wide one when `retriever.store` is "shared").
+
+    Returns:
+        Tuple: The session retriever, file-level metadata of every file in the session,
+               and the change set ({"added", "updated", "removed", "unchanged"}).
+    """
+    if shared_store is None and shared_store_enabled():
+        shared_store = get_shared_store()
+
+    index_dir = Path(base_dir) / session_id
+    if shared_store is not None:
+        manifest = shared_store.load_manifest(session_id)
+        has_index = bool(manifest["files"])
+    else:
+        manifest = load_manifest(index_dir)
+        has_index = (index_dir / "index.faiss").exists() and bool(manifest["files"])
+    known_hashes = known_hashes or {}
+    progress = progress or (lambda stage, done, total: None)
+
+    # === Hash the current session files ===
+    current = {
+        path.name: known_hashes.get(path.name) or file_sha256(path)
+        for path in sorted(Path(session_folder).iterdir())
+        if path.is_file() and path.suffix.lower() in SUPPORTED_SUFFIXES
+    }
+    previous = manifest["files"] if has_index else {}
+
+    changes = {
+        "added": [name for name in current if name not in previous],
+        "updated": [name for name in current if name in previous and previous[name]["sha256"] != current[name]],
+        "removed": [name for name in previous if name not in current],
+        "unchanged": [name for name in current if name in previous and previous[name]["sha256"] == current[name]]
+    }
+    print(
+        f"🗂️ Session '{session_id}': {len(changes['added'])} added, {len(changes['updated'])} updated, "
+        f"{len(changes['removed'])} removed, {len(changes['unchanged'])} unchanged."
+    )
+
+    embeddings = get_ingestion_embeddings(
+        model_name = model_name,
+        embeddings = embeddings
+    )
+
+    # === Load the current index (a private, writable copy) ===
+    db = None
+    if has_index and shared_store is None:
+        db = FAISS.load_local(
+            str(index_dir),
+            embeddings,
+            allow_dangerous_deserialization = True
+        )
+
+    # === Remove vectors of replaced and deleted files ===
+    stale_ids = [
+        chunk_id
+        for name in changes["updated"] + changes["removed"]
+        for chunk_id in previous[name]["chunk_ids"]
+    ]
+    if db is not None and stale_ids:
+        db = remove_from_vectorstore(db, embeddings, stale_ids)
+
+    # === Extract only new or replaced files ===
+    files_entry = {name: previous[name] for name in changes["unchanged"]}
+    to_extract = changes["added"] + changes["updated"]
+    new_docs, new_ids = [], []
+    progress("extract", 0, len(to_extract))
+    chunks = build_file_chunks(
+        file_paths = [Path(session_folder) / name for name in to_extract],
+        file_hashes = current
+    )
+    for name in to_extract:
+        docs, ids, metadata = chunks[name]
+        new_docs.extend(docs)
+        new_ids.extend(ids)
+        files_entry[name] = {
+            "sha256": current[name],
+            "chunk_ids": ids,
+            "metadata": metadata
+        }
+    progress("extract", len(to_extract), len(to_extract))
+
+    # === Shared store: embed, then apply the whole update at once ===
+    if shared_store is not None:
+        return _update_shared_session(
+            store = shared_store,
+            session_id = session_id,
+            embeddings = embeddings,
+            new_docs = new_docs,
+            new_ids = new_ids,
+            stale_ids = stale_ids,
+            files_entry = files_entry,
+            changes = changes,
+            progress = progress
+        )
+
+    # === Embed and append them in batches ===
+    batch_size = max(1, int(get_settings("ingestion").get("embed_batch_size", 256)))
+    progress("embed", 0, len(new_docs))
+    if new_docs:
+        print(f"📚 Preparing {len(new_docs)} documents for indexing...")
+        for start in range(0, len(new_docs), batch_size):
+            batch_docs = new_docs[start:start + batch_size]
+            batch_ids = new_ids[start:start + batch_size]
+            if db is None:
+                db = FAISS.from_documents(batch_docs, embeddings, ids = batch_ids)
+            else:
+                db.add_documents(batch_docs, ids = batch_ids)
+            progress("embed", start + len(batch_docs), len(new_docs))
+
+        report_embedding_cache(embeddings)
+
+    if db is None or db.index.ntotal == 0:
+        raise ValueError("❌ No texts or tables provided. Please extract data first.")
+
+    # === Move to the index type configured for the new size (flat -> HNSW -> IVF) ===
+    if (stale_ids or new_docs) and needs_rebuild(db):
+        db = rebuild_vectorstore(db, embeddings)
+
+    # === Sparse index over the same chunks (rebuilt only when they changed) ===
+    changed = bool(stale_ids or new_docs or not has_index)
+    bm25 = None if changed else BM25Index.load(index_dir)
+    if bm25 is None:
+        bm25 = build_bm25(db)
+        changed = changed or (bm25 is not None and not (index_dir / BM25_FILE).exists())
+
+    # === Persist index + manifest, then swap them in atomically ===
+    progress("persist", 0, 1)
+    if changed:
+        save_session_index(
+            db = db,
+            bm25 = bm25,
+            index_dir = index_dir,
+            manifest = {"version": 1, "files": files_entry}
+        )
+        print(f"✅ Retriever (FAISS index) updated and saved at: {index_dir}")
+    progress("persist", 1, 1)
+
+    file_metadata = [files_entry[name]["metadata"] for name in sorted(files_entry)]
+
+    return as_session_retriever(db, bm25), file_metadata, changes
+
+# === Function to Update a Session in the Shared Store ===
+def _update_shared_session(
+        store: SharedVectorStore,
+        session_id: str,
+        embeddings: Embeddings,
+        new_docs: list,
+        new_ids: List[str],
+        stale_ids: List[str],
+        files_entry: Dict[str, Any],
+        changes: Dict[str, List[str]],
+        progress: Callable[[str, int, int], None]
+) -> Tuple[Any, List[Dict[str, Any]], Dict[str, List[str]]]:
+    """
+    Embeds the new chunks in batches, then appends them, removes the stale ones and
+    stores the manifest in one step, so readers never see a half-applied update.
+    """
+    if not any(entry["chunk_ids"] for entry in files_entry.values()):
+        raise ValueError("❌ No texts or tables provided. Please extract data first.")
+
+    batch_size = max(1, int(get_settings("ingestion").get("embed_batch_size", 256)))
+    vectors = []
+    progress("embed", 0, len(new_docs))
+    if new_docs:
+        print(f"📚 Preparing {len(new_docs)} documents for indexing...")
+        for start in range(0, len(new_docs), batch_size):
+            batch_docs = new_docs[start:start + batch_size]
+            vectors.extend(embeddings.embed_documents([doc.page_content for doc in batch_docs]))
+            progress("embed", start + len(batch_docs), len(new_docs))
+
+        report_embedding_cache(embeddings)
+
+    progress("persist", 0, 1)
+    if changes["added"] or changes["updated"] or changes["removed"] or not store.has_session(session_id):
+        store.update_session(
+            session_id = session_id,
+            documents = new_docs,
+            ids = new_ids,
+            vectors = np.asarray(vectors, dtype = np.float32) if vectors else np.empty((0, store.dim or 0), dtype = np.float32),
+            remove_ids = stale_ids,
+            manifest = {"version": 1, "files": files_entry}
+        )
+        print(f"✅ Session '{session_id}' updated in the shared vector store at: {store.path}")
+    progress("persist", 1, 1)
+
+    db = store.session(session_id, embeddings)
+    file_metadata = [files_entry[name]["metadata"] for name in sorted(files_entry)]
+
+    return as_session_retriever(db, build_bm25(db)), file_metadata, changes
@@ -0,0 +1,231 @@
+# === Python Modules ===
+import time
+import uuid
+import asyncio
+import threading
+from functools import partial
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+# === Components ===
+from rag_pipeline.components.registry import get_settings
+
+INGESTION_STAGES = ["save", "extract", "embed", "persist", "metadata"]
+
+# === A Single Ingestion Job ===
+class IngestionJob:
+    def __init__(
+            self,
+            session_id: str,
+            stages: List[str] = INGESTION_STAGES
+    ):
+        """
+        Tracks the status, per-stage progress and timing of one upload.
+
+        Args:
+            session_id (str): Session the upload belongs to.
+            stages (List[str]): Ordered stage names.
+        """
+        self.job_id = f"job_{uuid.uuid4().hex[:12]}"
+        self.session_id = session_id
+        self.status = "queued"
+        self.error: Optional[str] = None
+        self.created_at = datetime.now(timezone.utc)
+        self.stages: Dict[str, Dict[str, Any]] = {
+            name: {
+                "name": name,
+                "status": "pending",
+                "progress": 0.0,
+                "started_at": None,
+                "duration_s": None,
+                "_start": None
+            }
+            for name in stages
+        }
+        self._lock = threading.Lock()
+
+    # === Progress Callback (safe to call from worker threads) ===
+    def progress(
+            self,
+            stage: str,
+            done: int,
+            total: int
+    ) -> None:
+        """
+        Records that `done` of `total` units of a stage are finished.
+        A stage starts on its first report and finishes when done == total.
+        """
+        with self._lock:
+            entry = self.stages.setdefault(stage, {
+                "name": stage, "status": "pending", "progress": 0.0,
+                "started_at": None, "duration_s": None, "_start": None
+            })
+            if entry["status"] == "pending":
+                entry["status"] = "running"
+                entry["started_at"] = datetime.now(timezone.utc)
+                entry["_start"] = time.perf_counter()
+
+            entry["progress"] = round(done / total, 4) if total else 1.0
+            if total == 0 or done >= total:
+                entry["status"] = "completed"
+                entry["duration_s"] = round(time.perf_counter() - entry["_start"], 3)
+
+    # === Context Manager for a Stage Without Fine-grained Progress ===
+    @asynccontextmanager
+    async def stage(
+            self,
+            name: str
+    ):
+        self.progress(name, 0, 1)
+        yield
+        self.progress(name, 1, 1)
+
+    # === Function to Export the Job as a Dict ===
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            stages = [
+                {k: v for k, v in entry.items() if not k.startswith("_")}
+                for entry in self.stages.values()
+            ]
+
+        return {
+            "job_id": self.job_id,
+            "session_id": self.session_id,
+            "job_status": self.status,
+            "error": self.error,
+            "created_at": self.created_at,
+            "stages": stages
+        }
+
+# === Registry and Runner of Ingestion Jobs ===
+class IngestionJobManager:
+    def __init__(
+            self,
+            max_workers: Optional[int] = None,
+            max_jobs: int = 1000
+    ):
+        """
+        Runs ingestion work off the event loop and keeps job status for polling.
+
+        Args:
+            max_workers (int, optional): Size of the ingestion thread pool
+                                         (defaults to `ingestion.max_workers` in pipeline.yaml).
+            max_jobs (int): Number of finished jobs kept for status polling.
+        """
+        self.executor = ThreadPoolExecutor(
+            max_workers = max_workers or get_settings("ingestion").get("max_workers", 2),
+            thread_name_prefix = "ingestion"
+        )
+        self.max_jobs = max_jobs
+        self.jobs: Dict[str, IngestionJob] = {}
+        self._ingesting: Dict[str, str] = {}
+        self._session_locks: Dict[str, asyncio.Lock] = {}
+        self._session_waiters: Dict[str, int] = {}
+
+    # === Function to Register a New Job ===
+    def create(
+            self,
+            session_id: str
+    ) -> IngestionJob:
+        job = IngestionJob(session_id = session_id)
+        self.jobs[job.job_id] = job
+        self._ingesting[session_id] = job.job_id
+
+        ## === Forget the oldest finished jobs ===
+        while len(self.jobs) > self.max_jobs:
+            oldest = next(
+                (jid for jid, j in self.jobs.items() if j.status in ("completed", "failed")),
+                None
+            )
+            if oldest is None:
+                break
+            self.jobs.pop(oldest)
+
+        return job
+
+    def get(
+            self,
+            job_id: str
+    ) -> Optional[IngestionJob]:
+        return self.jobs.get(job_id)
+
+    # === Function to Check if a Session Is Being Ingested ===
+    def is_ingesting(
+            self,
+            session_id: str
+    ) -> bool:
+        return session_id in self._ingesting
+
+    # === Function to Run Blocking Work on the Ingestion Pool ===
+    async def run_in_pool(
+            self,
+            fn: Callable,
+            *args,
+            **kwargs
+    ) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor,
+            partial(fn, *args, **kwargs)
+        )
+
+    # === Function to Run a Job to Completion ===
+    async def run(
+            self,
+            job: IngestionJob,
+            work: Callable[[IngestionJob], Awaitable[Any]]
+    ) -> None:
+        """
+        Runs `work(job)`; jobs of the same session run one after another.
+        Failures are recorded on the job instead of being raised.
+        """
+        ## === One lock per session, dropped once its last waiting job leaves ===
+        session_id = job.session_id
+        lock = self._session_locks.setdefault(session_id, asyncio.Lock())
+        self._session_waiters[session_id] = self._session_waiters.get(session_id, 0) + 1
+
+        try:
+            async with lock:
+                job.status = "running"
+                try:
+                    await work(job)
+                    job.status = "completed"
+                    print(f"✅ Ingestion job {job.job_id} for session '{session_id}' completed.")
+
+                except Exception as e:
+                    self.fail(job, e)
+
+                finally:
+                    self._release(job)
+        finally:
+            self._session_waiters[session_id] -= 1
+            if not self._session_waiters[session_id]:
+                del self._session_waiters[session_id]
+                del self._session_locks[session_id]
+
+    # === Function to Mark a Job as Failed ===
+    def fail(
+            self,
+            job: IngestionJob,
+            error: Exception
+    ) -> None:
+        job.status = "failed"
+        job.error = str(error)
+        for entry in job.stages.values():
+            if entry["status"] == "running":
+                entry["status"] = "failed"
+        print(f"⚠️ Ingestion job {job.job_id} failed: {error}")
+        self._release(job)
+
+    def _release(
+            self,
+            job: IngestionJob
+    ) -> None:
+        if self._ingesting.get(job.session_id) == job.job_id:
+            self._ingesting.pop(job.session_id, None)
+
+    # === Function to Release the Worker Pool ===
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait = False, cancel_futures = True)
@@ -0,0 +1,205 @@
+# === Python Modules ===
+import threading
+import httpx
+from typing import Any, Dict, Optional, Tuple, Type
+from pydantic import BaseModel
+from langchain_openai import ChatOpenAI
+from langchain_core.runnables import Runnable
+from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.utils.function_calling import convert_to_openai_function
+
+# === Shared Pool of LLM Clients ===
+class LLMClientRegistry:
+    def __init__(
+            self,
+            max_connections: int = 100,
+            max_keepalive_connections: int = 20,
+            keepalive_expiry: float = 60.0,
+            timeout: float = 120.0,
+            base_url: Optional[str] = None,
+            api_key: Optional[str] = None
+    ):
+        """
+        Hands out cached chat models and structured-output runnables that all share
+        a single pooled HTTP client, so connections and TLS sessions are reused
+        across agents and requests.
+
+        Args:
+            max_connections (int): Upper bound on concurrent connections to the LLM API.
+            max_keepalive_connections (int): Idle connections kept open for reuse.
+            keepalive_expiry (float): Seconds an idle connection is kept alive.
+            timeout (float): Request timeout in seconds.
+            base_url (str, optional): OpenAI-compatible endpoint (defaults to the OpenAI API).
+            api_key (str, optional): API key (defaults to the OPENAI_API_KEY env var).
+        """
+        self.base_url = base_url
+        self.api_key = api_key
+
+        ## === One pooled async HTTP client for every model ===
+        self.http_client = httpx.AsyncClient(
+            limits = httpx.Limits(
+                max_connections = max_connections,
+                max_keepalive_connections = max_keepalive_connections,
+                keepalive_expiry = keepalive_expiry
+            ),
+            timeout = timeout
+        )
+
+        self._chat_models: Dict[Tuple[str, float], ChatOpenAI] = {}
+        self._structured: Dict[Tuple[str, float, Type[BaseModel]], Runnable] = {}
+        self._json_streams: Dict[Tuple[str, float, Type[BaseModel]], Runnable] = {}
+        self._lock = threading.Lock()
+
+    # === Function to Get a (Cached) Chat Model ===
+    def get_chat_model(
+            self,
+            model_name: str,
+            temperature: float = 0.0
+    ) -> ChatOpenAI:
+        """
+        Returns the chat model for (model_name, temperature), creating it on first use.
+
+        Args:
+            model_name (str): Name of the OpenAI model.
+            temperature (float): Sampling temperature.
+
+        Returns:
+            ChatOpenAI: Chat model bound to the shared HTTP client.
+        """
+        key = (model_name, float(temperature))
+        llm = self._chat_models.get(key)
+
+        if llm is None:
+            with self._lock:
+                llm = self._chat_models.get(key)
+                if llm is None:
+                    kwargs: Dict[str, Any] = {}
+                    if self.base_url:
+                        kwargs["base_url"] = self.base_url
+                    if self.api_key:
+                        kwargs["api_key"] = self.api_key
+
+                    llm = ChatOpenAI(
+                        model = model_name,
+                        temperature = temperature,
+                        http_async_client = self.http_client,
+                        **kwargs
+                    )
+                    self._chat_models[key] = llm
+
+        return llm
+
+    # === Function to Get a (Cached) Structured-output Runnable ===
+    def get_structured(
+            self,
+            model_name: str,
+            temperature: float,
+            schema: Type[BaseModel]
+    ) -> Runnable:
+        """
+        Returns `get_chat_model(...).with_structured_output(schema)`, built once per key.
+
+        Args:
+            model_name (str): Name of the OpenAI model.
+            temperature (float): Sampling temperature.
+            schema (Type[BaseModel]): Pydantic schema of the expected output.
+
+        Returns:
+            Runnable: Structured-output runnable returning `schema` instances.
+        """
+        key = (model_name, float(temperature), schema)
+        runnable = self._structured.get(key)
+
+        if runnable is None:
+            chat_model = self.get_chat_model(
+                model_name = model_name,
+                temperature = temperature
+            )
+            with self._lock:
+                runnable = self._structured.get(key)
+                if runnable is None:
+                    runnable = chat_model.with_structured_output(schema)
+                    self._structured[key] = runnable
+
+        return runnable
+
+    # === Function to Get a (Cached) Streaming JSON Runnable ===
+    def get_json_stream(
+            self,
+            model_name: str,
+            temperature: float,
+            schema: Type[BaseModel]
+    ) -> Runnable:
+        """
+        Returns a runnable constrained to the JSON schema of `schema` whose `astream`
+        yields the partially parsed object (a growing dict) as tokens arrive.
+
+        Args:
+            model_name (str): Name of the OpenAI model.
+            temperature (float): Sampling temperature.
+            schema (Type[BaseModel]): Pydantic schema of the expected output.
+
+        Returns:
+            Runnable: Runnable yielding partial dicts while streaming.
+        """
+        key = (model_name, float(temperature), schema)
+        runnable = self._json_streams.get(key)
+
+        if runnable is None:
+            chat_model = self.get_chat_model(
+                model_name = model_name,
+                temperature = temperature
+            )
+            function = convert_to_openai_function(schema)
+            response_format = {
+                "type": "json_schema",
+                "json_schema": {
+                    "name": function["name"],
+                    "description": function.get("description", ""),
+                    "schema": function["parameters"]
+                }
+            }
+            with self._lock:
+                runnable = self._json_streams.get(key)
+                if runnable is None:
+                    runnable = chat_model.bind(response_format = response_format) | JsonOutputParser()
+                    self._json_streams[key] = runnable
+
+        return runnable
+
+    # === Function to Release the HTTP Pool ===
+    async def aclose(self) -> None:
+        """
+        Closes the shared HTTP client and forgets all cached runnables.
+        """
+        self._json_streams.clear()
+        self._structured.clear()
+        self._chat_models.clear()
+        await self.http_client.aclose()
+
+# === Process-wide Fallback Registry ===
+_default_registry: Optional[LLMClientRegistry] = None
+
+def get_llm_clients(
+        config: Optional[dict] = None
+) -> LLMClientRegistry:
+    """
+    Returns the registry passed through the graph config (`configurable.llm_clients`),
+    falling back to a lazily created process-wide registry.
+
+    Args:
+        config (dict, optional): The runnable config received by a graph node.
+
+    Returns:
+        LLMClientRegistry: The registry to build LLM clients from.
+    """
+    global _default_registry
+
+    registry = ((config or {}).get("configurable") or {}).get("llm_clients")
+    if registry is not None:
+        return registry
+
+    if _default_registry is None:
+        _default_registry = LLMClientRegistry()
+
+    return _default_registry
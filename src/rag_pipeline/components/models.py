@@ -1,8 +1,10 @@
 # == Python Modules ==
-import yaml
-from typing import Dict
+from typing import Dict, Any
 from pathlib import Path
 
+# === Components ===
+from rag_pipeline.components.registry import config_registry
+
 # === Class for Handling Model Configurations ===
 class ModelConfig:
     def __init__(
@@ -17,9 +19,13 @@ class ModelConfig:
                                         Defaults to config/models.yaml.
         """
 
-        ## === Reading the YAML File ===
-        with open(yaml_path, "r") as f:
-            self.config = yaml.safe_load(f)
+        ## === Path to the YAML File (parsed through the shared registry) ===
+        self.yaml_path = yaml_path
+
+    # === Parsed Configuration (shared, re-parsed only when the file changes) ===
+    @property
+    def config(self) -> dict:
+        return config_registry.load(self.yaml_path)
 
     # === Function to Get Full Model Details by Alias ===
     def get_model(
@@ -56,4 +62,20 @@ class ModelConfig:
         alias = self.config["agent_model_mapping"].get(agent_name)
 
         ## === Returning the Model Details if Found ===
-        return self.get_model(alias) if alias else None
\ No newline at end of file
+        return self.get_model(alias) if alias else None
+
+    # === Function to Get Runtime Settings of a Specific Agent ===
+    def get_agent_settings(
+            self,
+            agent_name: str
+    ) -> Dict[str, Any]:
+        """
+        Get the runtime settings (concurrency, modes, ...) configured for an agent.
+
+        Args:
+            agent_name (str): The name of the agent.
+
+        Returns:
+            Dict[str, Any]: The agent settings, or an empty dict if none are configured.
+        """
+        return (self.config.get("agent_settings") or {}).get(agent_name) or {}
\ No newline at end of file
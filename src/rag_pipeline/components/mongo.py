@@ -0,0 +1,325 @@
+# === Python Modules ===
+import os
+import copy
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from dotenv import load_dotenv
+from pymongo import AsyncMongoClient, UpdateOne
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.mongodb import AsyncMongoDBSaver
+
+# === Components ===
+from rag_pipeline.components.registry import get_settings
+from rag_pipeline.components.checkpointing import build_checkpointer
+
+# === Load environment variables ===
+load_dotenv()
+
+MONGODB_URI = os.getenv("MONGODB_URI")
+DB_NAME = os.getenv("DB_NAME")
+COLLECTION_NAME = os.getenv("COLLECTION_NAME")
+COLLECTION_NAME_UPLOAD = os.getenv("COLLECTION_NAME_UPLOAD")
+COLLECTION_NAME_WRITES = os.getenv("COLLECTION_NAME_WRITES")
+
+# === Index Keys ===
+CHECKPOINT_KEYS = [("thread_id", 1), ("checkpoint_ns", 1), ("checkpoint_id", -1)]
+WRITES_KEYS = CHECKPOINT_KEYS + [("task_id", 1), ("idx", 1)]
+
+# === Function to Build an Upload Record ===
+def metadata_record(
+        session_id: str,
+        file_metadata: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    return {
+        "session_id": session_id,
+        "uploaded_files": file_metadata,
+        "uploaded_at": datetime.now(timezone.utc)
+    }
+
+# === Repository Interface ===
+class SessionRepository(ABC):
+    """
+    Data access used by the API: per-session upload metadata and the graph checkpointer.
+    Implemented by MongoDataStore (production) and InMemoryDataStore (tests, local runs).
+    """
+    @abstractmethod
+    async def ensure_indexes(self) -> None:
+        ...
+
+    @abstractmethod
+    async def upsert_file_metadata(
+            self,
+            session_id: str,
+            file_metadata: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        ...
+
+    @abstractmethod
+    async def bulk_upsert_file_metadata(
+            self,
+            records: List[Dict[str, Any]]
+    ) -> int:
+        ...
+
+    @abstractmethod
+    async def get_file_metadata(
+            self,
+            session_id: str
+    ) -> Optional[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    async def delete_session(
+            self,
+            session_id: str
+    ) -> None:
+        ...
+
+    @abstractmethod
+    def checkpointer(self) -> BaseCheckpointSaver:
+        ...
+
+    async def aclose(self) -> None:
+        return None
+
+# === MongoDB Data Store (one pooled client per process) ===
+class MongoDataStore(SessionRepository):
+    def __init__(
+            self,
+            uri: Optional[str] = None,
+            db_name: Optional[str] = None,
+            uploads_collection: Optional[str] = None,
+            checkpoint_collection: Optional[str] = None,
+            writes_collection: Optional[str] = None,
+            max_pool_size: int = 50,
+            min_pool_size: int = 0,
+            max_idle_time_ms: int = 60000,
+            wait_queue_timeout_ms: int = 5000,
+            server_selection_timeout_ms: int = 5000,
+            connect_timeout_ms: int = 5000
+    ):
+        """
+        Owns the single AsyncMongoClient of the process. Upload metadata and graph
+        checkpoints share its connection pool instead of opening a client per upload.
+
+        Args:
+            uri (str, optional): Connection string (defaults to MONGODB_URI).
+            db_name (str, optional): Database (defaults to DB_NAME).
+            uploads_collection (str, optional): Upload metadata (defaults to COLLECTION_NAME_UPLOAD).
+            checkpoint_collection (str, optional): Graph checkpoints (defaults to COLLECTION_NAME).
+            writes_collection (str, optional): Pending checkpoint writes (defaults to COLLECTION_NAME_WRITES).
+            max_pool_size (int): Upper bound on connections per server.
+            min_pool_size (int): Connections kept open while idle.
+            max_idle_time_ms (int): Idle time after which a pooled connection is closed.
+            wait_queue_timeout_ms (int): Longest wait for a free connection when the pool is full.
+            server_selection_timeout_ms (int): Longest wait for a reachable server.
+            connect_timeout_ms (int): Timeout of a new connection.
+        """
+        uri = uri or MONGODB_URI
+        if not uri:
+            raise ValueError("❌ MONGODB_URI is not set in environment variables.")
+
+        self.client = AsyncMongoClient(
+            uri,
+            maxPoolSize = max_pool_size,
+            minPoolSize = min_pool_size,
+            maxIdleTimeMS = max_idle_time_ms,
+            waitQueueTimeoutMS = wait_queue_timeout_ms,
+            serverSelectionTimeoutMS = server_selection_timeout_ms,
+            connectTimeoutMS = connect_timeout_ms
+        )
+        self.db_name = db_name or DB_NAME
+        self.db = self.client[self.db_name]
+        self.uploads = self.db[uploads_collection or COLLECTION_NAME_UPLOAD or "uploads"]
+        self.checkpoint_collection = checkpoint_collection or COLLECTION_NAME or "checkpoints_aio"
+        self.writes_collection = writes_collection or COLLECTION_NAME_WRITES or "checkpoint_writes_aio"
+        self._checkpointer: Optional[BaseCheckpointSaver] = None
+
+    # === Function to Create the Indexes the Queries Rely On ===
+    async def ensure_indexes(self) -> None:
+        """
+        Unique `session_id` on upload metadata, and the thread keys the checkpoint
+        saver looks up (same specs as AsyncMongoDBSaver, so creation is idempotent).
+        """
+        await self.uploads.create_index([("session_id", 1)], unique = True)
+        await self.db[self.checkpoint_collection].create_index(CHECKPOINT_KEYS, unique = True)
+        await self.db[self.writes_collection].create_index(WRITES_KEYS, unique = True)
+        print("✅ MongoDB indexes ready.")
+
+    # === Upload Metadata ===
+    async def upsert_file_metadata(
+            self,
+            session_id: str,
+            file_metadata: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        document = metadata_record(session_id, file_metadata)
+        await self.uploads.update_one(
+            {"session_id": session_id},
+            {"$set": document},
+            upsert = True
+        )
+        return document
+
+    async def bulk_upsert_file_metadata(
+            self,
+            records: List[Dict[str, Any]]
+    ) -> int:
+        """
+        Upserts many `{"session_id", "uploaded_files", ...}` records in one round trip.
+
+        Returns:
+            int: Number of records inserted or modified.
+        """
+        return await bulk_upsert(self.uploads, records, key = "session_id")
+
+    async def get_file_metadata(
+            self,
+            session_id: str
+    ) -> Optional[Dict[str, Any]]:
+        return await self.uploads.find_one({"session_id": session_id}, {"_id": 0})
+
+    async def delete_session(
+            self,
+            session_id: str
+    ) -> None:
+        await self.uploads.delete_one({"session_id": session_id})
+        await self.checkpointer().adelete_thread(session_id)
+
+    # === Graph Checkpointer on the Shared Client ===
+    def checkpointer(self) -> BaseCheckpointSaver:
+        if self._checkpointer is None:
+            self._checkpointer = build_checkpointer(
+                AsyncMongoDBSaver(
+                    client = self.client,
+                    db_name = self.db_name,
+                    checkpoint_collection_name = self.checkpoint_collection,
+                    writes_collection_name = self.writes_collection
+                )
+            )
+        return self._checkpointer
+
+    async def aclose(self) -> None:
+        await self.client.close()
+        print("🔒 MongoDB connection closed.")
+
+# === In-memory Stand-in (same interface, no server) ===
+class InMemoryDataStore(SessionRepository):
+    def __init__(self):
+        """
+        Keeps upload metadata in a dict and checkpoints in an InMemorySaver; for tests
+        and local runs without MongoDB. Nothing survives a restart.
+        """
+        self.uploads: Dict[str, Dict[str, Any]] = {}
+        self._checkpointer: Optional[BaseCheckpointSaver] = None
+
+    async def ensure_indexes(self) -> None:
+        return None
+
+    async def upsert_file_metadata(
+            self,
+            session_id: str,
+            file_metadata: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        document = metadata_record(session_id, file_metadata)
+        self.uploads[session_id] = copy.deepcopy(document)
+        return document
+
+    async def bulk_upsert_file_metadata(
+            self,
+            records: List[Dict[str, Any]]
+    ) -> int:
+        for record in records:
+            self.uploads[record["session_id"]] = {**self.uploads.get(record["session_id"], {}), **copy.deepcopy(record)}
+        return len({record["session_id"] for record in records})
+
+    async def get_file_metadata(
+            self,
+            session_id: str
+    ) -> Optional[Dict[str, Any]]:
+        document = self.uploads.get(session_id)
+        return copy.deepcopy(document) if document is not None else None
+
+    async def delete_session(
+            self,
+            session_id: str
+    ) -> None:
+        self.uploads.pop(session_id, None)
+        await self.checkpointer().adelete_thread(session_id)
+
+    def checkpointer(self) -> BaseCheckpointSaver:
+        if self._checkpointer is None:
+            self._checkpointer = build_checkpointer(InMemorySaver())
+        return self._checkpointer
+
+# === Bulk-write Helper ===
+async def bulk_upsert(
+        collection: Any,
+        records: List[Dict[str, Any]],
+        key: str = "session_id"
+) -> int:
+    """
+    Upserts `records` by `key` with one unordered bulk write (a failing record does not
+    stop the others).
+
+    Args:
+        collection: Async pymongo collection.
+        records (List[Dict[str, Any]]): Documents, each holding `key`.
+        key (str): Field identifying a document.
+
+    Returns:
+        int: Number of documents inserted or modified.
+    """
+    if not records:
+        return 0
+
+    operations = [UpdateOne({key: record[key]}, {"$set": record}, upsert = True) for record in records]
+    result = await collection.bulk_write(operations, ordered = False)
+    return result.upserted_count + result.modified_count
+
+# === Process-wide Data Store ===
+_store: Optional[SessionRepository] = None
+_store_lock = threading.Lock()
+
+def create_data_store(
+        settings: Optional[Dict[str, Any]] = None
+) -> SessionRepository:
+    """
+    Builds the data store from the `mongodb` settings: a pooled MongoDataStore, or the
+    InMemoryDataStore when `mongodb.backend` is "memory".
+    """
+    settings = get_settings("mongodb") if settings is None else settings
+    if settings.get("backend", "mongo") == "memory":
+        return InMemoryDataStore()
+
+    pool = settings.get("pool") or {}
+    return MongoDataStore(
+        max_pool_size = pool.get("max_pool_size", 50),
+        min_pool_size = pool.get("min_pool_size", 0),
+        max_idle_time_ms = pool.get("max_idle_time_ms", 60000),
+        wait_queue_timeout_ms = pool.get("wait_queue_timeout_ms", 5000),
+        server_selection_timeout_ms = pool.get("server_selection_timeout_ms", 5000),
+        connect_timeout_ms = pool.get("connect_timeout_ms", 5000)
+    )
+
+def get_data_store() -> SessionRepository:
+    """
+    Returns the process-wide data store, creating it on first use.
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = create_data_store()
+        return _store
+
+def set_data_store(
+        store: Optional[SessionRepository]
+) -> None:
+    """
+    Replaces the process-wide data store (None drops it; the next use creates a new one).
+    """
+    global _store
+    with _store_lock:
+        _store = store
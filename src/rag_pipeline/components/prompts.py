@@ -1,13 +1,109 @@
 # == Python Modules ==
-import yaml
+from string import Formatter
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List
+
+# === Components ===
+from rag_pipeline.components.registry import config_registry
+
+# === Pre-validated, Ready-to-format Prompt ===
+class CompiledPrompt:
+    def __init__(
+            self,
+            name: str,
+            definition: dict
+    ):
+        """
+        Validates a prompt definition and keeps it ready to be formatted.
+
+        Args:
+            name (str): The key of the prompt inside the registry.
+            definition (dict): The raw prompt definition from prompts.yaml.
+
+        Raises:
+            ValueError: If the template placeholders do not match `input_variables`.
+        """
+        self.name = name
+        self.definition = definition
+        self.system: str = definition["system"]
+        self.template: str = definition["template"]
+        self.output_schema: str = definition.get("output_schema")
+        self.input_variables: List[str] = list(definition.get("input_variables", []))
+
+        ## === Placeholders used by the template ===
+        placeholders = {
+            field for _, field, _, _ in Formatter().parse(self.template)
+            if field is not None
+        }
+
+        ## === They must match the declared input variables ===
+        if placeholders != set(self.input_variables):
+            raise ValueError(
+                f"❌ Prompt '{name}' declares input_variables {sorted(self.input_variables)} "
+                f"but its template uses {sorted(placeholders)}."
+            )
+
+    # === Function to Render the Prompt ===
+    def render(
+            self,
+            **kwargs
+    ) -> Dict[str, str]:
+        """
+        Fills the template with the given variables.
+
+        Returns:
+            Dict[str, str]: Dictionary containing system message, user message and output schema.
+        """
+        return {
+            "system": self.system,
+            "user": self.template.format(**kwargs),
+            "output_schema": self.output_schema
+        }
+
+# === Function to Compile the Whole Registry ===
+def compile_prompts(
+        data: dict
+) -> Dict[str, CompiledPrompt]:
+    """
+    Compiles every prompt of a parsed prompts.yaml file.
+
+    Args:
+        data (dict): Parsed content of prompts.yaml.
+
+    Returns:
+        Dict[str, CompiledPrompt]: Compiled prompts keyed by name.
+    """
+    return {
+        name: CompiledPrompt(name = name, definition = definition)
+        for name, definition in data["Prompts"].items()
+    }
+
+# === Function to Retrieve a Compiled Prompt ===
+def get_prompt(
+        name: str,
+        path: Path = Path("config/prompts.yaml")
+) -> CompiledPrompt:
+    """
+    Returns a compiled prompt from the process-wide registry.
+    The YAML file is parsed once and re-parsed only when its mtime changes.
+
+    Args:
+        name (str): The key of the prompt inside the registry.
+        path (Path, optional): Path to the prompts.yaml file.
+
+    Returns:
+        CompiledPrompt: The validated prompt, ready to be rendered.
+    """
+    return config_registry.load(
+        path = path,
+        compiler = compile_prompts
+    )[name]
 
 # === Function to Retrieve the Prompts ===
 def load_prompt(
         name: str,
         path: Path = Path("config/prompts.yaml")
-) -> str:
+) -> dict:
     """
     Loads a specific prompt definition from the YAML registry.
 
@@ -16,16 +112,12 @@ def load_prompt(
         path (Path, optional): Path to the prompts.yaml file.
 
     Returns:
-        str: The prompt definition corresponding to the provided name.
+        dict: The prompt definition corresponding to the provided name.
     """
-
-    ## === Calling the Whole YAML Registry ===
-    data = yaml.safe_load(
-        path.read_text(encoding = "utf-8")
-    )
-
-    ## === Returning a Specific Prompt ===
-    return data["Prompts"][name]
+    return get_prompt(
+        name = name,
+        path = path
+    ).definition
 
 # === Function to Render a Prompt with Variables ===
 def render_prompt(
@@ -45,29 +137,7 @@ def render_prompt(
         Dict[str, str]: Dictionary containing system message,
                         user message, output schema, and few_shots.
     """
-
-    ## === Loading the Full Prompt Definition ===
-    prompt_def = load_prompt(
+    return get_prompt(
         name = prompt_name,
         path = path
-    )
-
-    ## === Extracting the Template String ===
-    template = prompt_def["template"]
-
-    ## === Collecting Variables Needed by the Template ===
-    var_values = {
-        k: v for k, v in kwargs.items()
-    }
-
-    ## === Filling the Variables into the Template ===
-    filled_prompt = template.format(
-        **var_values
-    )
-
-    ## === Returning the Rendered Prompt Package ===
-    return {
-        "system": prompt_def["system"],
-        "user": filled_prompt,
-        "output_schema": prompt_def["output_schema"]
-    }
\ No newline at end of file
+    ).render(**kwargs)
@@ -0,0 +1,84 @@
+# === Python Modules ===
+import os
+import yaml
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# === Process-wide Registry of Parsed Config Files ===
+class ConfigRegistry:
+    """
+    Parses YAML config files once per process and keeps the (optionally compiled) result.
+    A file is re-parsed only when its modification time changes, so config edits are
+    picked up without restarting the server.
+    """
+    def __init__(self):
+        self._entries: Dict[Tuple[str, Optional[Callable]], Tuple[int, Any]] = {}
+        self._lock = threading.Lock()
+
+    # === Function to Get a Parsed (and Compiled) File ===
+    def load(
+            self,
+            path: Path,
+            compiler: Optional[Callable[[dict], Any]] = None
+    ) -> Any:
+        """
+        Returns the parsed content of a YAML file, re-parsing it only if it changed on disk.
+
+        Args:
+            path (Path): Path to the YAML file.
+            compiler (Callable, optional): Turns the parsed YAML into a ready-to-use object.
+                                           Runs once per parse; its result is what gets cached.
+
+        Returns:
+            Any: The parsed YAML data, or the compiler output if a compiler was given.
+        """
+        path = os.path.abspath(path)
+        key = (path, compiler)
+        mtime = os.stat(path).st_mtime_ns
+
+        ## === Fast path: unchanged file ===
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == mtime:
+            return entry[1]
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == mtime:
+                return entry[1]
+
+            data = yaml.safe_load(
+                Path(path).read_text(encoding = "utf-8")
+            )
+            value = compiler(data) if compiler else data
+            self._entries[key] = (mtime, value)
+
+            return value
+
+    # === Function to Drop Cached Entries ===
+    def clear(self) -> None:
+        """
+        Forgets every cached file (mainly useful in tests).
+        """
+        with self._lock:
+            self._entries.clear()
+
+# === Shared Registry Instance ===
+config_registry = ConfigRegistry()
+
+# === Function to Read a Section of the Pipeline Settings ===
+def get_settings(
+        section: str,
+        path: Path = Path("config/pipeline.yaml")
+) -> Dict[str, Any]:
+    """
+    Returns one section of the pipeline settings file through the shared registry.
+
+    Args:
+        section (str): Top-level key inside pipeline.yaml (e.g. "retriever").
+        path (Path, optional): Path to the pipeline.yaml file.
+
+    Returns:
+        Dict[str, Any]: The section, or an empty dict if it is not configured.
+    """
+    return (config_registry.load(path) or {}).get(section) or {}
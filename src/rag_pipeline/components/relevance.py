@@ -0,0 +1,84 @@
+# === Python Modules ===
+import re
+import numpy as np
+from typing import List, Optional
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[.'-][a-z0-9]+)*")
+STOPWORDS = frozenset(
+    "a an and are as at be been but by can could did do does for from had has have how i if in into is it its "
+    "me my of on or our please show so tell than that the their them then there these they this those to was "
+    "we were what when where which who why will with would you your about give list describe explain".split()
+)
+
+# === Function to Tokenize Text into Content Words ===
+def content_tokens(
+        text: str
+) -> List[str]:
+    return [
+        token for token in TOKEN_PATTERN.findall(text.lower())
+        if token not in STOPWORDS and len(token) > 1
+    ]
+
+# === Function to Score Lexical Overlap of Chunks with a Question ===
+def lexical_overlap(
+        question: str,
+        texts: List[str]
+) -> np.ndarray:
+    """
+    Fraction of the question's content words found in each text, weighted by
+    inverse document frequency over the given texts (rare words count more).
+
+    Returns:
+        np.ndarray: One score in [0, 1] per text.
+    """
+    q_tokens = sorted(set(content_tokens(question)))
+    if not q_tokens or not texts:
+        return np.zeros(len(texts), dtype = np.float32)
+
+    doc_tokens = [set(content_tokens(text)) for text in texts]
+    presence = np.array(
+        [[token in tokens for token in q_tokens] for tokens in doc_tokens],
+        dtype = np.float32
+    )
+
+    df = presence.sum(axis = 0)
+    idf = np.log1p(len(texts) / (1.0 + df)) + 1.0
+
+    return (presence @ idf) / idf.sum()
+
+# === Function to Combine Retrieval and Lexical Scores ===
+def local_relevance(
+        question: str,
+        texts: List[str],
+        retrieval_scores: List[Optional[float]],
+        lexical_weight: float = 0.3
+) -> np.ndarray:
+    """
+    Relevance = (1 - w) * retrieval cosine similarity + w * lexical overlap.
+    Texts without a retrieval score get NaN (cannot be decided locally).
+
+    Returns:
+        np.ndarray: One score per text.
+    """
+    lexical = lexical_overlap(question, texts)
+    retrieval = np.array(
+        [np.nan if score is None else score for score in retrieval_scores],
+        dtype = np.float32
+    )
+
+    return (1.0 - lexical_weight) * retrieval + lexical_weight * lexical
+
+# === Function to Split Chunks into Accepted / Rejected / Borderline ===
+def classify_relevance(
+        scores: np.ndarray,
+        accept_threshold: float,
+        reject_threshold: float
+) -> np.ndarray:
+    """
+    Returns 1 (relevant) for scores >= accept_threshold, 0 (irrelevant) for scores
+    <= reject_threshold, and -1 (borderline, NaN included) otherwise.
+    """
+    decisions = np.full(len(scores), -1, dtype = np.int8)
+    decisions[scores >= accept_threshold] = 1
+    decisions[scores <= reject_threshold] = 0
+    return decisions
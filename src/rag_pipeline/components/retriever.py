@@ -1,38 +1,43 @@
 # === Python Modules ===
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional
+from typing import Any, List, Dict, Tuple, Optional
 from langchain_community.vectorstores import FAISS
 from langchain_openai import OpenAIEmbeddings
+from langchain_core.embeddings import Embeddings
 from langchain.docstore.document import Document
 import os
+import json
+import uuid
+import shutil
+import threading
+from collections import OrderedDict
 
-# === Function to CREATE the FAISS Retriever ===
-def create_retriever(
+# === Components ===
+from rag_pipeline.components.registry import get_settings
+from rag_pipeline.components.embedding_cache import CachedEmbeddings, get_embedding_cache
+from rag_pipeline.components.bm25 import BM25Index, bm25_from_vectorstore
+from rag_pipeline.components.hybrid import HybridRetriever, similarity_from_distance
+from rag_pipeline.components.index_factory import build_vectorstore, configure_search
+
+MANIFEST_NAME = "manifest.json"
+
+# === Function to Convert Extracted Chunks into LangChain Documents ===
+def build_documents(
     texts: Optional[List[Dict[str, str]]] = None,
     tables: Optional[List[list]] = None,
-    session_id: str = None,
-    model_name: str = "text-embedding-3-small"
-) -> Tuple[FAISS, Path]:
+    source: Optional[str] = None
+) -> List[Document]:
     """
-    Creates a FAISS retriever index from extracted text (and optional table) chunks.
+    Converts extracted text chunks and tables into LangChain documents.
 
     Args:
         texts (List[Dict[str, str]], optional): Text chunks with metadata from extraction pipeline.
         tables (List[list], optional): Extracted tables (if any).
-        save_path (Path): Directory path to save FAISS index.
-        model_name (str): Embedding model name.
+        source (str, optional): File the tables came from, recorded in their metadata.
 
     Returns:
-        Tuple[FAISS, Path]: The retriever object and the path where it's saved.
+        List[Document]: Documents ready to be embedded.
     """
-    if not texts and not tables:
-        raise ValueError("❌ No texts or tables provided. Please extract data first.")
-    
-    # === Data Directory ===
-    DIR = Path("models")
-    file_path = DIR / session_id
-
-    # === Convert text data into LangChain Documents ===
     docs = []
 
     # === Add text chunks ===
@@ -49,32 +54,332 @@ def create_retriever(
     if tables:
         for idx, table in enumerate(tables, start = 1):
             table_text = "\n".join([", ".join(map(str, row)) for row in table])
+            metadata = {
+                "type": "table",
+                "table_id": idx
+            }
+            if source:
+                metadata["source"] = source
+
             docs.append(Document(
                 page_content = table_text,
-                metadata = {
-                    "type": "table",
-                    "table_id": idx
-                }
+                metadata = metadata
             ))
 
-    print(f"📚 Preparing {len(docs)} documents for indexing...")
+    return docs
+
+# === Function to Name the Embedding Cache of an Embedder ===
+def embedding_cache_name(
+    embeddings: Embeddings
+) -> str:
+    """
+    Identifies the embedder whose vectors a cache holds: model and output dimension,
+    prefixed with the class for anything but OpenAIEmbeddings (whose caches keep the
+    plain model name, e.g. "text-embedding-3-small").
+    """
+    model = getattr(embeddings, "model", None) or getattr(embeddings, "model_name", None)
+    dim = getattr(embeddings, "dimensions", None) or getattr(embeddings, "size", None)
+
+    name = str(model) if model else type(embeddings).__name__
+    if not isinstance(embeddings, OpenAIEmbeddings) and model:
+        name = f"{type(embeddings).__name__}-{name}"
+    return f"{name}-{dim}d" if dim else name
 
+# === Function to Get the Ingestion Embedding Model ===
+def get_ingestion_embeddings(
+    model_name: str = "text-embedding-3-small",
+    embeddings: Optional[Embeddings] = None
+) -> Embeddings:
+    """
+    Returns the embedding model used to index documents, wrapped in the
+    content-hash embedding cache when it is enabled in pipeline.yaml. The cache is
+    keyed by the embedder actually used (see `embedding_cache_name`), so an injected
+    model never shares vectors with another one.
+
+    Args:
+        model_name (str): Embedding model name.
+        embeddings (Embeddings, optional): Embedding model to use instead of OpenAIEmbeddings(model_name).
+
+    Returns:
+        Embeddings: The (possibly cached) embedding model.
+    """
     # === Initialize embeddings ===
-    embeddings = OpenAIEmbeddings(
-        model = model_name
+    if embeddings is None:
+        embeddings = OpenAIEmbeddings(
+            model = model_name
+        )
+
+    # === Only embed chunks that are not in the embedding cache ===
+    cache_settings = get_settings("embedding_cache")
+    if cache_settings.get("enabled", False):
+        embeddings = CachedEmbeddings(
+            embeddings = embeddings,
+            cache = get_embedding_cache(
+                cache_dir = Path(cache_settings.get("cache_dir", "models/.embedding_cache")),
+                model_name = embedding_cache_name(embeddings)
+            )
+        )
+
+    return embeddings
+
+# === Function to Log the Embedding Cache Hit Ratio of an Upload ===
+def report_embedding_cache(
+    embeddings: Embeddings
+) -> None:
+    if isinstance(embeddings, CachedEmbeddings):
+        total = embeddings.stats["hits"] + embeddings.stats["misses"]
+        print(
+            f"🧠 Embedding cache: {embeddings.stats['hits']}/{total} chunks reused "
+            f"(hit ratio {embeddings.hit_ratio():.1%})."
+        )
+
+# === Function to Build the Sparse Index of a FAISS Index ===
+def build_bm25(
+    db: FAISS
+) -> Optional[BM25Index]:
+    """
+    Builds the BM25 index over the same chunks as `db` when hybrid retrieval is enabled.
+    """
+    settings = get_settings("retriever")
+    if settings.get("mode", "hybrid") != "hybrid":
+        return None
+
+    bm25_settings = settings.get("bm25") or {}
+    return bm25_from_vectorstore(
+        db,
+        k1 = bm25_settings.get("k1", 1.5),
+        b = bm25_settings.get("b", 0.75)
+    )
+
+# === Function to Wrap a FAISS Index as a Retriever ===
+def as_session_retriever(
+    db: FAISS,
+    bm25: Optional[BM25Index] = None,
+    top_k: Optional[int] = None
+):
+    """
+    Returns the retriever used by the query pipeline for a FAISS index:
+    dense + BM25 with reciprocal rank fusion when a BM25 index is given and
+    `retriever.mode` is "hybrid", otherwise the plain FAISS retriever.
+    """
+    settings = get_settings("retriever")
+    top_k = top_k or settings.get("top_k", 5)
+    configure_search(getattr(db, "index", None))
+
+    if bm25 is not None and settings.get("mode", "hybrid") == "hybrid":
+        return HybridRetriever(
+            vectorstore = db,
+            bm25 = bm25,
+            search_kwargs = {"k": top_k},
+            fetch_k = settings.get("fetch_k", 20),
+            rrf_k = settings.get("rrf_k", 60)
+        )
+
+    return db.as_retriever(
+        search_kwargs = {"k": top_k}
     )
 
-    # === Build FAISS index ===
-    db = FAISS.from_documents(docs, embeddings)
+# === Functions to Search a Session Retriever with a Precomputed Vector ===
+def supports_vector_search(
+    retriever: Any
+) -> bool:
+    """
+    True for plain similarity retrievers over a vector store with an embedding model.
+    """
+    vectorstore = getattr(retriever, "vectorstore", None)
+    return (
+        getattr(vectorstore, "embeddings", None) is not None
+        and getattr(retriever, "search_type", None) == "similarity"
+    )
 
-    # === Ensure folder exists ===
-    os.makedirs(file_path, exist_ok=True)
+_query_vectors: "OrderedDict[Tuple[int, str], Tuple[Embeddings, List[float]]]" = OrderedDict()
+_query_vectors_lock = threading.Lock()
+QUERY_VECTOR_CACHE_SIZE = 1024
 
-    # === Save the FAISS index ===
-    db.save_local(str(file_path))
+async def embed_query(
+    retriever: Any,
+    query: str
+) -> List[float]:
+    """
+    Embeds a query with the retriever's model, memoizing recent queries so the
+    answer cache, speculative retrieval and the retriever share one embedding call.
+    """
+    embeddings = retriever.vectorstore.embeddings
+    key = (id(embeddings), query)
+
+    with _query_vectors_lock:
+        cached = _query_vectors.get(key)
+        if cached is not None and cached[0] is embeddings:
+            _query_vectors.move_to_end(key)
+            return cached[1]
+
+    vector = await embeddings.aembed_query(query)
+
+    with _query_vectors_lock:
+        _query_vectors[key] = (embeddings, vector)
+        while len(_query_vectors) > QUERY_VECTOR_CACHE_SIZE:
+            _query_vectors.popitem(last = False)
+
+    return vector
+
+async def search_by_vector(
+    retriever: Any,
+    vector: List[float],
+    query: Optional[str] = None
+) -> List[Document]:
+    """
+    Same result as `retriever.ainvoke(query)` when `vector` is the query embedding
+    (hybrid retrievers also need the query text for BM25).
+    Each returned document is a copy carrying its cosine similarity in
+    `metadata["retrieval_score"]` (used by the local grading mode).
+    """
+    if isinstance(retriever, HybridRetriever) and query is not None:
+        return await retriever.asearch_with_vector(query, vector)
+
+    results = await retriever.vectorstore.asimilarity_search_with_score_by_vector(
+        vector,
+        **retriever.search_kwargs
+    )
+
+    return [
+        Document(
+            id = doc.id,
+            page_content = doc.page_content,
+            metadata = {
+                **doc.metadata,
+                "retrieval_score": round(similarity_from_distance(retriever.vectorstore, distance), 6)
+            }
+        )
+        for doc, distance in results
+    ]
+
+# === Function to Swap in a Fully Written Index Folder ===
+def replace_dir_atomically(
+        tmp_dir: Path,
+        final_dir: Path
+) -> None:
+    """
+    Publishes `tmp_dir` as `final_dir`. `final_dir` is a symlink to a versioned
+    folder (`.<name>.v-<id>`) and the new version is swapped in by replacing the
+    link in one rename, so readers that resolve `final_dir` find either the
+    previous or the new complete folder. The previous version is removed afterwards.
+
+    A plain folder left by earlier versions is moved aside once (readers can miss
+    the index for that one rename); where symlinks are unavailable the two-rename
+    swap is used every time.
+    """
+    version_dir = final_dir.with_name(f".{final_dir.name}.v-{uuid.uuid4().hex[:8]}")
+    link_tmp = final_dir.with_name(f".{final_dir.name}.link-{uuid.uuid4().hex[:8]}")
+    os.replace(tmp_dir, version_dir)
+
+    try:
+        os.symlink(version_dir.name, link_tmp, target_is_directory = True)
+    except (OSError, NotImplementedError):
+        link_tmp = None
+
+    previous = None
+    if final_dir.is_symlink():
+        previous = final_dir.resolve()
+    elif final_dir.exists():
+        previous = final_dir.with_name(f".{final_dir.name}.old-{uuid.uuid4().hex[:8]}")
+        os.replace(final_dir, previous)
+
+    os.replace(link_tmp if link_tmp is not None else version_dir, final_dir)
+    if previous is not None:
+        shutil.rmtree(previous, ignore_errors = True)
+
+# === Function to Persist a Session Index Folder ===
+def save_session_index(
+    db: FAISS,
+    bm25: Optional[BM25Index],
+    index_dir: Path,
+    manifest: Dict[str, Any]
+) -> Path:
+    """
+    Writes the FAISS index, the BM25 index and the file manifest to a temporary
+    folder next to `index_dir`, then publishes it with `replace_dir_atomically`.
+
+    Returns:
+        Path: `index_dir`.
+    """
+    index_dir = Path(index_dir)
+    index_dir.parent.mkdir(parents = True, exist_ok = True)
+    tmp_dir = index_dir.with_name(f".{index_dir.name}.tmp-{uuid.uuid4().hex[:8]}")
+
+    db.save_local(str(tmp_dir))
+    if bm25 is not None:
+        bm25.save(tmp_dir)
+    (tmp_dir / MANIFEST_NAME).write_text(
+        json.dumps(manifest, indent = 2, default = str),
+        encoding = "utf-8"
+    )
+    replace_dir_atomically(
+        tmp_dir = tmp_dir,
+        final_dir = index_dir
+    )
+    return index_dir
+
+# === Function to CREATE the FAISS Retriever ===
+def create_retriever(
+    texts: Optional[List[Dict[str, str]]] = None,
+    tables: Optional[List[list]] = None,
+    session_id: str = None,
+    model_name: str = "text-embedding-3-small",
+    embeddings: Optional[Embeddings] = None,
+    base_dir: Path = Path("models")
+) -> Tuple[FAISS, Path]:
+    """
+    Creates a FAISS retriever index from extracted text (and optional table) chunks.
+    The index is published like the indexer's (versioned folder behind a symlink)
+    with an empty file manifest, so the next incremental update re-indexes the
+    session folder instead of trusting chunks it cannot attribute to files.
+
+    Args:
+        texts (List[Dict[str, str]], optional): Text chunks with metadata from extraction pipeline.
+        tables (List[list], optional): Extracted tables (if any).
+        session_id (str): Session identifier (index folder name).
+        model_name (str): Embedding model name.
+        embeddings (Embeddings, optional): Embedding model to use instead of OpenAIEmbeddings(model_name).
+        base_dir (Path): Folder holding one index folder per session.
+
+    Returns:
+        Tuple[FAISS, Path]: The retriever object and the path where it's saved.
+    """
+    if not texts and not tables:
+        raise ValueError("❌ No texts or tables provided. Please extract data first.")
+    
+    # === Data Directory ===
+    file_path = Path(base_dir) / session_id
+
+    # === Convert text data into LangChain Documents ===
+    docs = build_documents(
+        texts = texts,
+        tables = tables
+    )
+
+    print(f"📚 Preparing {len(docs)} documents for indexing...")
+
+    # === Initialize embeddings ===
+    embeddings = get_ingestion_embeddings(
+        model_name = model_name,
+        embeddings = embeddings
+    )
+
+    # === Build FAISS index (flat / HNSW / IVF by corpus size, see `retriever.index`) ===
+    db = build_vectorstore(docs, embeddings)
+    report_embedding_cache(embeddings)
+
+    # === Save the FAISS and BM25 indexes, then swap them in atomically ===
+    bm25 = build_bm25(db)
+    save_session_index(
+        db = db,
+        bm25 = bm25,
+        index_dir = file_path,
+        manifest = {"version": 1, "files": {}}
+    )
     print(f"✅ Retriever (FAISS index) created and saved at: {file_path}")
 
     # === Create the retriever object ===
-    retriever = db.as_retriever(search_kwargs={"k": 5})
+    retriever = as_session_retriever(db, bm25)
 
-    return retriever, file_path
\ No newline at end of file
+    return retriever, file_path
@@ -0,0 +1,354 @@
+# === Python Modules ===
+import time
+import asyncio
+import threading
+from pathlib import Path
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+from langchain_core.embeddings import Embeddings
+
+# === Components ===
+from rag_pipeline.components.registry import get_settings
+from rag_pipeline.components.bm25 import BM25Index
+from rag_pipeline.components.retriever import as_session_retriever, build_bm25
+from rag_pipeline.components.index_factory import MappedFAISS, index_bytes, load_vectorstore
+from rag_pipeline.components.shared_store import (
+    SessionVectorStore,
+    SharedVectorStore,
+    get_shared_store,
+    shared_store_enabled
+)
+
+# === Function to Estimate the Resident Size of a Retriever ===
+def estimate_retriever_bytes(
+        retriever: Any
+) -> int:
+    """
+    Estimates the heap held by a retriever: the FAISS index (codes, graph, centroids;
+    nothing for memory-mapped indexes, which live in the page cache), stored page text
+    and the BM25 arrays.
+
+    Args:
+        retriever: A LangChain retriever (or anything exposing a FAISS `vectorstore`).
+
+    Returns:
+        int: Estimated size in bytes (0 if the retriever has no FAISS vectorstore).
+    """
+    vectorstore = getattr(retriever, "vectorstore", None)
+    index = getattr(vectorstore, "index", None)
+    if isinstance(vectorstore, SessionVectorStore):
+        size = vectorstore.nbytes
+    elif index is None:
+        return 0
+    else:
+        size = 0 if isinstance(vectorstore, MappedFAISS) else index_bytes(index)
+        docstore = getattr(vectorstore.docstore, "_dict", {})
+        size += sum(len(doc.page_content) for doc in docstore.values())
+
+    bm25 = getattr(retriever, "bm25", None)
+    if bm25 is not None:
+        size += bm25.nbytes
+
+    return size
+
+# === LRU Manager of Session Retrievers ===
+class RetrieverManager:
+    def __init__(
+            self,
+            base_dir: Path = Path("models"),
+            max_entries: Optional[int] = None,
+            max_bytes: Optional[int] = None,
+            top_k: Optional[int] = None,
+            embeddings_factory: Optional[Callable[[], Embeddings]] = None,
+            mmap: Optional[bool] = None,
+            shared_store: Optional[SharedVectorStore] = None
+    ):
+        """
+        Keeps a bounded LRU of resident session retrievers and restores missing ones
+        from `models/<session_id>`, memory-mapping their FAISS index read-only by default,
+        or from the shared multi-tenant store when `retriever.store` is "shared".
+
+        Args:
+            base_dir (Path): Folder holding one FAISS index folder per session.
+            max_entries (int, optional): Maximum number of resident sessions.
+            max_bytes (int, optional): Maximum estimated heap bytes of resident sessions.
+            top_k (int, optional): Number of documents returned by restored retrievers.
+            embeddings_factory (Callable, optional): Builds the query embedding model used by restored indexes.
+            mmap (bool, optional): Memory-map restored indexes (defaults to `retriever_cache.mmap`).
+            shared_store (SharedVectorStore, optional): Restore sessions from this shared store instead.
+        """
+        cache_settings = get_settings("retriever_cache")
+        retriever_settings = get_settings("retriever")
+
+        self.base_dir = Path(base_dir)
+        self.max_entries = max_entries or cache_settings.get("max_sessions", 64)
+        self.max_bytes = max_bytes or cache_settings.get("max_bytes", 2 * 1024 ** 3)
+        self.top_k = top_k or retriever_settings.get("top_k", 5)
+        self.embeddings_factory = embeddings_factory
+        self.mmap = cache_settings.get("mmap", True) if mmap is None else mmap
+        self.shared_store = shared_store or (get_shared_store() if shared_store_enabled() else None)
+        self._embeddings: Optional[Embeddings] = None
+
+        self._entries: "OrderedDict[str, tuple[Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self._load_locks: Dict[str, asyncio.Lock] = {}
+        self._load_waiters: Dict[str, int] = {}
+
+        self.counters: Dict[str, float] = {
+            "hits": 0,
+            "misses": 0,
+            "loads": 0,
+            "evictions": 0,
+            "load_time_ms_total": 0.0
+        }
+
+    # === Function to Build the Query Embedding Model Lazily ===
+    def _get_embeddings(self) -> Embeddings:
+        if self._embeddings is None:
+            if self.embeddings_factory is not None:
+                self._embeddings = self.embeddings_factory()
+            else:
+                from langchain_openai import OpenAIEmbeddings
+
+                self._embeddings = OpenAIEmbeddings(
+                    model = get_settings("retriever").get("embedding_model", "text-embedding-3-small")
+                )
+
+        return self._embeddings
+
+    # === Function to Check for a Persisted Index ===
+    def on_disk(
+            self,
+            session_id: str
+    ) -> bool:
+        """
+        Checks whether a FAISS index for the session exists under `base_dir`
+        (or whether the shared store holds chunks of the session).
+        """
+        if self.shared_store is not None:
+            return self.shared_store.has_session(session_id)
+        return (self.base_dir / session_id / "index.faiss").exists()
+
+    # === Function to Register a Retriever ===
+    def put(
+            self,
+            session_id: str,
+            retriever: Any,
+            replace: bool = True
+    ) -> Any:
+        """
+        Stores (or replaces) a resident retriever and evicts cold sessions if over budget.
+
+        Args:
+            session_id (str): Session identifier.
+            retriever: The retriever to keep resident.
+            replace (bool): Replace a retriever that is already resident. Loads from disk
+                            pass False so they never overwrite one published meanwhile.
+
+        Returns:
+            The resident retriever of the session.
+        """
+        size = estimate_retriever_bytes(retriever)
+
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is not None and not replace:
+                self._entries.move_to_end(session_id)
+                return entry[0]
+
+            self._discard(session_id)
+            self._entries[session_id] = (retriever, size)
+            self._bytes += size
+            self._evict_over_budget()
+            return retriever
+
+    # === Function to Drop a Resident Retriever ===
+    def evict(
+            self,
+            session_id: str
+    ) -> None:
+        """
+        Drops a session from memory (its on-disk index is kept).
+        """
+        with self._lock:
+            self._discard(session_id)
+
+    def _discard(
+            self,
+            session_id: str
+    ) -> None:
+        entry = self._entries.pop(session_id, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    def _evict_over_budget(self) -> None:
+        ## === Keep the most recently used session even if it alone exceeds the budget ===
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            cold_session, (_, size) = self._entries.popitem(last = False)
+            self._bytes -= size
+            self.counters["evictions"] += 1
+            print(f"♻️ Evicted retriever for session '{cold_session}' from memory.")
+
+    # === Function to Get a Resident Retriever ===
+    def get_resident(
+            self,
+            session_id: str
+    ) -> Any | None:
+        """
+        Returns the resident retriever (marking it as recently used), or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                return None
+
+            self._entries.move_to_end(session_id)
+            return entry[0]
+
+    # === Function to Restore a Retriever from Disk ===
+    def load(
+            self,
+            session_id: str
+    ) -> Any:
+        """
+        Loads the session's FAISS index from disk and makes it resident.
+
+        Raises:
+            KeyError: If no index exists for the session.
+        """
+        if not self.on_disk(session_id):
+            raise KeyError(f"No index found for session '{session_id}'.")
+
+        start = time.perf_counter()
+        if self.shared_store is not None:
+            db = self.shared_store.session(session_id, self._get_embeddings())
+            bm25 = build_bm25(db)
+        else:
+            db, bm25 = self._load_index_dir(session_id)
+
+        retriever = as_session_retriever(
+            db,
+            bm25 = bm25,
+            top_k = self.top_k
+        )
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        self.counters["loads"] += 1
+        self.counters["load_time_ms_total"] += elapsed_ms
+        print(f"📦 Restored retriever for session '{session_id}' in {elapsed_ms:.1f} ms.")
+
+        ## === An ingestion may have published a newer retriever while this one loaded ===
+        return self.put(session_id, retriever, replace = False)
+
+    def _load_index_dir(
+            self,
+            session_id: str,
+            attempts: int = 2
+    ) -> Tuple[Any, Optional[BM25Index]]:
+        """
+        Reads the index and BM25 files from one resolved version of the session folder
+        (the indexer swaps versions in behind a symlink), retrying if that version is
+        removed by a concurrent update while it is being read.
+        """
+        for attempt in range(attempts):
+            index_dir = (self.base_dir / session_id).resolve()
+            try:
+                db = load_vectorstore(index_dir, self._get_embeddings(), mmap = self.mmap)
+                return db, BM25Index.load(index_dir)
+            except (FileNotFoundError, RuntimeError):
+                if attempt == attempts - 1 or not self.on_disk(session_id):
+                    raise
+        raise KeyError(f"No index found for session '{session_id}'.")
+
+    # === Function to Get a Retriever (sync) ===
+    def get(
+            self,
+            session_id: str
+    ) -> Any:
+        """
+        Returns the session retriever, restoring it from disk on a cache miss.
+
+        Raises:
+            KeyError: If the session is neither resident nor persisted.
+        """
+        retriever = self.get_resident(session_id)
+        if retriever is not None:
+            self.counters["hits"] += 1
+            return retriever
+
+        self.counters["misses"] += 1
+        return self.load(session_id)
+
+    # === Function to Get a Retriever (async) ===
+    async def aget(
+            self,
+            session_id: str
+    ) -> Any:
+        """
+        Async variant of `get`: disk loads run in a worker thread and concurrent
+        requests for the same cold session share a single load.
+
+        Raises:
+            KeyError: If the session is neither resident nor persisted.
+        """
+        retriever = self.get_resident(session_id)
+        if retriever is not None:
+            self.counters["hits"] += 1
+            return retriever
+
+        self.counters["misses"] += 1
+        # === One lock per cold session, dropped once its last waiter leaves ===
+        lock = self._load_locks.setdefault(session_id, asyncio.Lock())
+        self._load_waiters[session_id] = self._load_waiters.get(session_id, 0) + 1
+        try:
+            async with lock:
+                retriever = self.get_resident(session_id)
+                if retriever is None:
+                    retriever = await asyncio.to_thread(self.load, session_id)
+        finally:
+            self._load_waiters[session_id] -= 1
+            if not self._load_waiters[session_id]:
+                del self._load_waiters[session_id]
+                del self._load_locks[session_id]
+
+        return retriever
+
+    # === Function to Report Counters ===
+    def stats(self) -> Dict[str, float]:
+        """
+        Returns hit/miss/load counters and the current residency.
+        """
+        lookups = self.counters["hits"] + self.counters["misses"]
+        return {
+            **self.counters,
+            "hit_rate": round(self.counters["hits"] / lookups, 4) if lookups else 0.0,
+            "avg_load_time_ms": (
+                round(self.counters["load_time_ms_total"] / self.counters["loads"], 2)
+                if self.counters["loads"] else 0.0
+            ),
+            "resident_sessions": len(self._entries),
+            "resident_bytes": self._bytes
+        }
+
+    # === Mapping-style Access ===
+    def __getitem__(
+            self,
+            session_id: str
+    ) -> Any:
+        return self.get(session_id)
+
+    def __setitem__(
+            self,
+            session_id: str,
+            retriever: Any
+    ) -> None:
+        self.put(session_id, retriever)
+
+    def __contains__(
+            self,
+            session_id: str
+    ) -> bool:
+        return session_id in self._entries or self.on_disk(session_id)
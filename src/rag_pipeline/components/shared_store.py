@@ -0,0 +1,425 @@
+# === Python Modules ===
+import os
+import json
+import sqlite3
+import asyncio
+import threading
+import numpy as np
+from pathlib import Path
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+from langchain_community.vectorstores.utils import DistanceStrategy
+
+# === Components ===
+from rag_pipeline.components.registry import get_settings
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS chunks (
+    session_id TEXT NOT NULL,
+    chunk_id TEXT NOT NULL,
+    row INTEGER NOT NULL,
+    content TEXT NOT NULL,
+    metadata TEXT NOT NULL,
+    PRIMARY KEY (session_id, chunk_id)
+);
+CREATE INDEX IF NOT EXISTS chunks_by_session ON chunks (session_id, row);
+CREATE TABLE IF NOT EXISTS manifests (session_id TEXT PRIMARY KEY, manifest TEXT NOT NULL);
+"""
+
+# === Function to Check Which Store Holds Session Vectors ===
+def shared_store_enabled() -> bool:
+    return get_settings("retriever").get("store", "per_session") == "shared"
+
+# === One Vector Store Shared by All Sessions ===
+class SharedVectorStore:
+    def __init__(
+            self,
+            path: Path
+    ):
+        """
+        Vectors of every session in one append-only matrix, partitioned by session.
+
+        Layout of `path`:
+            vectors.f32  - row-major float32 matrix of all chunks, memory-mapped for reads
+            catalog.db   - SQLite: chunk rows, text and metadata per session, plus the
+                           file manifest of each session (what `manifest.json` holds
+                           for per-session indexes)
+
+        A session's rows are mostly contiguous (each upload appends a block), so a
+        session search is a brute-force scan of a few matrix slices: its cost depends
+        on the session's size, not on the number of sessions. Removed chunks leave
+        dead rows behind until `compact` rewrites the matrix.
+
+        Args:
+            path (Path): Folder of the store.
+        """
+        self.path = Path(path)
+        self.path.mkdir(parents = True, exist_ok = True)
+        self.vectors_path = self.path / "vectors.f32"
+
+        self._db = sqlite3.connect(self.path / "catalog.db", check_same_thread = False)
+        self._db.executescript(SCHEMA)
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.execute("PRAGMA synchronous = NORMAL")
+        self._lock = threading.RLock()
+
+        self.dim: Optional[int] = None
+        self._read_dim()
+        self._mmap: Optional[np.memmap] = None
+
+    def _read_dim(self) -> None:
+        row = self._db.execute("SELECT value FROM meta WHERE key = 'dim'").fetchone()
+        if row:
+            self.dim = int(row[0])
+
+    # === Cross-process Append Lock ===
+    @contextmanager
+    def _file_lock(self):
+        with open(self.path / ".lock", "w") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @property
+    def n_rows(self) -> int:
+        if self.dim is None or not self.vectors_path.exists():
+            return 0
+        return self.vectors_path.stat().st_size // (self.dim * 4)
+
+    # === Function to Get the (Memory-mapped) Matrix ===
+    def matrix(
+            self,
+            min_rows: int = 0
+    ) -> np.memmap:
+        """
+        Returns the vector matrix, re-mapping it if rows were appended since the last call.
+        """
+        with self._lock:
+            if self._mmap is None or self._mmap.shape[0] < max(min_rows, 1):
+                if self.dim is None:
+                    self._read_dim()
+                rows = self.n_rows
+                self._mmap = np.memmap(
+                    self.vectors_path,
+                    dtype = np.float32,
+                    mode = "r",
+                    shape = (rows, self.dim)
+                ) if rows else np.empty((0, self.dim or 0), dtype = np.float32)
+            return self._mmap
+
+    # === Function to Apply an Update of a Session ===
+    def update_session(
+            self,
+            session_id: str,
+            documents: List[Document],
+            ids: List[str],
+            vectors: np.ndarray,
+            remove_ids: Iterable[str] = (),
+            manifest: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Appends new chunks of a session, removes stale ones and stores its manifest.
+        New vectors are written first and the catalog changes in one transaction, so
+        readers see either the previous or the updated session.
+
+        Args:
+            session_id (str): Session identifier.
+            documents (List[Document]): New chunks.
+            ids (List[str]): Chunk ids of the new chunks.
+            vectors (np.ndarray): Embeddings of the new chunks, one row each.
+            remove_ids (Iterable[str]): Chunk ids to remove.
+            manifest (Dict[str, Any], optional): File manifest of the session after the update.
+        """
+        vectors = np.ascontiguousarray(vectors, dtype = np.float32)
+
+        with self._lock, self._file_lock():
+            ## === Another instance (worker) may have written since this one was opened ===
+            self._read_dim()
+            if len(documents):
+                if self.dim is None:
+                    self.dim = int(vectors.shape[1])
+                    self._db.execute("INSERT OR REPLACE INTO meta VALUES ('dim', ?)", (str(self.dim),))
+                elif vectors.shape[1] != self.dim:
+                    raise ValueError(f"❌ Embedding dim {vectors.shape[1]} does not match store dim {self.dim}.")
+
+            start = self.n_rows
+            if self.dim is not None and self.vectors_path.exists() \
+                    and self.vectors_path.stat().st_size != start * self.dim * 4:
+                ## === A torn earlier append: new rows must start on a row boundary ===
+                print("⚠️ Shared vector store: dropping an incomplete append.")
+                os.truncate(self.vectors_path, start * self.dim * 4)
+
+            if len(documents):
+                with open(self.vectors_path, "ab") as f:
+                    f.write(vectors.tobytes())
+
+            with self._db:
+                self._db.executemany(
+                    "DELETE FROM chunks WHERE session_id = ? AND chunk_id = ?",
+                    [(session_id, chunk_id) for chunk_id in remove_ids]
+                )
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO chunks VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (session_id, chunk_id, start + i, doc.page_content, json.dumps(doc.metadata, default = str))
+                        for i, (chunk_id, doc) in enumerate(zip(ids, documents))
+                    ]
+                )
+                if manifest is not None:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO manifests VALUES (?, ?)",
+                        (session_id, json.dumps(manifest, default = str))
+                    )
+
+    # === Function to Remove a Session ===
+    def delete_session(
+            self,
+            session_id: str
+    ) -> None:
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM chunks WHERE session_id = ?", (session_id,))
+            self._db.execute("DELETE FROM manifests WHERE session_id = ?", (session_id,))
+
+    # === Function to Read the Session Manifest ===
+    def load_manifest(
+            self,
+            session_id: str
+    ) -> Dict[str, Any]:
+        with self._lock:
+            row = self._db.execute("SELECT manifest FROM manifests WHERE session_id = ?", (session_id,)).fetchone()
+        return json.loads(row[0]) if row else {"version": 1, "files": {}}
+
+    def has_session(
+            self,
+            session_id: str
+    ) -> bool:
+        with self._lock:
+            return self._db.execute(
+                "SELECT 1 FROM chunks WHERE session_id = ? LIMIT 1", (session_id,)
+            ).fetchone() is not None
+
+    # === Function to Open a Session-scoped View ===
+    def session(
+            self,
+            session_id: str,
+            embeddings: Embeddings
+    ) -> "SessionVectorStore":
+        with self._lock:
+            records = self._db.execute(
+                "SELECT chunk_id, row, content, metadata FROM chunks WHERE session_id = ? ORDER BY row",
+                (session_id,)
+            ).fetchall()
+
+        if not records:
+            raise KeyError(f"No chunks stored for session '{session_id}'.")
+
+        return SessionVectorStore(
+            store = self,
+            session_id = session_id,
+            embeddings = embeddings,
+            rows = np.fromiter((r[1] for r in records), dtype = np.int64, count = len(records)),
+            records = [(chunk_id, content, metadata) for chunk_id, _, content, metadata in records]
+        )
+
+    # === Function to Drop Dead Rows ===
+    def compact(self) -> int:
+        """
+        Rewrites the matrix without rows of removed chunks. Row numbers change, so
+        run it while no server holds session views (e.g. during maintenance).
+
+        Returns:
+            int: Number of rows dropped.
+        """
+        with self._lock, self._file_lock():
+            live = self._db.execute("SELECT rowid, row FROM chunks ORDER BY row").fetchall()
+            n_rows = self.n_rows
+            if len(live) == n_rows:
+                return 0
+
+            matrix = self.matrix(n_rows)
+            tmp_path = self.vectors_path.with_suffix(".f32.tmp")
+            with open(tmp_path, "wb") as f:
+                for _, row in live:
+                    f.write(matrix[row].tobytes())
+
+            with self._db:
+                self._db.executemany(
+                    "UPDATE chunks SET row = ? WHERE rowid = ?",
+                    [(new_row, rowid) for new_row, (rowid, _) in enumerate(live)]
+                )
+                os.replace(tmp_path, self.vectors_path)
+            self._mmap = None
+
+        return n_rows - len(live)
+
+# === A Session's Partition of the Shared Store ===
+class SessionVectorStore(VectorStore):
+    """
+    Read view of one session in a SharedVectorStore with the parts of the LangChain
+    FAISS interface the pipeline uses (similarity search by vector, `docstore.search`,
+    `index_to_docstore_id`), so it can back the usual session retrievers.
+    Scores are squared L2 distances, as with the per-session FAISS indexes.
+    """
+    distance_strategy = DistanceStrategy.EUCLIDEAN_DISTANCE
+
+    def __init__(
+            self,
+            store: SharedVectorStore,
+            session_id: str,
+            embeddings: Embeddings,
+            rows: np.ndarray,
+            records: List[Tuple[str, str, str]]
+    ):
+        """
+        Args:
+            store (SharedVectorStore): Store holding the vectors.
+            session_id (str): Session of the view.
+            embeddings (Embeddings): Query embedding model.
+            rows (np.ndarray): Matrix row of each chunk, ascending.
+            records (List[Tuple[str, str, str]]): (chunk id, text, metadata JSON) per chunk, in row order.
+        """
+        self.store = store
+        self.session_id = session_id
+        self._embeddings = embeddings
+        self._records = records
+        self._documents: Dict[int, Document] = {}
+        self._positions = {chunk_id: i for i, (chunk_id, _, _) in enumerate(records)}
+        self.index_to_docstore_id = {i: chunk_id for i, (chunk_id, _, _) in enumerate(records)}
+        self.docstore = _SessionDocstore(self)
+
+        ## === Contiguous row ranges: (matrix start, matrix end, position of the first chunk) ===
+        breaks = np.flatnonzero(np.diff(rows) != 1) + 1
+        starts = np.concatenate([[0], breaks])
+        ends = np.concatenate([breaks, [len(rows)]])
+        self.segments: List[Tuple[int, int, int]] = [
+            (int(rows[s]), int(rows[e - 1]) + 1, int(s)) for s, e in zip(starts, ends)
+        ]
+        self.max_row = int(rows.max()) + 1
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self._embeddings
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Heap held by the view (text and row ranges); the vectors stay in the shared, mapped matrix.
+        """
+        return sum(len(content) + len(metadata) for _, content, metadata in self._records) + len(self.segments) * 24
+
+    # === Function to Get a Chunk (Documents are built on first use) ===
+    def document(
+            self,
+            position: int
+    ) -> Document:
+        document = self._documents.get(position)
+        if document is None:
+            chunk_id, content, metadata = self._records[position]
+            document = Document(id = chunk_id, page_content = content, metadata = json.loads(metadata))
+            self._documents[position] = document
+        return document
+
+    # === Search ===
+    def similarity_search_with_score_by_vector(
+            self,
+            embedding: List[float],
+            k: int = 4,
+            **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        query = np.asarray(embedding, dtype = np.float32)
+        matrix = self.store.matrix(self.max_row)
+
+        distances = np.concatenate([
+            ((matrix[start:end] - query) ** 2).sum(axis = 1)
+            for start, end, _ in self.segments
+        ])
+        k = min(k, len(distances))
+        top = np.argpartition(distances, k - 1)[:k] if k < len(distances) else np.arange(len(distances))
+        top = top[np.argsort(distances[top], kind = "stable")]
+
+        return [(self.document(int(i)), float(distances[i])) for i in top]
+
+    async def asimilarity_search_with_score_by_vector(
+            self,
+            embedding: List[float],
+            k: int = 4,
+            **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        return await asyncio.to_thread(self.similarity_search_with_score_by_vector, embedding, k)
+
+    def similarity_search_with_score(
+            self,
+            query: str,
+            k: int = 4,
+            **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        return self.similarity_search_with_score_by_vector(self._embeddings.embed_query(query), k)
+
+    def similarity_search(
+            self,
+            query: str,
+            k: int = 4,
+            **kwargs: Any
+    ) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k)]
+
+    def similarity_search_by_vector(
+            self,
+            embedding: List[float],
+            k: int = 4,
+            **kwargs: Any
+    ) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score_by_vector(embedding, k)]
+
+    def _select_relevance_score_fn(self) -> Callable[[float], float]:
+        return lambda distance: 1.0 - distance / 2.0
+
+    # === Writes go through the indexer ===
+    def add_texts(self, *args, **kwargs):
+        raise ValueError("❌ Session views of the shared store are read-only; update them through the indexer.")
+
+    @classmethod
+    def from_texts(cls, *args, **kwargs):
+        raise ValueError("❌ Session views are opened with SharedVectorStore.session(); update them through the indexer.")
+
+class _SessionDocstore:
+    def __init__(self, view: SessionVectorStore):
+        self._view = view
+
+    @property
+    def _dict(self) -> Dict[str, Document]:
+        return {chunk_id: self._view.document(i) for i, chunk_id in self._view.index_to_docstore_id.items()}
+
+    def search(self, search: str):
+        position = self._view._positions.get(search)
+        return f"ID {search} not found." if position is None else self._view.document(position)
+
+# === Process-wide Shared Store ===
+_stores: Dict[str, SharedVectorStore] = {}
+_stores_lock = threading.Lock()
+
+def get_shared_store(
+        path: Optional[Path] = None
+) -> SharedVectorStore:
+    """
+    Returns the process-wide shared store (defaults to `retriever.shared_store_dir`).
+    """
+    path = Path(path or get_settings("retriever").get("shared_store_dir", "models/_shared"))
+    key = os.path.abspath(path)
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = SharedVectorStore(path)
+        return _stores[key]
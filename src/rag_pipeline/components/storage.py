@@ -0,0 +1,144 @@
+# === Python Modules ===
+import os
+import uuid
+import hashlib
+import aiofiles
+from pathlib import Path
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from fastapi import UploadFile
+
+# === Components ===
+from rag_pipeline.components.registry import get_settings
+
+# === Raised When an Upload Exceeds a Byte Limit ===
+class UploadTooLarge(ValueError):
+    pass
+
+# === A File Streamed to Disk (not yet visible under its final name) ===
+@dataclass
+class StoredUpload:
+    file_name: str
+    path: Path
+    tmp_path: Path
+    size: int
+    sha256: str
+
+# === Per-request Byte Budget ===
+class UploadLimits:
+    def __init__(
+            self,
+            max_file_bytes: Optional[int] = None,
+            max_request_bytes: Optional[int] = None,
+            chunk_size: Optional[int] = None
+    ):
+        """
+        Byte limits of one upload request (defaults from the `uploads` section of pipeline.yaml).
+
+        Args:
+            max_file_bytes (int, optional): Largest accepted single file.
+            max_request_bytes (int, optional): Largest accepted total of all files of a request.
+            chunk_size (int, optional): Bytes read and written per step.
+        """
+        settings = get_settings("uploads")
+        self.max_file_bytes = max_file_bytes or settings.get("max_file_bytes", 200 * 1024 * 1024)
+        self.max_request_bytes = max_request_bytes or settings.get("max_request_bytes", 1024 * 1024 * 1024)
+        self.chunk_size = chunk_size or settings.get("chunk_size", 1024 * 1024)
+        self.used_bytes = 0
+
+    def consume(
+            self,
+            file_name: str,
+            file_bytes: int,
+            n_bytes: int
+    ) -> None:
+        """
+        Accounts `n_bytes` more of a file (already `file_bytes` long including them)
+        and raises UploadTooLarge as soon as a limit is crossed.
+        """
+        if file_bytes > self.max_file_bytes:
+            raise UploadTooLarge(
+                f"❌ '{file_name}' exceeds the per-file limit of {self.max_file_bytes} bytes."
+            )
+
+        self.used_bytes += n_bytes
+        if self.used_bytes > self.max_request_bytes:
+            raise UploadTooLarge(
+                f"❌ Upload exceeds the per-request limit of {self.max_request_bytes} bytes."
+            )
+
+# === Function to Stream One Upload to Disk ===
+async def stream_upload_to_disk(
+        file: UploadFile,
+        folder: Path,
+        limits: UploadLimits
+) -> StoredUpload:
+    """
+    Copies an upload into `folder` in fixed-size chunks, computing its SHA-256 on the way.
+    The data goes to a hidden `.part` file; call `commit_uploads` to publish it.
+    A partially written file is removed if a limit is crossed or the copy fails.
+
+    Args:
+        file (UploadFile): Incoming file.
+        folder (Path): Destination folder.
+        limits (UploadLimits): Byte limits shared by all files of the request.
+
+    Returns:
+        StoredUpload: Final and temporary paths, size and content hash.
+    """
+    ## === Never let a client-supplied name leave the folder ===
+    file_name = Path(file.filename or "").name
+    if not file_name:
+        raise ValueError("❌ Uploaded file has no name.")
+
+    ## === Reject early when the parser already knows the size ===
+    if file.size is not None and file.size > limits.max_file_bytes:
+        raise UploadTooLarge(
+            f"❌ '{file_name}' exceeds the per-file limit of {limits.max_file_bytes} bytes."
+        )
+
+    final_path = Path(folder) / file_name
+    tmp_path = Path(folder) / f".{file_name}.{uuid.uuid4().hex[:8]}.part"
+    digest = hashlib.sha256()
+    size = 0
+
+    try:
+        async with aiofiles.open(tmp_path, "wb") as f:
+            while chunk := await file.read(limits.chunk_size):
+                size += len(chunk)
+                limits.consume(file_name, size, len(chunk))
+                digest.update(chunk)
+                await f.write(chunk)
+
+    except BaseException:
+        tmp_path.unlink(missing_ok = True)
+        raise
+
+    return StoredUpload(
+        file_name = file_name,
+        path = final_path,
+        tmp_path = tmp_path,
+        size = size,
+        sha256 = digest.hexdigest()
+    )
+
+# === Functions to Publish or Drop Streamed Uploads ===
+def commit_uploads(
+        uploads: List[StoredUpload]
+) -> Dict[str, str]:
+    """
+    Renames every `.part` file to its final name (replacing older versions).
+
+    Returns:
+        Dict[str, str]: SHA-256 per file name, for the indexer.
+    """
+    for upload in uploads:
+        os.replace(upload.tmp_path, upload.path)
+
+    return {upload.file_name: upload.sha256 for upload in uploads}
+
+def discard_uploads(
+        uploads: List[StoredUpload]
+) -> None:
+    for upload in uploads:
+        upload.tmp_path.unlink(missing_ok = True)
@@ -1,33 +1,59 @@
 # === Python Modules ===
 from pathlib import Path
+from typing import List, Optional
 
 # === Utils ===
 from rag_pipeline.utils.extract_doc import (
     extract_from_pdf,
     extract_from_text_files
 )
+from rag_pipeline.utils.chunking import chunk_texts
+
+# === Components ===
+from rag_pipeline.components.registry import get_settings
 
 # === Function to extract data from documents ===
 def extract_data_pipeline(
-        session_folder: Path
+        session_folder: Path,
+        files: Optional[List[Path]] = None
 ) -> tuple[list, list, list]:
     """
     Extracts text, tables, and file-level metadata from PDF and text files in the 'data' folder.
+    If `files` is given, only those files are extracted. With `chunking.enabled` in
+    pipeline.yaml, pages and whole text files are then split to a token budget with overlap.
 
     Returns:
         texts (list[dict]): List of extracted text chunks with metadata (page/paragraph level).
         tables (list[list]): List of extracted tables from PDFs.
         file_metadata (list[dict]): List of file-level metadata for both PDFs and text files.
     """
+    chunking = get_settings("chunking").get("enabled", True)
+
     # === Extract from PDFs ===
-    pdf_texts, pdf_tables, pdf_meta = extract_from_pdf(folder_path = session_folder)
+    pdf_texts, pdf_tables, pdf_meta = extract_from_pdf(folder_path = session_folder, files = files)
 
     # === Extract from text files ===
-    txt_texts, txt_meta = extract_from_text_files(folder_path = session_folder)
+    txt_texts, txt_meta = extract_from_text_files(
+        folder_path = session_folder,
+        files = files,
+        merge_n = None if chunking else 2
+    )
 
     # === Combine all text chunks ===
     all_texts = (pdf_texts or []) + (txt_texts or [])
 
+    # === Split to the token budget ===
+    if chunking:
+        n_items = len(all_texts)
+        all_texts = chunk_texts(all_texts)
+        print(f"✂️ Split {n_items} pages/files into {len(all_texts)} token-budgeted chunks.")
+
+        for file_info in txt_meta or []:
+            file_info["total_chunks"] = sum(
+                1 for item in all_texts
+                if item["metadata"]["source"] == file_info["file_name"]
+            )
+
     # === Combine file metadata ===
     all_file_meta = (pdf_meta or []) + (txt_meta or [])
 
@@ -19,4 +19,22 @@ def no_relevant_docs(
     if proceed:
         return "generate_answer"
     else:
-        return "fallback"
\ No newline at end of file
+        return "fallback"
+
+## === Answer Found in the Cache ===
+def answer_cache_hit(
+        state: AgentState
+) -> str:
+    """
+    Route after the answer cache lookup.
+
+    Args:
+        state (AgentState): The current state of the agent.
+
+    Returns:
+        str: "cache_hit" to go straight to the final answer, otherwise "retrieve".
+    """
+    if state.get("answer_cache_hit", False):
+        return "cache_hit"
+    else:
+        return "retrieve"
\ No newline at end of file
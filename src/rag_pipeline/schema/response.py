@@ -1,6 +1,7 @@
 # === Python Modules ===
 from pydantic import BaseModel
-from typing import Literal
+from typing import Literal, List
+from datetime import datetime
 
 ## === Response Model for File Upload ===
 class UploadResponse(BaseModel):
@@ -8,10 +9,31 @@ class UploadResponse(BaseModel):
     session_id: str | None = None
     saved_path: str | None = None
     uploaded_file: str | None = None
+    job_id: str | None = None
     message: str
 
+## === Progress of a Single Ingestion Stage ===
+class IngestionStage(BaseModel):
+    name: str
+    status: Literal["pending", "running", "completed", "failed"] = "pending"
+    progress: float = 0.0
+    started_at: datetime | None = None
+    duration_s: float | None = None
+
+## === Response Model for Upload Job Status ===
+class UploadStatusResponse(BaseModel):
+    status: Literal["success", "failure"] = "failure"
+    job_id: str | None = None
+    session_id: str | None = None
+    job_status: Literal["queued", "running", "completed", "failed"] | None = None
+    stages: List[IngestionStage] = []
+    created_at: datetime | None = None
+    error: str | None = None
+    message: str | None = None
+
 ## === Response Model for User Query ===
 class UserQueryResponse(BaseModel):
-    status: Literal["success", "failure"] = "failure"
+    status: Literal["success", "failure", "not_ready"] = "failure"
     session_id: str | None = None
-    answer: str | None = None
\ No newline at end of file
+    answer: str | None = None
+    message: str | None = None
\ No newline at end of file
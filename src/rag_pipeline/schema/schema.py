@@ -1,6 +1,6 @@
 # === Python Modules ===
 from pydantic import BaseModel, Field
-from typing import Literal
+from typing import Literal, List
 
 # === Query Rewriter Schema ===
 class QueryRewrite(BaseModel):
@@ -19,6 +19,26 @@ class DocGrader(BaseModel):
         description = "Document is relevant to the question? If yes -> 'Yes' if not -> 'No'"
     )
 
+class GradedChunk(BaseModel):
+    """
+    Relevance verdict for a single chunk inside a batched grading request.
+    """
+    index: int = Field(
+        description = "Index of the chunk exactly as shown in the prompt, e.g. [0] -> 0."
+    )
+
+    score: Literal["Yes", "No"] = Field(
+        description = "Chunk is relevant to the question? If yes -> 'Yes' if not -> 'No'"
+    )
+
+class DocGraderBatch(BaseModel):
+    """
+    Schema for the output of the batched document grader (one verdict per chunk).
+    """
+    grades: List[GradedChunk] = Field(
+        description = "One verdict per chunk, covering every chunk index exactly once."
+    )
+
 class AnswerGeneration(BaseModel):
     """
     Schema for the output of the answer generation agent.
@@ -0,0 +1,256 @@
+# === Python Modules ===
+import re
+import math
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# === Components ===
+from rag_pipeline.components.registry import get_settings
+
+PARAGRAPH_BREAK = re.compile(r"\n[ \t]*\n\s*")
+SENTENCE_BREAK = re.compile(r"(?<=[.!?;:])\s+")
+WORD = re.compile(r"\S+")
+
+TokenCounter = Callable[[List[str]], List[int]]
+
+# === Function to Get a Batch Token Counter ===
+def get_token_counter(
+        encoding_name: str = "cl100k_base"
+) -> TokenCounter:
+    """
+    Returns a function counting the tokens of a batch of texts with tiktoken.
+    If the encoding cannot be loaded (e.g. no network to fetch it), falls back to
+    an estimate of one token per 4 characters.
+    """
+    return _load_token_counter(encoding_name)
+
+@lru_cache(maxsize = None)
+def _load_token_counter(
+        encoding_name: str
+) -> TokenCounter:
+    try:
+        import tiktoken
+        encoding = tiktoken.get_encoding(encoding_name)
+        return lambda texts: [len(tokens) for tokens in encoding.encode_ordinary_batch(texts)]
+
+    except Exception as e:
+        print(f"⚠️ Tokenizer '{encoding_name}' unavailable ({type(e).__name__}), estimating 4 characters per token.")
+        return estimate_tokens
+
+def estimate_tokens(
+        texts: List[str]
+) -> List[int]:
+    return [math.ceil(len(text) / 4) for text in texts]
+
+# === Function to Split a Range of Text on a Pattern ===
+def _split_spans(
+        text: str,
+        pattern: re.Pattern,
+        start: int,
+        end: int
+) -> List[Tuple[int, int]]:
+    """
+    Splits text[start:end] at every match of `pattern` and returns the
+    (start, end) offsets of the non-blank pieces, stripped of whitespace.
+    """
+    spans, pos = [], start
+    for match in pattern.finditer(text, start, end):
+        spans.append((pos, match.start()))
+        pos = match.end()
+    spans.append((pos, end))
+
+    stripped = []
+    for s, e in spans:
+        while s < e and text[s].isspace():
+            s += 1
+        while e > s and text[e - 1].isspace():
+            e -= 1
+        if s < e:
+            stripped.append((s, e))
+    return stripped
+
+# === Function to Cut an Oversized Word between Characters ===
+def _split_word(
+        text: str,
+        start: int,
+        end: int,
+        tokens: int,
+        max_tokens: int,
+        count: TokenCounter
+) -> List[Tuple[int, int, int]]:
+    pieces = math.ceil(tokens / max_tokens)
+    while True:
+        step = max(1, math.ceil((end - start) / pieces))
+        spans = [(p, min(p + step, end)) for p in range(start, end, step)]
+        counts = count([text[s:e] for s, e in spans])
+        if max(counts) <= max_tokens or step == 1:
+            return [(s, e, n) for (s, e), n in zip(spans, counts)]
+        pieces += 1
+
+# === Function to Cut Text into Units no Larger than the Budget ===
+def _units(
+        text: str,
+        max_tokens: int,
+        count: TokenCounter
+) -> List[Tuple[int, int, int]]:
+    """
+    Returns (start, end, tokens) of the sentences of every paragraph. A sentence
+    over the budget is cut between words, and a single word over it between characters.
+    Words packed into one unit are tallied with the whitespace before them.
+    """
+    sentences = [
+        span
+        for paragraph in _split_spans(text, PARAGRAPH_BREAK, 0, len(text))
+        for span in _split_spans(text, SENTENCE_BREAK, *paragraph)
+    ]
+    counts = count([text[s:e] for s, e in sentences])
+
+    units = []
+    for (start, end), tokens in zip(sentences, counts):
+        if tokens <= max_tokens:
+            units.append((start, end, tokens))
+            continue
+
+        ## === Oversized sentence: pack its words instead ===
+        words = [m.span() for m in WORD.finditer(text, start, end)]
+        alone = count([text[s:e] for s, e in words])
+        joined = count([text[words[k - 1][1] if k else s:e] for k, (s, e) in enumerate(words)])
+        for (s, e), n, n_joined in zip(words, alone, joined):
+            if n > max_tokens:
+                units.extend(_split_word(text, s, e, n, max_tokens, count))
+            elif units and units[-1][0] >= start and units[-1][2] + n_joined <= max_tokens:
+                units[-1] = (units[-1][0], e, units[-1][2] + n_joined)
+            else:
+                units.append((s, e, n))
+
+    return units
+
+# === Function to Plan Chunks from Unit Tallies ===
+def _plan(
+        units: List[Tuple[int, int, int]],
+        joined: List[int],
+        i: int,
+        max_tokens: int,
+        overlap_tokens: int
+) -> List[Tuple[int, int]]:
+    """
+    Greedily packs units[i:] into (first unit, end unit) ranges. A unit's tally
+    includes the gap before it (`joined`) unless it opens the chunk.
+    """
+    plan = []
+    while i < len(units):
+        j, tokens = i + 1, units[i][2]
+        while j < len(units) and tokens + joined[j] <= max_tokens:
+            tokens += joined[j]
+            j += 1
+        plan.append((i, j))
+        if j == len(units):
+            break
+        i = _next_start(units, i, j, overlap_tokens)
+    return plan
+
+def _next_start(
+        units: List[Tuple[int, int, int]],
+        i: int,
+        j: int,
+        overlap_tokens: int
+) -> int:
+    ## === Step back over whole sentences for the overlap (always moving forward) ===
+    k, overlap = j, 0
+    while k - 1 > i and overlap + units[k - 1][2] <= overlap_tokens:
+        k -= 1
+        overlap += units[k][2]
+    return k
+
+# === Function to Chunk One Text ===
+def chunk_spans(
+        text: str,
+        max_tokens: int = 512,
+        overlap_tokens: int = 64,
+        count: Optional[TokenCounter] = None
+) -> List[Tuple[int, int, int]]:
+    """
+    Packs whole sentences into chunks of at most `max_tokens` tokens. Each chunk
+    repeats the trailing sentences of the previous one, up to `overlap_tokens`.
+    Every assembled chunk is recounted as a whole (in one batch); a chunk over the
+    budget drops trailing sentences and the chunks after it are planned again.
+
+    Args:
+        text (str): Text to chunk.
+        max_tokens (int): Token budget per chunk.
+        overlap_tokens (int): Token budget of the overlap between consecutive chunks.
+        count (TokenCounter, optional): Batch token counter (defaults to tiktoken cl100k_base).
+
+    Returns:
+        List[Tuple[int, int, int]]: (char_start, char_end, tokens) per chunk;
+                                    the chunk text is text[char_start:char_end]
+                                    and tokens is its exact count.
+    """
+    count = count or get_token_counter()
+    units = _units(text, max_tokens, count)
+    if not units:
+        return []
+    joined = [units[0][2]] + count([text[units[k - 1][1]:units[k][1]] for k in range(1, len(units))])
+
+    chunks = []
+    i = 0
+    while i < len(units):
+        plan = _plan(units, joined, i, max_tokens, overlap_tokens)
+        actual = count([text[units[a][0]:units[b - 1][1]] for a, b in plan])
+
+        i = len(units)
+        for (a, b), tokens in zip(plan, actual):
+            if tokens > max_tokens and b - 1 > a:
+                while tokens > max_tokens and b - 1 > a:
+                    b -= 1
+                    tokens = count([text[units[a][0]:units[b - 1][1]]])[0]
+                chunks.append((units[a][0], units[b - 1][1], tokens))
+                i = _next_start(units, a, b, overlap_tokens)
+                break
+            chunks.append((units[a][0], units[b - 1][1], tokens))
+
+    return chunks
+
+# === Chunking Stage Between Extraction and Indexing ===
+def chunk_texts(
+        texts: List[Dict[str, Any]],
+        max_tokens: Optional[int] = None,
+        overlap_tokens: Optional[int] = None,
+        encoding_name: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Re-chunks extracted texts (pages, text files) to a token budget.
+    Every chunk keeps the metadata of its source item and adds `chunk_index`
+    (position within the item), `char_start`/`char_end` (offsets into the item's
+    content) and `token_count`. Defaults come from the `chunking` section of pipeline.yaml.
+
+    Args:
+        texts (List[Dict[str, Any]]): Items with "content" and "metadata", as returned by extraction.
+        max_tokens (int, optional): Token budget per chunk.
+        overlap_tokens (int, optional): Tokens repeated between consecutive chunks.
+        encoding_name (str, optional): tiktoken encoding used to count tokens.
+
+    Returns:
+        List[Dict[str, Any]]: The chunks, in source order.
+    """
+    settings = get_settings("chunking")
+    max_tokens = max_tokens or settings.get("max_tokens", 512)
+    overlap_tokens = settings.get("overlap_tokens", 64) if overlap_tokens is None else overlap_tokens
+    count = get_token_counter(encoding_name or settings.get("encoding", "cl100k_base"))
+
+    chunks = []
+    for item in texts:
+        content = item.get("content") or ""
+        for idx, (start, end, tokens) in enumerate(chunk_spans(content, max_tokens, overlap_tokens, count)):
+            chunks.append({
+                "content": content[start:end],
+                "metadata": {
+                    **item["metadata"],
+                    "chunk_index": idx,
+                    "char_start": start,
+                    "char_end": end,
+                    "token_count": tokens
+                }
+            })
+
+    return chunks
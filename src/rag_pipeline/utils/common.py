@@ -1,7 +1,6 @@
 # === Python Modules ===
 import streamlit as st
 from typing import Dict , Any, Literal
-import time
 import yaml
 from pathlib import Path
 
@@ -14,7 +13,6 @@ def init_session():
     sessions: Dict[str, Any] = {
         "messages": [],
         "session_id": None,
-        "pending_stream": None,
     }
 
     ### === Initialising using the for loop ===
@@ -22,39 +20,6 @@ def init_session():
         if key not in st.session_state:
             st.session_state[key] = value
 
-# === Streaming generator ===
-def stream_text(
-        text: str,
-        delay: float = 0.1
-):
-    """
-    Creates a streaming-like effect in Streamlit UI.
-    Preserves line breaks while typing word by word.
-    """
-    ## === Iterating over the text split by spaces ===
-    for part in text.split(" "):
-
-        ## === If there is a line break in the word ===
-        if "\n" in part:
-
-            # Split the part into lines
-            lines = part.split("\n")
-
-            # Stream each line (except the last one) with newline preserved
-            for l in lines[:-1]:
-                yield l + "\n"
-                time.sleep(delay)
-
-            # Stream the last segment of the line with a space
-            yield lines[-1] + " "
-
-        ## === If no line break, stream normally ===
-        else:
-            yield part + " "
-
-        ## === Apply delay after each streamed part ===
-        time.sleep(delay)
-
 # === Function to Load a Specific YAML Topic ===
 def load_yaml(
         file_name: Literal["config.yaml", "details.yaml"],
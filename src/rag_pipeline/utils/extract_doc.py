@@ -1,59 +1,155 @@
 # === Python Modules ===
 import pdfplumber
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Optional
 import os
 
+# === Components ===
+from rag_pipeline.components.registry import get_settings
+
+# === Function to extract a range of pages from an open PDF ===
+def _extract_pages(
+        pdf,
+        source: str,
+        start: int,
+        end: int
+) -> Tuple[List[Dict[str, str]], List[list]]:
+    """
+    Extracts text and tables from pages [start, end) of an open pdfplumber document.
+    """
+    texts: List[Dict[str, str]] = []
+    tables: List[list] = []
+
+    for i in range(start, end):
+        page = pdf.pages[i]
+        text = page.extract_text()
+        if text:
+            texts.append({
+                "content": text.strip(),
+                "metadata": {
+                    "source": source,
+                    "type": "pdf",
+                    "page_number": i + 1
+                }
+            })
+        page_tables = page.extract_tables()
+        if page_tables:
+            tables.extend(page_tables)
+
+    return texts, tables
+
+# === Process-pool worker: extract one page range of one PDF ===
+def _extract_page_range(
+        pdf_path: str,
+        start: int,
+        end: int
+) -> Tuple[List[Dict[str, str]], List[list]]:
+    with pdfplumber.open(pdf_path) as pdf:
+        return _extract_pages(pdf, Path(pdf_path).name, start, end)
+
+# === Shared process pool for parallel extraction ===
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_workers: Optional[int] = None
+_process_pool_lock = threading.Lock()
+
+def _get_process_pool(
+        max_workers: int
+) -> ProcessPoolExecutor:
+    """
+    Returns a long-lived process pool so worker start-up is paid once per process.
+    Workers are spawned (not forked) because the API server runs threads; creation
+    is serialized so concurrent ingestion jobs share one pool.
+    """
+    global _process_pool, _process_pool_workers
+
+    ## === Ingestion worker threads call this concurrently ===
+    with _process_pool_lock:
+        if _process_pool is None or _process_pool_workers != max_workers:
+            if _process_pool is not None:
+                _process_pool.shutdown(wait = False)
+            _process_pool = ProcessPoolExecutor(
+                max_workers = max_workers,
+                mp_context = multiprocessing.get_context("spawn")
+            )
+            _process_pool_workers = max_workers
+
+        return _process_pool
+
+def _pdf_file_info(
+        pdf_file: Path
+) -> Dict[str, str]:
+    return {
+        "file_name": pdf_file.name,
+        "file_path": str(pdf_file.resolve()),
+        "type": "pdf",
+        "size_kb": round(os.path.getsize(pdf_file) / 1024, 2),
+        "total_pages": 0,
+        "total_tables": 0
+    }
+
 # === Function to extract text and tables from PDF files ===
 def extract_from_pdf(
-        folder_path: Path = Path("data")
+        folder_path: Path = Path("data"),
+        files: Optional[List[Path]] = None,
+        parallel: Optional[bool] = None,
+        max_workers: Optional[int] = None,
+        pages_per_task: Optional[int] = None
 ) -> Tuple[List[Dict[str, str]], List[list], List[Dict[str, str]]]:
     """
     Extracts text and tables from all PDF files inside a folder, with page-level and file-level metadata.
+    Files are processed in name order. With `parallel`, files and page ranges are spread
+    across a process pool; the merged output is identical to the serial one.
 
     Args:
         folder_path (Path): Path to the folder containing PDF files.
+        files (List[Path], optional): Restrict extraction to these files instead of the whole folder.
+        parallel (bool, optional): Use the process pool (defaults to `extraction.parallel` in pipeline.yaml).
+        max_workers (int, optional): Process pool size (defaults to `extraction.max_workers`, then CPU count).
+        pages_per_task (int, optional): Pages extracted per pool task (defaults to `extraction.pages_per_task`).
 
     Returns:
         texts (list[dict]): Page-level extracted text chunks.
         tables (list[list]): Extracted tables.
         file_metadata (list[dict]): File-level metadata (per PDF file).
     """
+    settings = get_settings("extraction")
+    if parallel is None:
+        parallel = settings.get("parallel", False)
+
+    pdf_files = sorted(
+        folder_path.glob("*.pdf") if files is None else [
+            Path(f) for f in files if Path(f).suffix.lower() == ".pdf"
+        ]
+    )
+
+    if parallel:
+        return extract_from_pdf_parallel(
+            pdf_files = pdf_files,
+            max_workers = max_workers or settings.get("max_workers") or os.cpu_count() or 1,
+            pages_per_task = pages_per_task or settings.get("pages_per_task", 16),
+            min_pages = settings.get("min_pages_for_parallel", 0)
+        )
+
     texts: List[Dict[str, str]] = []
     tables: List[list] = []
     file_metadata: List[Dict[str, str]] = []
 
-    for pdf_file in folder_path.glob("*.pdf"):
+    for pdf_file in pdf_files:
         print(f"📄 Reading {pdf_file.name} ...")
 
         try:
-            file_info = {
-                "file_name": pdf_file.name,
-                "file_path": str(pdf_file.resolve()),
-                "type": "pdf",
-                "size_kb": round(os.path.getsize(pdf_file) / 1024, 2),
-                "total_pages": 0,
-                "total_tables": 0
-            }
+            file_info = _pdf_file_info(pdf_file)
 
             with pdfplumber.open(pdf_file) as pdf:
                 file_info["total_pages"] = len(pdf.pages)
-                for i, page in enumerate(pdf.pages, start=1):
-                    text = page.extract_text()
-                    if text:
-                        texts.append({
-                            "content": text.strip(),
-                            "metadata": {
-                                "source": pdf_file.name,
-                                "type": "pdf",
-                                "page_number": i
-                            }
-                        })
-                    page_tables = page.extract_tables()
-                    if page_tables:
-                        tables.extend(page_tables)
-                        file_info["total_tables"] += len(page_tables)
+                file_texts, file_tables = _extract_pages(pdf, pdf_file.name, 0, len(pdf.pages))
 
+            file_info["total_tables"] = len(file_tables)
+            texts.extend(file_texts)
+            tables.extend(file_tables)
             file_metadata.append(file_info)
 
         except Exception as e:
@@ -62,18 +158,101 @@ def extract_from_pdf(
     print(f"✅ Extracted {len(texts)} pages and {len(tables)} tables from PDFs.")
     return texts, tables, file_metadata
 
+# === Function to extract PDFs on a process pool ===
+def extract_from_pdf_parallel(
+        pdf_files: List[Path],
+        max_workers: int,
+        pages_per_task: int = 16,
+        min_pages: int = 0
+) -> Tuple[List[Dict[str, str]], List[list], List[Dict[str, str]]]:
+    """
+    Splits every PDF into page ranges, extracts them on a process pool and merges
+    the results in (file, page) order.
+
+    Args:
+        pdf_files (List[Path]): PDF files, in the order their output should appear.
+        max_workers (int): Process pool size.
+        pages_per_task (int): Pages extracted per pool task.
+        min_pages (int): Below this many pages in total, extraction stays serial.
+
+    Returns:
+        Same as `extract_from_pdf`.
+    """
+    file_infos: List[Dict[str, str]] = []
+    tasks: List[Tuple[int, int, int]] = []
+
+    # === Plan page-range tasks ===
+    for pdf_file in pdf_files:
+        try:
+            file_info = _pdf_file_info(pdf_file)
+            with pdfplumber.open(pdf_file) as pdf:
+                file_info["total_pages"] = len(pdf.pages)
+        except Exception as e:
+            print(f"⚠️ Error reading {pdf_file.name}: {e}")
+            continue
+
+        file_idx = len(file_infos)
+        file_infos.append(file_info)
+        for start in range(0, file_info["total_pages"], pages_per_task):
+            tasks.append((file_idx, start, min(start + pages_per_task, file_info["total_pages"])))
+
+    total_pages = sum(info["total_pages"] for info in file_infos)
+    if max_workers <= 1 or total_pages < min_pages:
+        return extract_from_pdf(files = pdf_files, parallel = False)
+
+    print(f"📄 Reading {len(file_infos)} PDFs ({total_pages} pages) with {max_workers} workers ...")
+
+    # === Run tasks on the pool ===
+    pool = _get_process_pool(max_workers)
+    futures = [
+        pool.submit(_extract_page_range, file_infos[file_idx]["file_path"], start, end)
+        for file_idx, start, end in tasks
+    ]
+
+    results: Dict[int, List[Tuple[list, list]]] = {}
+    failed: set = set()
+    for (file_idx, _, _), future in zip(tasks, futures):
+        try:
+            results.setdefault(file_idx, []).append(future.result())
+        except Exception as e:
+            if file_idx not in failed:
+                print(f"⚠️ Error reading {file_infos[file_idx]['file_name']}: {e}")
+            failed.add(file_idx)
+
+    # === Merge in deterministic (file, page) order ===
+    texts: List[Dict[str, str]] = []
+    tables: List[list] = []
+    file_metadata: List[Dict[str, str]] = []
+
+    for file_idx, file_info in enumerate(file_infos):
+        if file_idx in failed:
+            continue
+
+        for range_texts, range_tables in results.get(file_idx, []):
+            texts.extend(range_texts)
+            tables.extend(range_tables)
+            file_info["total_tables"] += len(range_tables)
+
+        file_metadata.append(file_info)
+
+    print(f"✅ Extracted {len(texts)} pages and {len(tables)} tables from PDFs.")
+    return texts, tables, file_metadata
+
 
 # === Function to extract text from text files ===
 def extract_from_text_files(
         folder_path: Path = Path("data"),
-        merge_n: int = 2
+        merge_n: Optional[int] = 2,
+        files: Optional[List[Path]] = None
 ) -> Tuple[List[Dict[str, str]], List[Dict[str, str]]]:
     """
     Extracts text from .txt files, splits into chunks, merges them, and adds file-level metadata.
 
     Args:
         folder_path (Path): Path to folder containing .txt files.
-        merge_n (int): Number of paragraphs to merge together.
+        merge_n (int, optional): Number of paragraphs to merge together. None keeps each
+                                 file whole (for the token-budgeted chunking stage).
+        files (List[Path], optional): Restrict extraction to these files instead of the whole folder.
 
     Returns:
         texts (list[dict]): Text chunks with metadata.
@@ -82,18 +261,25 @@ def extract_from_text_files(
     texts: List[Dict[str, str]] = []
     file_metadata: List[Dict[str, str]] = []
 
-    for txt_file in folder_path.glob("*.txt"):
+    txt_files = folder_path.glob("*.txt") if files is None else [
+        Path(f) for f in files if Path(f).suffix.lower() == ".txt"
+    ]
+
+    for txt_file in txt_files:
         try:
             content = txt_file.read_text(encoding="utf-8").strip()
             if not content:
                 print(f"⚠️ Skipped empty file: {txt_file.name}")
                 continue
 
-            paragraphs = [p.strip() for p in content.split("\n\n") if p.strip()]
-            merged_chunks = [
-                " ".join(paragraphs[i:i + merge_n])
-                for i in range(0, len(paragraphs), merge_n)
-            ]
+            if merge_n is None:
+                merged_chunks = [content]
+            else:
+                paragraphs = [p.strip() for p in content.split("\n\n") if p.strip()]
+                merged_chunks = [
+                    " ".join(paragraphs[i:i + merge_n])
+                    for i in range(0, len(paragraphs), merge_n)
+                ]
 
             for idx, chunk in enumerate(merged_chunks, start=1):
                 texts.append({
@@ -0,0 +1,37 @@
+# === Python Modules ===
+import threading
+from collections import defaultdict
+from typing import Dict
+
+# === Process-wide Pipeline Counters ===
+class PipelineMetrics:
+    def __init__(self):
+        """
+        Named counters incremented by the graph agents and reported by `/metrics/`.
+        """
+        self._counters: Dict[str, float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def incr(
+            self,
+            name: str,
+            value: float = 1
+    ) -> None:
+        with self._lock:
+            self._counters[name] += value
+
+    def get(
+            self,
+            name: str
+    ) -> float:
+        return self._counters.get(name, 0)
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(sorted(self._counters.items()))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+
+pipeline_metrics = PipelineMetrics()
@@ -0,0 +1,91 @@
+import time
+import pytest
+from types import SimpleNamespace
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from rag_pipeline.components.answer_cache import AnswerCache
+from rag_pipeline.agents.answer_cache import answer_cache_lookup, answer_cache_store
+from rag_pipeline.router.routes import answer_cache_hit
+
+
+def _config(cache, session_id = "session_001"):
+    retriever = SimpleNamespace(vectorstore = SimpleNamespace(embeddings = DeterministicFakeEmbedding(size = 32)))
+    return {"configurable": {"answer_cache": cache, "thread_id": session_id, "retriever": retriever}}
+
+
+def test_answer_cache_threshold_ttl_lru_and_invalidation():
+    """
+    Hits need cosine similarity >= threshold; entries expire, are evicted LRU and cleared on invalidation.
+    """
+    cache = AnswerCache(similarity_threshold = 0.9, ttl_s = 60, max_entries_per_session = 2, max_sessions = 2)
+
+    # === Miss, store, then a near-identical vector hits ===
+    assert cache.lookup("s1", "q1", [1.0, 0.0, 0.0]) is None
+    assert cache.store("s1", "q1", "answer 1", "a1")
+    hit = cache.lookup("s1", "q1 again", [0.99, 0.05, 0.0])
+    assert hit is not None and hit.answer == "answer 1", "❌ Similar question should hit."
+    assert cache.lookup("s1", "other", [0.0, 1.0, 0.0]) is None, "❌ Dissimilar question should miss."
+
+    # === Sessions are isolated ===
+    assert cache.lookup("s2", "q1", [1.0, 0.0, 0.0]) is None
+
+    # === Store without a prior lookup is ignored ===
+    assert not cache.store("s1", "never looked up", "x", "x")
+
+    # === LRU per session: q1 (recently hit) survives, "other" is evicted ===
+    cache.store("s1", "other", "answer other", "o")
+    assert cache.lookup("s1", "q1", [1.0, 0.0, 0.0]) is not None
+    cache.lookup("s1", "q3", [0.0, 0.0, 1.0])
+    cache.store("s1", "q3", "answer 3", "a3")
+    assert cache.stats()["entries"] == 2
+    assert cache.lookup("s1", "other", [0.0, 1.0, 0.0]) is None
+
+    # === TTL ===
+    for entry in cache._sessions["s1"].values():
+        entry.created_at -= 120
+    assert cache.lookup("s1", "q1", [1.0, 0.0, 0.0]) is None, "❌ Expired entry should miss."
+
+    # === Invalidation ===
+    cache.lookup("s1", "q4", [1.0, 1.0, 0.0])
+    cache.store("s1", "q4", "answer 4", "a4")
+    cache.invalidate("s1")
+    assert cache.lookup("s1", "q4", [1.0, 1.0, 0.0]) is None, "❌ Invalidated session should miss."
+
+    stats = cache.stats()
+    assert stats["hits"] == 2 and stats["invalidations"] == 1
+    assert 0 < stats["hit_rate"] < 1 and stats["latency_saved_s_total"] >= 0
+    print("✅ test_answer_cache_threshold_ttl_lru_and_invalidation passed!")
+
+
+@pytest.mark.asyncio
+async def test_answer_cache_nodes_skip_to_final_answer():
+    """
+    The first question misses and is stored after generation; the repeat hits,
+    routes to the final answer and measures the latency it saved.
+    """
+    cache = AnswerCache(similarity_threshold = 0.95)
+    config = _config(cache)
+
+    # === First turn: miss -> retrieve ===
+    state = await answer_cache_lookup({"rephrased_question": "What is RAG?", "messages": {}}, config)
+    assert answer_cache_hit(state) == "retrieve"
+
+    time.sleep(0.01)
+    state.update({
+        "generated_answer": "RAG retrieves then generates.",
+        "messages": {1: {"question": "What is RAG?", "answer": "Retrieve, then generate."}}
+    })
+    await answer_cache_store(state, config)
+
+    # === Repeat: hit -> final answer, chat memory updated ===
+    state = await answer_cache_lookup({"rephrased_question": "What is RAG?", "messages": state["messages"]}, config)
+    assert answer_cache_hit(state) == "cache_hit", "❌ Repeated question should hit the cache."
+    assert state["generated_answer"] == "RAG retrieves then generates."
+    assert list(state["messages"].values())[-1]["answer"] == "Retrieve, then generate."
+    assert cache.stats()["latency_saved_s_total"] >= 0.01
+
+    # === Without a cache in the config the lookup is a no-op ===
+    state = await answer_cache_lookup({"rephrased_question": "What is RAG?"}, {"configurable": {}})
+    assert answer_cache_hit(state) == "retrieve"
+
+    print("✅ test_answer_cache_nodes_skip_to_final_answer passed!")
@@ -0,0 +1,119 @@
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_community.vectorstores import FAISS
+
+from rag_pipeline.components import retriever as retriever_module
+from rag_pipeline.components.bm25 import BM25Index, bm25_tokens, bm25_from_vectorstore
+from rag_pipeline.components.hybrid import HybridRetriever, reciprocal_rank_fusion
+from rag_pipeline.components.retriever_manager import RetrieverManager
+
+
+def _corpus(n = 200):
+    docs = [
+        Document(page_content = f"Invoice {i} for part number PN-{i:05d} shipped from warehouse {i % 7}.", metadata = {"page_number": i})
+        for i in range(n)
+    ]
+    return FAISS.from_documents(docs, DeterministicFakeEmbedding(size = 32), ids = [f"chunk-{i}" for i in range(n)])
+
+
+def test_bm25_csr_arrays_search_and_roundtrip(tmp_path):
+    """
+    Postings are CSR integer arrays; identifiers match exactly and the index survives save/load.
+    """
+    assert bm25_tokens("Part PN-00042, rev v2.1") == ["part", "pn-00042", "pn", "00042", "rev", "v2.1", "v2", "1"]
+
+    index = BM25Index.build([
+        ("a", "Part PN-00042 ships from the warehouse"),
+        ("b", "warehouse capacity report, report appendix"),
+        ("c", "nothing relevant")
+    ])
+
+    assert index.indptr.dtype == np.int64 and index.postings.dtype == np.int32 and index.tfs.dtype == np.uint16
+    assert index.indptr[-1] == len(index.postings) == len(index.tfs)
+    assert list(index.terms) == sorted(index.terms)
+
+    assert [cid for cid, _ in index.search("PN-00042", 5)] == ["a"]
+    assert [cid for cid, _ in index.search("warehouse report", 5)] == ["b", "a"], "❌ Ranking by BM25 score expected."
+    assert index.search("unknown term", 5) == []
+
+    index.save(tmp_path)
+    restored = BM25Index.load(tmp_path)
+    assert restored.search("warehouse report", 5) == index.search("warehouse report", 5), "❌ Round trip changed scores."
+    assert BM25Index.load(tmp_path / "missing") is None
+    print("✅ test_bm25_csr_arrays_search_and_roundtrip passed!")
+
+
+def test_bm25_strings_are_packed(tmp_path):
+    """
+    Terms and chunk ids cost their own UTF-8 length: one long URL token does not pad
+    the rest of the vocabulary. Indexes saved with fixed-width strings still load.
+    """
+    url = "https://example.com/" + "a" * 2000
+    chunks = [(f"chunk-{i}", f"term{i} shared") for i in range(500)] + [("chunk-url", f"see {url}")]
+    index = BM25Index.build(chunks)
+
+    utf8 = sum(len(term.encode("utf-8")) for term in index.terms)
+    assert index.terms.nbytes == utf8 + 8 * (len(index.terms) + 1), "❌ Terms should be packed UTF-8."
+    assert index.nbytes < 64 * 1024, f"❌ BM25 index takes {index.nbytes} bytes."
+    long_token = max(bm25_tokens(url), key = len)
+    assert len(long_token) > 2000 and index.terms.find(long_token) is not None
+    assert index.terms.find("missing") is None
+    assert index.search("term42", 1)[0][0] == "chunk-42"
+
+    ## === Legacy layout: fixed-width unicode arrays ===
+    np.savez(
+        tmp_path / "bm25.npz",
+        terms = np.array(list(index.terms), dtype = str),
+        indptr = index.indptr,
+        postings = index.postings,
+        tfs = index.tfs,
+        doc_lens = index.doc_lens,
+        chunk_ids = np.array(list(index.chunk_ids), dtype = str),
+        params = np.array([index.k1, index.b], dtype = np.float32)
+    )
+    assert BM25Index.load(tmp_path).search("shared term7", 3) == index.search("shared term7", 3)
+    print("✅ test_bm25_strings_are_packed passed!")
+
+
+def test_reciprocal_rank_fusion():
+    """
+    Items ranked well in both lists beat items ranked first in only one.
+    """
+    fused = reciprocal_rank_fusion([["x", "y", "z"], ["y", "w"]], rrf_k = 60)
+    assert list(fused)[0] == "y"
+    assert fused["y"] == pytest.approx(1 / 62 + 1 / 61)
+    print("✅ test_reciprocal_rank_fusion passed!")
+
+
+@pytest.mark.asyncio
+async def test_hybrid_retriever_finds_exact_identifiers(tmp_path):
+    """
+    An exact part number is found by the hybrid retriever even when dense retrieval misses it,
+    and restored sessions come back as hybrid retrievers.
+    """
+    db = _corpus()
+    bm25 = bm25_from_vectorstore(db)
+    hybrid = HybridRetriever(vectorstore = db, bm25 = bm25, search_kwargs = {"k": 5}, fetch_k = 20)
+
+    query = "Which warehouse shipped PN-00137?"
+    dense = [doc.id for doc in await db.as_retriever(search_kwargs = {"k": 5}).ainvoke(query)]
+    docs = await hybrid.ainvoke(query)
+    assert "chunk-137" not in dense, "❌ Fixture expects dense retrieval to miss the identifier."
+    assert "chunk-137" in [d.id for d in docs], f"❌ Identifier not retrieved: {[d.id for d in docs]}"
+    assert len(docs) == 5 and all("rrf_score" in d.metadata for d in docs)
+    assert [d.id for d in hybrid.invoke(query)] == [d.id for d in docs], "❌ Sync and async results differ."
+    assert "rrf_score" not in db.docstore.search("chunk-137").metadata, "❌ Docstore entry was modified."
+
+    # === Persisted next to the FAISS index and restored by the manager ===
+    db.save_local(str(tmp_path / "session_h"))
+    bm25.save(tmp_path / "session_h")
+    manager = RetrieverManager(
+        base_dir = tmp_path,
+        embeddings_factory = lambda: DeterministicFakeEmbedding(size = 32)
+    )
+    restored = manager.get("session_h")
+    assert isinstance(restored, HybridRetriever)
+    assert "chunk-42" in [d.id for d in await restored.ainvoke("PN-00042")]
+    print("✅ test_hybrid_retriever_finds_exact_identifiers passed!")
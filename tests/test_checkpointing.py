@@ -0,0 +1,158 @@
+import operator
+import pytest
+from typing import Annotated, TypedDict
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.graph import StateGraph, END
+
+from rag_pipeline.components import checkpointing
+from rag_pipeline.components.checkpointing import BufferedCheckpointer, build_checkpointer, checkpoint_durability
+
+
+# === Saver standing in for MongoDB, counting its operations ===
+class CountingSaver(InMemorySaver):
+    def __init__(self):
+        super().__init__()
+        self.put_calls = 0
+        self.write_calls = 0
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        self.put_calls += 1
+        return await super().aput(config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config, writes, task_id, task_path = ""):
+        self.write_calls += 1
+        return await super().aput_writes(config, writes, task_id, task_path)
+
+
+class State(TypedDict, total = False):
+    question: str
+    messages: Annotated[list, operator.add]
+    documents: list
+
+
+def _graph(checkpointer):
+    """
+    Three nodes, like rewrite -> retrieve -> generate.
+    """
+    workflow = StateGraph(State)
+    workflow.add_node("rewrite", lambda state: {"documents": []})
+    workflow.add_node("retrieve", lambda state: {"documents": [state["question"]]})
+    workflow.add_node("generate", lambda state: {"messages": [state["question"]]})
+    workflow.set_entry_point("rewrite")
+    workflow.add_edge("rewrite", "retrieve")
+    workflow.add_edge("retrieve", "generate")
+    workflow.add_edge("generate", END)
+    return workflow.compile(checkpointer = checkpointer)
+
+
+@pytest.mark.asyncio
+async def test_exit_durability_persists_once_per_run():
+    """
+    With durability "exit" a run writes one checkpoint; "sync" writes one per step.
+    """
+    config = {"configurable": {"thread_id": "t1"}}
+    counts = {}
+    for durability in ("sync", "exit"):
+        saver = CountingSaver()
+        graph = _graph(saver)
+        await graph.ainvoke({"question": "q1"}, config, durability = durability)
+        state = await graph.ainvoke({"question": "q2"}, config, durability = durability)
+        assert state["messages"] == ["q1", "q2"], "❌ Conversation lost between runs."
+        counts[durability] = saver.put_calls
+
+    assert counts["exit"] == 2, f"❌ Expected one checkpoint per run, got {counts['exit']}."
+    assert counts["sync"] > 3 * counts["exit"]
+
+    print("✅ test_exit_durability_persists_once_per_run passed!")
+
+
+@pytest.mark.asyncio
+async def test_buffered_checkpointer_batches_and_survives_restart():
+    """
+    Hot threads are served from memory, flushed in one batch (latest checkpoint per
+    thread), and a fresh process resumes from what was flushed.
+    """
+    backing = CountingSaver()
+    buffered = BufferedCheckpointer(backing, flush_interval_s = 60)
+    graph = _graph(buffered)
+
+    for thread in ("t1", "t2"):
+        for q in ("q1", "q2", "q3"):
+            await graph.ainvoke({"question": q}, {"configurable": {"thread_id": thread}}, durability = "sync")
+
+    assert backing.put_calls == 0, "❌ Nothing should reach the backing saver before a flush."
+    assert buffered.stats["backing_reads"] == 2, "❌ Hot threads should not be re-read."
+
+    assert await buffered.flush() == 2
+    assert backing.put_calls == 2, "❌ Only the latest checkpoint of each thread should be written."
+
+    # === Restart: a new buffer over the same backing store ===
+    restarted_buffer = BufferedCheckpointer(backing, flush_interval_s = 60)
+    restarted = _graph(restarted_buffer)
+    state = await restarted.ainvoke({"question": "q4"}, {"configurable": {"thread_id": "t1"}}, durability = "sync")
+    assert state["messages"] == ["q1", "q2", "q3", "q4"]
+
+    # === Memory keeps one checkpoint per flushed thread ===
+    assert len(buffered.memory.storage["t2"][""]) == 1
+
+    await buffered.aclose()
+    await restarted_buffer.aclose()
+    assert backing.put_calls == 3, "❌ Shutdown should flush the pending checkpoint."
+
+    print("✅ test_buffered_checkpointer_batches_and_survives_restart passed!")
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_checkpoints_queued():
+    """
+    A backing write that fails leaves the thread's checkpoint queued; the next flush
+    writes the newest checkpoint and a restarted process resumes from it.
+    """
+    class FlakySaver(CountingSaver):
+        failures = 1
+
+        async def aput(self, config, checkpoint, metadata, new_versions):
+            if self.failures:
+                self.failures -= 1
+                raise ConnectionError("primary stepped down")
+            return await super().aput(config, checkpoint, metadata, new_versions)
+
+    backing = FlakySaver()
+    buffered = BufferedCheckpointer(backing, flush_interval_s = 60)
+    graph = _graph(buffered)
+    config = {"configurable": {"thread_id": "t1"}}
+
+    await graph.ainvoke({"question": "q1"}, config, durability = "exit")
+    assert await buffered.flush() == 0
+    assert buffered.stats["flush_errors"] == 1 and len(buffered._pending) == 1, "❌ Failed checkpoint should stay queued."
+    assert buffered._timer is not None and buffered._timer in buffered._tasks, "❌ A retry should be scheduled."
+
+    await graph.ainvoke({"question": "q2"}, config, durability = "exit")
+    assert await buffered.flush() == 1
+    assert backing.put_calls == 1, "❌ Only the newest checkpoint should be written."
+    await buffered.aclose()
+    assert not buffered._pending and not buffered._tasks
+
+    restarted = _graph(BufferedCheckpointer(backing, flush_interval_s = 60))
+    state = await restarted.ainvoke({"question": "q3"}, config, durability = "exit")
+    assert state["messages"] == ["q1", "q2", "q3"], "❌ Conversation lost after a failed flush."
+
+    print("✅ test_failed_flush_keeps_checkpoints_queued passed!")
+
+
+def test_checkpoint_settings(monkeypatch):
+    """
+    The durability is read from the settings, and buffering is opt-in.
+    """
+    monkeypatch.setattr(checkpointing, "get_settings", lambda section: {"durability": "async"})
+    assert checkpoint_durability() == "async"
+
+    monkeypatch.setattr(checkpointing, "get_settings", lambda section: {"durability": "never"})
+    with pytest.raises(ValueError):
+        checkpoint_durability()
+
+    backing = InMemorySaver()
+    assert build_checkpointer(backing, {"enabled": False}) is backing
+    assert isinstance(build_checkpointer(backing, {"enabled": True, "max_threads": 8}), BufferedCheckpointer)
+
+    print("✅ test_checkpoint_settings passed!")
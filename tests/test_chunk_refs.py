@@ -0,0 +1,62 @@
+import pytest
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.graph import StateGraph, END
+
+from rag_pipeline.agent_state import AgentState
+from rag_pipeline.agents.doc_retriever import doc_retriever
+from rag_pipeline.components.chunk_refs import resolve_refs, to_refs
+from rag_pipeline.components.retriever import search_by_vector
+
+TEXTS = [f"Section {i}: the quarterly supplier report covers item PN-{i:05d} in detail." for i in range(6)]
+
+
+def _retriever():
+    db = FAISS.from_texts(TEXTS, DeterministicFakeEmbedding(size = 16), metadatas = [{"source": "report.pdf", "page_number": i} for i in range(6)])
+    return db.as_retriever(search_kwargs = {"k": 3})
+
+
+@pytest.mark.asyncio
+async def test_refs_round_trip_through_the_session_store():
+    """
+    References keep id and score only, and resolve back to the stored chunk with its metadata.
+    """
+    retriever = _retriever()
+    documents = await search_by_vector(retriever, retriever.vectorstore.embeddings.embed_query("supplier"), "supplier")
+    refs = to_refs(documents + ["plain text"], session_id = "s1")
+
+    assert set(refs[0]) == {"session_id", "chunk_id", "score"} and refs[0]["session_id"] == "s1"
+    assert refs[-1] == "plain text", "❌ Items without an id should be kept as is."
+
+    resolved = resolve_refs(refs + [{"session_id": "s1", "chunk_id": "gone", "score": None}], retriever)
+    assert [d.page_content for d in resolved[:-1]] == [d.page_content for d in documents]
+    assert [d.metadata for d in resolved[:-1]] == [d.metadata for d in documents], "❌ Metadata/score not restored."
+    assert len(resolved) == len(documents) + 1, "❌ Missing chunks should be skipped."
+
+    print("✅ test_refs_round_trip_through_the_session_store passed!")
+
+
+@pytest.mark.asyncio
+async def test_checkpoints_never_hold_chunk_text():
+    """
+    Checkpoints written after the retriever node contain references, not page text.
+    """
+    workflow = StateGraph(AgentState)
+    workflow.add_node("doc_retriever_node", doc_retriever)
+    workflow.set_entry_point("doc_retriever_node")
+    workflow.add_edge("doc_retriever_node", END)
+    saver = InMemorySaver()
+    graph = workflow.compile(checkpointer = saver)
+
+    config = {"configurable": {"retriever": _retriever(), "thread_id": "s1"}}
+    state = await graph.ainvoke({"question": "supplier", "rephrased_question": "supplier", "documents": []}, config)
+
+    assert state["documents"] and all(isinstance(ref, dict) and ref["session_id"] == "s1" for ref in state["documents"])
+    blobs = b"".join(value[1] for value in saver.blobs.values()) + b"".join(
+        write[2][1] for writes in saver.writes.values() for write in writes.values()
+    )
+    assert b"quarterly supplier report" not in blobs, "❌ Chunk text was persisted in a checkpoint."
+
+    print("✅ test_checkpoints_never_hold_chunk_text passed!")
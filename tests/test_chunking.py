@@ -0,0 +1,73 @@
+from rag_pipeline.utils.chunking import chunk_spans, chunk_texts, estimate_tokens
+from rag_pipeline.pipeline.data_extract import extract_data_pipeline
+
+
+def _document(n_paragraphs = 12, sentences_per_paragraph = 5):
+    return "\n\n".join(
+        " ".join(f"Paragraph {p} sentence {s} talks about invoices and shipments." for s in range(sentences_per_paragraph))
+        for p in range(n_paragraphs)
+    )
+
+
+def test_chunks_respect_budget_boundaries_and_overlap():
+    """
+    Chunks stay within the token budget, end on sentence boundaries and overlap.
+    """
+    text = _document()
+    chunks = chunk_spans(text, max_tokens = 60, overlap_tokens = 20, count = estimate_tokens)
+
+    assert len(chunks) > 1
+    for start, end, tokens in chunks:
+        actual = estimate_tokens([text[start:end]])[0]
+        assert actual <= 60, f"❌ Chunk over budget: {actual} tokens."
+        assert tokens == actual, f"❌ Reported {tokens} tokens, chunk has {actual}."
+        assert text[end - 1] == ".", "❌ Chunk does not end on a sentence boundary."
+        assert text[start:end] == text[start:end].strip()
+
+    for (_, prev_end, _), (start, _, _) in zip(chunks, chunks[1:]):
+        assert start < prev_end, "❌ Consecutive chunks should overlap."
+
+    assert chunks[0][0] == 0 and chunks[-1][1] == len(text), "❌ Text not fully covered."
+    print("✅ test_chunks_respect_budget_boundaries_and_overlap passed!")
+
+
+def test_oversized_sentences_are_split():
+    """
+    A sentence (or word) larger than the budget is cut so no chunk exceeds it.
+    """
+    text = "Short intro. " + " ".join(["word"] * 300) + " " + "z" * 500 + "."
+    chunks = chunk_spans(text, max_tokens = 50, overlap_tokens = 0, count = estimate_tokens)
+
+    for start, end, tokens in chunks:
+        actual = estimate_tokens([text[start:end]])[0]
+        assert actual <= 50, f"❌ Chunk over budget: {actual} tokens."
+        assert tokens == actual, f"❌ Reported {tokens} tokens, chunk has {actual}."
+    assert "".join(text[s:e] for s, e, _ in chunks).replace(" ", "") == text.replace(" ", ""), "❌ Text lost or duplicated."
+    print("✅ test_oversized_sentences_are_split passed!")
+
+
+def test_chunk_texts_keeps_metadata_and_offsets(tmp_path):
+    """
+    Chunked items keep source/page metadata, and their offsets point back into the source text.
+    """
+    page = {"content": _document(), "metadata": {"source": "a.pdf", "type": "pdf", "page_number": 3}}
+    chunks = chunk_texts([page], max_tokens = 80, overlap_tokens = 16)
+
+    assert len(chunks) > 1
+    for idx, chunk in enumerate(chunks):
+        meta = chunk["metadata"]
+        assert meta["source"] == "a.pdf" and meta["page_number"] == 3 and meta["chunk_index"] == idx
+        assert page["content"][meta["char_start"]:meta["char_end"]] == chunk["content"]
+
+    # === Text files are chunked whole, so offsets are relative to the file ===
+    session_folder = tmp_path / "session_c"
+    session_folder.mkdir()
+    (session_folder / "notes.txt").write_text(_document(n_paragraphs = 40), encoding = "utf-8")
+
+    texts, _, metadata = extract_data_pipeline(session_folder = session_folder)
+    content = (session_folder / "notes.txt").read_text(encoding = "utf-8")
+
+    assert len(texts) == metadata[0]["total_chunks"] > 1
+    for item in texts:
+        assert content[item["metadata"]["char_start"]:item["metadata"]["char_end"]] == item["content"]
+    print("✅ test_chunk_texts_keeps_metadata_and_offsets passed!")
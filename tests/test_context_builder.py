@@ -0,0 +1,75 @@
+from langchain_core.documents import Document
+
+from rag_pipeline.components.context_builder import build_context, citation
+from rag_pipeline.utils.chunking import estimate_tokens
+
+
+def _chunk(text, page, source = "report.pdf"):
+    return Document(page_content = text, metadata = {"source": source, "page_number": page, "char_start": 0})
+
+
+def test_context_is_compact_cited_and_deduplicated():
+    """
+    Documents are rendered with short citations, no metadata dicts, and overlapping sentences appear once.
+    """
+    docs = [
+        _chunk("Revenue grew 12% in Q3. Margins were stable.", 3),
+        _chunk("Margins were stable. Costs fell in the north region.", 3),
+        _chunk("Revenue grew 12% in Q3.", 4),
+        "A plain string chunk."
+    ]
+    context, stats = build_context(docs, max_tokens = 1000, count = estimate_tokens)
+
+    assert context.startswith("[1] report.pdf p.3\nRevenue grew 12% in Q3. Margins were stable.")
+    assert context.count("Margins were stable.") == 1, "❌ Overlapping sentence repeated."
+    assert "[2] report.pdf p.3\nCosts fell in the north region." in context
+    assert "[3] document\nA plain string chunk." in context
+    assert "metadata" not in context and "page_content" not in context
+    assert stats["deduplicated"] == 1 and stats["used"] == 3 and stats["dropped"] == 0
+
+    assert citation({"source": "notes.txt", "table_id": 2}) == "notes.txt table 2"
+    print("✅ test_context_is_compact_cited_and_deduplicated passed!")
+
+
+def test_deduplication_keeps_original_layout():
+    """
+    Removing a repeated sentence leaves newlines, bullets and table rows of the rest intact.
+    """
+    docs = [
+        _chunk("Shipping terms apply.", 1),
+        _chunk("Totals:\n- Returns within 30 days.\nShipping terms apply.\n\n| Region | Units |\n| north | 120 |.", 2)
+    ]
+    context, stats = build_context(docs, max_tokens = 1000, count = estimate_tokens)
+
+    assert context.count("Shipping terms apply.") == 1
+    assert context.endswith("[2] report.pdf p.2\nTotals:\n- Returns within 30 days.\n\n| Region | Units |\n| north | 120 |."), \
+        f"❌ Layout changed: {context!r}"
+
+    ## === Truncated blocks keep it too ===
+    listing = _chunk("Returns:\n" + "\n".join(f"- Item {i} returned after {i} days." for i in range(60)), 3)
+    truncated, stats = build_context([listing], max_tokens = 80, count = estimate_tokens)
+    assert stats["truncated"] == 1 and "Returns:\n- Item 0 returned after 0 days.\n- Item 1 " in truncated
+    assert estimate_tokens([truncated])[0] <= 80
+    print("✅ test_deduplication_keeps_original_layout passed!")
+
+
+def test_context_respects_token_budget():
+    """
+    Lower-ranked chunks are truncated at a sentence boundary or dropped to stay within the budget.
+    """
+    docs = [
+        _chunk(" ".join(f"Sentence {i} of chunk {n} about shipments." for i in range(20)), n)
+        for n in range(1, 6)
+    ]
+    full, full_stats = build_context(docs, max_tokens = 100000, count = estimate_tokens)
+    context, stats = build_context(docs, max_tokens = full_stats["tokens"] // 3, count = estimate_tokens)
+
+    assert stats["tokens"] <= full_stats["tokens"] // 3
+    assert full_stats["tokens_before"] == full_stats["tokens"] == stats["tokens_before"], "❌ Pre-packing size should reuse block counts."
+    assert sum(estimate_tokens([context])) <= full_stats["tokens"] // 3 + 5, "❌ Context exceeds the budget."
+    assert stats["truncated"] == 1 and stats["dropped"] == 5 - stats["used"] > 0
+    assert context.startswith(full[:200]), "❌ Highest-ranked chunk should be kept first."
+    assert context.rstrip().endswith("shipments."), "❌ Truncation should end on a sentence boundary."
+
+    assert build_context(docs, max_tokens = 10, count = estimate_tokens)[1]["used"] == 0
+    print("✅ test_context_respects_token_budget passed!")
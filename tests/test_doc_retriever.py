@@ -0,0 +1,133 @@
+import time
+import asyncio
+import pytest
+from typing import List
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_community.vectorstores import FAISS
+
+from rag_pipeline.agents import query_rewriter
+from rag_pipeline.agents.doc_retriever import doc_retriever
+from rag_pipeline.agents.answer_cache import answer_cache_lookup
+from rag_pipeline.components.answer_cache import AnswerCache
+from rag_pipeline.components.chunk_refs import is_ref, resolve_refs
+from rag_pipeline.schema.schema import QueryRewrite
+from rag_pipeline.utils.metrics import pipeline_metrics
+
+HISTORY = {1: {"question": "What was Q3 revenue?", "answer": "Q3 revenue was $4.2M."}}
+
+
+# === Embeddings with fixed vectors and injected latency ===
+class SlowEmbeddings(Embeddings):
+    VECTORS = {
+        "revenue": [1.0, 0.0, 0.0],
+        "How does it compare to Q2?": [0.9, 0.1, 0.0],
+        "How did Q3 revenue compare to Q2?": [0.88, 0.12, 0.0],
+        "What is the refund policy for it?": [0.0, 0.0, 1.0],
+        "Which supplier caused the delay?": [0.0, 1.0, 0.0],
+        "supplier": [0.0, 1.0, 0.0],
+        "refund": [0.0, 0.0, 1.0]
+    }
+
+    def __init__(self, delay = 0.0):
+        self.delay = delay
+        self.calls = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.VECTORS[t] for t in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.VECTORS[text]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.VECTORS[text]
+
+
+class FakeRewriter:
+    def __init__(self, rephrased, delay):
+        self.rephrased = rephrased
+        self.delay = delay
+
+    async def ainvoke(self, messages):
+        await asyncio.sleep(self.delay)
+        return QueryRewrite(rephrased_question = self.rephrased)
+
+
+class FakeClients:
+    def __init__(self, fake):
+        self.fake = fake
+
+    def get_structured(self, model_name, temperature, schema):
+        return self.fake
+
+
+def _retriever(embeddings):
+    docs = [Document(page_content = t) for t in ("revenue", "supplier", "refund")]
+    return FAISS.from_documents(docs, embeddings).as_retriever(search_kwargs = {"k": 1})
+
+
+async def _run(monkeypatch, question, rephrased, embed_delay = 0.0, llm_delay = 0.0):
+    embeddings = SlowEmbeddings(delay = embed_delay)
+    config = {"configurable": {"retriever": _retriever(embeddings)}}
+    monkeypatch.setattr(query_rewriter, "get_llm_clients", lambda config: FakeClients(FakeRewriter(rephrased, llm_delay)))
+
+    start = time.perf_counter()
+    state = await query_rewriter.query_rewriter({"question": question, "messages": HISTORY}, config)
+    state = await doc_retriever(state, config)
+    return state, time.perf_counter() - start, embeddings, config["configurable"]["retriever"]
+
+
+@pytest.mark.asyncio
+async def test_speculative_retrieval_kept_or_reissued(monkeypatch):
+    """
+    Speculative documents are kept for a close rewrite and re-issued for a diverging one.
+    """
+    pipeline_metrics.reset()
+
+    # === Close rewrite (cos ~ 0.999): speculation kept, doc_retriever does not search again ===
+    state, _, _, retriever = await _run(monkeypatch, "How does it compare to Q2?", "How did Q3 revenue compare to Q2?")
+    assert [d.page_content for d in resolve_refs(state["documents"], retriever)] == ["revenue"]
+    assert state["retrieved_for"] == "How did Q3 revenue compare to Q2?"
+
+    # === Diverging rewrite: re-issued with the rephrased vector ===
+    state, _, _, retriever = await _run(monkeypatch, "What is the refund policy for it?", "Which supplier caused the delay?")
+    assert [d.page_content for d in resolve_refs(state["documents"], retriever)] == ["supplier"], "❌ Retrieval not re-issued."
+    assert all(is_ref(ref) and "page_content" not in ref for ref in state["documents"]), "❌ State should hold chunk references."
+
+    counters = pipeline_metrics.snapshot()
+    assert counters["speculative_retrieval.kept_similar"] == 1
+    assert counters["speculative_retrieval.reissued"] == 1
+    print("✅ test_speculative_retrieval_kept_or_reissued passed!")
+
+
+@pytest.mark.asyncio
+async def test_speculative_retrieval_hides_retrieval_latency(monkeypatch):
+    """
+    Retrieval overlaps with the rewriter call, and the rephrased-question embedding
+    is computed once for the comparison, the answer cache and the retriever.
+    """
+    # === Rewrite equal up to case/spacing: the whole retrieval hides behind the LLM call ===
+    state, elapsed, embeddings, _ = await _run(
+        monkeypatch,
+        "How does it compare to Q2?",
+        "how does it  compare to Q2?",
+        embed_delay = 0.15,
+        llm_delay = 0.3
+    )
+    assert state["documents"] and embeddings.calls == 1
+    assert elapsed < 0.3 + 0.1, f"❌ Retrieval was not overlapped: {elapsed:.2f}s"
+
+    # === Close rewrite: one extra embedding, shared with the answer cache lookup ===
+    embeddings = SlowEmbeddings()
+    config = {"configurable": {"retriever": _retriever(embeddings), "answer_cache": AnswerCache(), "thread_id": "s1"}}
+    monkeypatch.setattr(
+        query_rewriter, "get_llm_clients",
+        lambda config: FakeClients(FakeRewriter("How did Q3 revenue compare to Q2?", 0.0))
+    )
+    state = await query_rewriter.query_rewriter({"question": "How does it compare to Q2?", "messages": HISTORY}, config)
+    state = await answer_cache_lookup(state, config)
+    state = await doc_retriever(state, config)
+    assert embeddings.calls == 2, f"❌ Expected 2 embedding calls, saw {embeddings.calls}."
+    print("✅ test_speculative_retrieval_hides_retrieval_latency passed!")
@@ -0,0 +1,95 @@
+import os
+import numpy as np
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_openai import OpenAIEmbeddings
+
+from rag_pipeline.components import retriever as retriever_module
+from rag_pipeline.components.embedding_cache import CachedEmbeddings, EmbeddingCache
+from rag_pipeline.components.retriever import embedding_cache_name, get_ingestion_embeddings
+
+
+# === Fake embedder that counts the texts it is asked to embed ===
+class CountingEmbeddings(DeterministicFakeEmbedding):
+    embedded: int = 0
+
+    def embed_documents(self, texts):
+        self.embedded += len(texts)
+        return super().embed_documents(texts)
+
+
+def test_only_cache_misses_reach_the_embedding_model(tmp_path):
+    """
+    Re-embedding the same (whitespace-normalized) chunks is served from the on-disk cache.
+    """
+    base = CountingEmbeddings(size = 8)
+    cached = CachedEmbeddings(base, EmbeddingCache(tmp_path, "fake-model"))
+
+    texts = ["Revenue grew 12%.", "Boilerplate footer.", "Boilerplate footer."]
+    first = cached.embed_documents(texts)
+
+    # === Duplicate chunks in one upload are embedded once ===
+    assert base.embedded == 2, f"❌ Expected 2 embedded chunks, got {base.embedded}."
+    assert first[1] == first[2]
+
+    # === A fresh process (new cache object) reuses the persisted vectors ===
+    base_again = CountingEmbeddings(size = 8)
+    cached_again = CachedEmbeddings(base_again, EmbeddingCache(tmp_path, "fake-model"))
+    second = cached_again.embed_documents(["Revenue   grew 12%.\n", "New chunk."])
+
+    assert base_again.embedded == 1, "❌ Only the new chunk should be embedded."
+    assert cached_again.stats == {"hits": 1, "misses": 1}
+    assert cached_again.hit_ratio() == 0.5
+    assert [round(x, 5) for x in second[0]] == [round(x, 5) for x in first[0]], "❌ Cached vector differs."
+
+    # === Caches are separated per embedding model ===
+    other_model = CachedEmbeddings(CountingEmbeddings(size = 8), EmbeddingCache(tmp_path, "other-model"))
+    other_model.embed_documents(["Revenue grew 12%."])
+    assert other_model.stats["misses"] == 1
+
+    print("✅ test_only_cache_misses_reach_the_embedding_model passed!")
+
+
+def test_cache_is_keyed_by_the_injected_embedder(tmp_path, monkeypatch):
+    """
+    An injected embedder gets its own cache folder, so it cannot change the
+    dimension of the default model's cache.
+    """
+    monkeypatch.setattr(retriever_module, "get_settings", lambda section: {"enabled": True, "cache_dir": str(tmp_path)})
+
+    small = get_ingestion_embeddings(embeddings = DeterministicFakeEmbedding(size = 8))
+    large = get_ingestion_embeddings(embeddings = DeterministicFakeEmbedding(size = 16))
+    small.embed_documents(["Revenue grew 12%."])
+    large.embed_documents(["Revenue grew 12%."])
+
+    assert small.cache.path != large.cache.path, "❌ Embedders of different sizes must not share a cache."
+    assert large.stats["misses"] == 1 and len(large.embed_documents(["Revenue grew 12%."])[0]) == 16
+    assert not (tmp_path / "text-embedding-3-small").exists(), "❌ Fake embeddings leaked into the default model's cache."
+
+    monkeypatch.setenv("OPENAI_API_KEY", os.getenv("OPENAI_API_KEY") or "test-key")
+    assert embedding_cache_name(OpenAIEmbeddings(model = "text-embedding-3-small")) == "text-embedding-3-small"
+
+    print("✅ test_cache_is_keyed_by_the_injected_embedder passed!")
+
+
+def test_torn_append_is_dropped(tmp_path):
+    """
+    Vectors written without their keys (a crash mid-append) are truncated before the
+    next append, so new keys still map to their own vectors.
+    """
+    base = CountingEmbeddings(size = 8)
+    cache = EmbeddingCache(tmp_path, "fake-model")
+    CachedEmbeddings(base, cache).embed_documents(["First chunk."])
+
+    # === Crash between the vector and the key write ===
+    with open(cache.vectors_path, "ab") as f:
+        f.write(np.ones((1, 8), dtype = np.float32).tobytes())
+
+    restarted = CachedEmbeddings(base, EmbeddingCache(tmp_path, "fake-model"))
+    restarted.embed_documents(["Second chunk."])
+
+    fresh = CachedEmbeddings(base, EmbeddingCache(tmp_path, "fake-model"))
+    vectors = fresh.embed_documents(["First chunk.", "Second chunk."])
+    assert fresh.stats == {"hits": 2, "misses": 0}
+    assert np.allclose(vectors, base.embed_documents(["First chunk.", "Second chunk."]), atol = 1e-6), "❌ A key points at the wrong vector."
+
+    print("✅ test_torn_append_is_dropped passed!")
@@ -0,0 +1,58 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.synthetic import write_synthetic_pdf
+from rag_pipeline.utils import extract_doc
+from rag_pipeline.utils.extract_doc import extract_from_pdf, extract_from_pdf_parallel
+
+
+def test_parallel_pdf_extraction_matches_serial(tmp_path):
+    """
+    Page-range extraction on a process pool returns exactly the serial output, in the same order.
+    """
+    # === Prepare a small synthetic corpus ===
+    write_synthetic_pdf(tmp_path / "b_report.pdf", n_pages = 7, lines_per_page = 8, seed = 2)
+    write_synthetic_pdf(tmp_path / "a_report.pdf", n_pages = 10, lines_per_page = 8, seed = 1)
+
+    serial = extract_from_pdf(folder_path = tmp_path, parallel = False)
+    parallel = extract_from_pdf_parallel(
+        pdf_files = sorted(tmp_path.glob("*.pdf")),
+        max_workers = 2,
+        pages_per_task = 3
+    )
+
+    # === Same texts/tables/file_metadata shape and content ===
+    assert parallel == serial, "❌ Parallel extraction differs from serial extraction."
+
+    texts, tables, metadata = parallel
+    assert len(texts) == 17 and len(tables) == 17
+    assert [m["file_name"] for m in metadata] == ["a_report.pdf", "b_report.pdf"]
+    assert [t["metadata"]["page_number"] for t in texts[:10]] == list(range(1, 11)), "❌ Pages out of order."
+    assert metadata[0]["total_tables"] == 10
+
+    print("✅ test_parallel_pdf_extraction_matches_serial passed!")
+
+
+def test_process_pool_is_created_once_under_concurrency(monkeypatch):
+    """
+    Ingestion threads asking for the pool at the same time all get the same one.
+    """
+    created = []
+
+    class SlowPool:
+        def __init__(self, **kwargs):
+            time.sleep(0.05)
+            created.append(self)
+
+        def shutdown(self, wait = True):
+            pass
+
+    monkeypatch.setattr(extract_doc, "ProcessPoolExecutor", SlowPool)
+    monkeypatch.setattr(extract_doc, "_process_pool", None)
+    monkeypatch.setattr(extract_doc, "_process_pool_workers", None)
+
+    with ThreadPoolExecutor(max_workers = 4) as threads:
+        pools = list(threads.map(lambda _: extract_doc._get_process_pool(2), range(4)))
+
+    assert len(created) == 1 and all(pool is created[0] for pool in pools), "❌ Concurrent callers started several pools."
+    print("✅ test_process_pool_is_created_once_under_concurrency passed!")
@@ -0,0 +1,67 @@
+import pytest
+from typing import TypedDict
+from langgraph.graph import StateGraph, END
+
+from rag_pipeline.agents import generation
+
+
+class FakeStreamLLM:
+    """
+    Streams the partial objects a JSON-mode model would produce.
+    """
+    def __init__(self, answer, answer_history):
+        self.partials = [{}] + [{"answer": answer[:i]} for i in range(1, len(answer) + 1, 4)]
+        self.partials += [{"answer": answer}, {"answer": answer, "answer_history": answer_history}]
+
+    async def astream(self, messages):
+        for partial in self.partials:
+            yield partial
+
+
+class FakeClients:
+    def get_json_stream(self, model_name, temperature, schema):
+        return FakeStreamLLM("Retrieval first, then generation.", "Retrieve, then generate.")
+
+
+class State(TypedDict, total = False):
+    rephrased_question: str
+    documents: list
+    messages: dict
+    generated_answer: str
+
+
+@pytest.mark.asyncio
+async def test_answer_generation_streams_tokens_through_graph():
+    """
+    Inside a graph, answer_generation emits answer deltas as custom stream events
+    that concatenate to the final answer.
+    """
+    workflow = StateGraph(State)
+    workflow.add_node("answer_generation_node", generation.answer_generation)
+    workflow.set_entry_point("answer_generation_node")
+    workflow.add_edge("answer_generation_node", END)
+    graph = workflow.compile()
+
+    deltas, final = [], None
+    async for mode, chunk in graph.astream(
+        {"rephrased_question": "What is RAG?", "documents": ["RAG retrieves, then generates."]},
+        config = {"configurable": {"llm_clients": FakeClients()}},
+        stream_mode = ["custom", "values"]
+    ):
+        if mode == "custom":
+            deltas.append(chunk["delta"])
+        else:
+            final = chunk
+
+    assert len(deltas) > 1, "❌ Answer was not streamed in pieces."
+    assert "".join(deltas) == final["generated_answer"] == "Retrieval first, then generation."
+    assert final["messages"], "❌ Chat memory not updated."
+
+    # === Outside a graph the agent still works (no stream consumer) ===
+    state = await generation.answer_generation(
+        {"rephrased_question": "q", "documents": []},
+        config = {"configurable": {"llm_clients": FakeClients()}}
+    )
+    assert state["generated_answer"] == "Retrieval first, then generation."
+
+    print("✅ test_answer_generation_streams_tokens_through_graph passed!")
@@ -0,0 +1,277 @@
+import time
+import asyncio
+import pytest
+from langchain_core.documents import Document
+
+from rag_pipeline.agents import grader
+from rag_pipeline.schema.schema import DocGrader, DocGraderBatch, GradedChunk
+from rag_pipeline.utils.metrics import pipeline_metrics
+
+
+# === Fake LLM with injected latency ===
+class FakeGraderLLM:
+    def __init__(self, delays, failing = ()):
+        self.delays = delays
+        self.failing = failing
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def with_structured_output(self, schema):
+        return self
+
+    async def ainvoke(self, messages):
+        content = messages[-1].content
+        doc_id = next(k for k in self.delays if k in content)
+
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays[doc_id])
+        finally:
+            self.in_flight -= 1
+
+        if doc_id in self.failing:
+            raise RuntimeError("grader unavailable")
+
+        return DocGrader(score = "No" if doc_id.endswith("_no") else "Yes")
+
+
+# === Fake batched grader LLM ===
+class FakeBatchLLM:
+    def __init__(self, scores, per_document):
+        self.scores = scores
+        self.per_document = per_document
+        self.calls = 0
+
+    def with_structured_output(self, schema):
+        return self if schema is DocGraderBatch else self.per_document
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        return DocGraderBatch(
+            grades = [GradedChunk(index = i, score = s) for i, s in enumerate(self.scores)]
+        )
+
+
+# === Fake LLM client registry ===
+class FakeClients:
+    def __init__(self, fake):
+        self.fake = fake
+
+    def get_structured(self, model_name, temperature, schema):
+        return self.fake.with_structured_output(schema)
+
+
+def _install_fake(monkeypatch, fake, **settings):
+    monkeypatch.setattr(grader, "get_llm_clients", lambda config: FakeClients(fake))
+    monkeypatch.setattr(
+        grader.ModelConfig,
+        "get_agent_settings",
+        lambda self, agent_name: settings
+    )
+
+
+# === Concurrent grading ===
+@pytest.mark.asyncio
+async def test_doc_grader_wall_time_bounded_by_slowest_call(monkeypatch):
+    """
+    Five graders with injected latency should take about as long as the slowest one.
+    """
+    delays = {
+        "doc_a": 0.2,
+        "doc_b_no": 0.1,
+        "doc_c": 0.3,
+        "doc_d": 0.1,
+        "doc_e_no": 0.2
+    }
+    fake = FakeGraderLLM(delays)
+    _install_fake(monkeypatch, fake, max_concurrency = 5)
+
+    state = {
+        "rephrased_question": "What is RAG?",
+        "documents": [Document(page_content = f"content of {k}") for k in delays]
+    }
+
+    start = time.perf_counter()
+    result = await grader.doc_grader(state)
+    elapsed = time.perf_counter() - start
+
+    # === Bounded by the slowest call (0.3s), not the sum (0.9s) ===
+    assert elapsed < 0.6, f"❌ Grading took {elapsed:.2f}s, expected concurrent execution."
+
+    # === Original order is preserved ===
+    kept = [d.page_content for d in result["documents"]]
+    assert kept == ["content of doc_a", "content of doc_c", "content of doc_d"], "❌ Order not preserved."
+    assert result["proceed_to_generate"] is True
+
+    print("✅ test_doc_grader_wall_time_bounded_by_slowest_call passed!")
+
+
+@pytest.mark.asyncio
+async def test_doc_grader_respects_concurrency_limit(monkeypatch):
+    """
+    No more than `max_concurrency` grader calls should be in flight at once.
+    """
+    delays = {f"doc_{i}": 0.05 for i in range(6)}
+    fake = FakeGraderLLM(delays)
+    _install_fake(monkeypatch, fake, max_concurrency = 2)
+
+    state = {
+        "rephrased_question": "q",
+        "documents": [Document(page_content = f"content of {k}") for k in delays]
+    }
+    await grader.doc_grader(state)
+
+    assert fake.max_in_flight == 2, f"❌ Expected 2 in-flight calls, saw {fake.max_in_flight}."
+    print("✅ test_doc_grader_respects_concurrency_limit passed!")
+
+
+@pytest.mark.asyncio
+async def test_doc_grader_handles_per_document_failures(monkeypatch):
+    """
+    A failing grader call must not fail the whole query.
+    """
+    delays = {"doc_a": 0.0, "doc_b": 0.0}
+    fake = FakeGraderLLM(delays, failing = ("doc_b",))
+
+    # === Failed documents are kept by default ===
+    _install_fake(monkeypatch, fake, on_error = "keep")
+    state = {
+        "rephrased_question": "q",
+        "documents": [Document(page_content = f"content of {k}") for k in delays]
+    }
+    result = await grader.doc_grader(state)
+    assert len(result["documents"]) == 2, "❌ Failed document should be kept."
+
+    # === ...or dropped when configured ===
+    _install_fake(monkeypatch, fake, on_error = "drop")
+    state["documents"] = [Document(page_content = f"content of {k}") for k in delays]
+    result = await grader.doc_grader(state)
+    assert [d.page_content for d in result["documents"]] == ["content of doc_a"], "❌ Failed document should be dropped."
+
+    print("✅ test_doc_grader_handles_per_document_failures passed!")
+
+
+# === Batched grading ===
+@pytest.mark.asyncio
+async def test_doc_grader_batch_mode_uses_single_call(monkeypatch):
+    """
+    In batch mode all chunks are graded by one request, mapped back by index.
+    """
+    per_document = FakeGraderLLM({})
+    fake = FakeBatchLLM(["Yes", "No", "Yes"], per_document)
+    _install_fake(monkeypatch, fake, grading_mode = "batch")
+
+    state = {
+        "rephrased_question": "q",
+        "documents": [Document(page_content = f"chunk {i}") for i in range(3)]
+    }
+    result = await grader.doc_grader(state)
+
+    assert fake.calls == 1, "❌ Batch mode should issue exactly one grader request."
+    assert [d.page_content for d in result["documents"]] == ["chunk 0", "chunk 2"], "❌ Verdicts not mapped by index."
+    print("✅ test_doc_grader_batch_mode_uses_single_call passed!")
+
+
+@pytest.mark.asyncio
+async def test_doc_grader_batch_mode_falls_back_on_wrong_length(monkeypatch):
+    """
+    A batched output with the wrong number of verdicts falls back to per-document grading.
+    """
+    per_document = FakeGraderLLM({"doc_a": 0.0, "doc_b_no": 0.0})
+    fake = FakeBatchLLM(["Yes"], per_document)
+    _install_fake(monkeypatch, fake, grading_mode = "batch")
+
+    state = {
+        "rephrased_question": "q",
+        "documents": [Document(page_content = f"content of {k}") for k in ("doc_a", "doc_b_no")]
+    }
+    result = await grader.doc_grader(state)
+
+    assert fake.calls == 1
+    assert [d.page_content for d in result["documents"]] == ["content of doc_a"], "❌ Fallback grading not applied."
+    print("✅ test_doc_grader_batch_mode_falls_back_on_wrong_length passed!")
+
+
+# === Local grading ===
+@pytest.mark.asyncio
+async def test_doc_grader_local_mode_sends_only_borderline_to_llm(monkeypatch):
+    """
+    Confident chunks are decided from scores; borderline and unscored chunks go to the LLM.
+    """
+    fake = FakeGraderLLM({"doc_border": 0.0, "doc_unscored_no": 0.0})
+    _install_fake(
+        monkeypatch, fake,
+        grading_mode = "local",
+        local = {"lexical_weight": 0.0, "accept_threshold": 0.67, "reject_threshold": 0.50}
+    )
+
+    scores = {"doc_high": 0.8, "doc_low": 0.3, "doc_border": 0.6, "doc_unscored_no": None}
+    state = {
+        "rephrased_question": "What was Q3 revenue?",
+        "documents": [
+            Document(page_content = f"content of {k}", metadata = {} if s is None else {"retrieval_score": s})
+            for k, s in scores.items()
+        ]
+    }
+    pipeline_metrics.reset()
+    result = await grader.doc_grader(state)
+
+    counters = pipeline_metrics.snapshot()
+    assert counters["grader.local_decided"] == 2 and counters["grader.llm_calls"] == 2, f"❌ {counters}"
+    assert [d.page_content for d in result["documents"]] == ["content of doc_high", "content of doc_border"]
+    print("✅ test_doc_grader_local_mode_sends_only_borderline_to_llm passed!")
+
+
+def test_local_grader_agrees_with_llm_on_fixture():
+    """
+    The configured local thresholds agree with the LLM verdicts on the calibration
+    fixture they were tuned on, and still mostly agree on the held-out fixture.
+    """
+    from benchmarks.eval_local_grader import load_fixture, evaluate, HOLDOUT
+    from rag_pipeline.components.models import ModelConfig
+
+    settings = ModelConfig().get_agent_settings("retrieval_grader")["local"]
+
+    # === Calibration fixture: a consistency check, not an accuracy estimate ===
+    report = evaluate(load_fixture(), settings)
+    assert report["local_agreement"] >= 0.95, f"❌ Local agreement too low: {report}"
+    assert report["llm_calls_saved"] > 0
+
+    # === Held-out fixture: queries the thresholds were not tuned on ===
+    holdout = evaluate(load_fixture(HOLDOUT), settings)
+    assert holdout["local_agreement"] >= 0.85, f"❌ Held-out local agreement too low: {holdout}"
+    assert holdout["overall_agreement"] >= 0.9, f"❌ Held-out overall agreement too low: {holdout}"
+    assert holdout["llm_calls_saved"] > 0
+    print("✅ test_local_grader_agrees_with_llm_on_fixture passed!")
+
+
+@pytest.mark.asyncio
+async def test_doc_grader_resolves_chunk_references(monkeypatch):
+    """
+    Chunk references are graded on the stored text and score, and the kept ones stay references.
+    """
+    from langchain_community.vectorstores import FAISS
+    from langchain_core.embeddings import DeterministicFakeEmbedding
+
+    fake = FakeGraderLLM({"doc_border": 0.0})
+    _install_fake(
+        monkeypatch, fake,
+        grading_mode = "local",
+        local = {"lexical_weight": 0.0, "accept_threshold": 0.67, "reject_threshold": 0.50}
+    )
+
+    db = FAISS.from_texts([f"content of {k}" for k in ("doc_high", "doc_low", "doc_border")], DeterministicFakeEmbedding(size = 8))
+    ids = list(db.index_to_docstore_id.values())
+    refs = [
+        {"session_id": "s1", "chunk_id": chunk_id, "score": score}
+        for chunk_id, score in zip(ids, (0.8, 0.3, 0.6))
+    ] + [{"session_id": "s1", "chunk_id": "removed-since", "score": 0.9}]
+
+    result = await grader.doc_grader(
+        {"rephrased_question": "What was Q3 revenue?", "documents": refs},
+        config = {"configurable": {"retriever": db.as_retriever()}}
+    )
+
+    assert result["documents"] == [refs[0], refs[2]], "❌ Kept chunks should stay references."
+    print("✅ test_doc_grader_resolves_chunk_references passed!")
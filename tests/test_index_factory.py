@@ -0,0 +1,140 @@
+import faiss
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_community.vectorstores import FAISS
+
+from rag_pipeline.components import index_factory
+from rag_pipeline.components import retriever as retriever_module
+from rag_pipeline.components.index_factory import (
+    build_index,
+    build_vectorstore,
+    choose_index,
+    index_bytes,
+    index_kind,
+    needs_rebuild,
+    rebuild_vectorstore,
+    remove_from_vectorstore
+)
+from rag_pipeline.components.indexer import update_session_index
+
+
+def _vectors(n, d = 32, seed = 0):
+    vectors = np.random.default_rng(seed).standard_normal((n, d)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis = 1, keepdims = True)
+
+
+def test_choose_index_by_corpus_size():
+    """
+    Auto mode goes flat -> HNSW -> IVF with size; quantization needs enough training vectors.
+    """
+    settings = {"flat_max_vectors": 100, "hnsw_max_vectors": 1000, "quantization": "pq", "pq_m": 8, "min_train_vectors": 500}
+    assert choose_index(50, 32, settings) == ("flat", "none")
+    assert choose_index(800, 32, settings) == ("hnsw", "pq")
+    assert choose_index(5000, 32, settings) == ("ivf", "pq")
+    assert choose_index(5000, 30, settings) == ("ivf", "sq8"), "❌ PQ needs pq_m to divide the dimension."
+    assert choose_index(50, 32, {**settings, "type": "hnsw"}) == ("hnsw", "none")
+    print("✅ test_choose_index_by_corpus_size passed!")
+
+
+@pytest.mark.parametrize("settings, kind", [
+    ({"type": "flat"}, ("flat", "none")),
+    ({"type": "hnsw", "hnsw_m": 16}, ("hnsw", "none")),
+    ({"type": "hnsw", "hnsw_m": 16, "quantization": "sq8", "min_train_vectors": 0}, ("hnsw", "sq8")),
+    ({"type": "ivf", "ivf_nprobe": 8, "quantization": "sq8", "min_train_vectors": 0}, ("ivf", "sq8"))
+])
+def test_index_types_search_and_shrink(settings, kind):
+    """
+    Every index type finds the exact vector it was queried with; quantized ones use fewer bytes.
+    """
+    vectors = _vectors(2000)
+    index = build_index(vectors, settings)
+
+    assert index_kind(index) == kind
+    _, rows = index.search(vectors[:50], 1)
+    assert (rows[:, 0] == np.arange(50)).mean() >= 0.9, f"❌ Low recall for {kind}."
+
+    if kind[1] == "sq8":
+        unquantized = build_index(vectors, {**settings, "quantization": "none"})
+        assert index_bytes(index) < index_bytes(unquantized), "❌ Quantization did not shrink the index."
+    print(f"✅ test_index_types_search_and_shrink[{kind}] passed!")
+
+
+@pytest.mark.parametrize("settings, kind", [
+    ({"type": "flat"}, ("flat", "none")),
+    ({"type": "flat", "quantization": "sq8", "min_train_vectors": 0}, ("flat", "sq8")),
+    ({"type": "hnsw", "hnsw_m": 16}, ("hnsw", "none")),
+    ({"type": "ivf", "ivf_nprobe": 64}, ("ivf", "none")),
+    ({"type": "ivf", "ivf_nprobe": 64, "quantization": "sq8", "min_train_vectors": 0}, ("ivf", "sq8"))
+])
+def test_delete_then_search(settings, kind, monkeypatch):
+    """
+    After removing half of the chunks every index type still maps search hits to the
+    right chunks, and never returns a removed one.
+    """
+    monkeypatch.setattr(index_factory, "index_settings", lambda: settings)
+    embeddings = DeterministicFakeEmbedding(size = 32)
+    docs = [Document(page_content = f"chunk number {i}") for i in range(2000)]
+    ids = [f"c{i}" for i in range(2000)]
+
+    db = build_vectorstore(docs, embeddings, ids = ids, settings = settings)
+    assert index_kind(db.index) == kind
+    db = remove_from_vectorstore(db, embeddings, ids[:1000])
+
+    assert db.index.ntotal == 1000
+    for i in (1000, 1500, 1999):
+        found = db.similarity_search(f"chunk number {i}", k = 3)
+        assert found[0].id == f"c{i}", f"❌ {kind} returned {found[0].id} for c{i} after a delete."
+        assert all(int(doc.id[1:]) >= 1000 for doc in found), "❌ A removed chunk came back."
+    print(f"✅ test_delete_then_search[{kind}] passed!")
+
+
+def test_vectorstore_roundtrip_and_rebuild(tmp_path):
+    """
+    A non-flat index behaves like FAISS.from_documents, survives save/load and can drop vectors by rebuilding.
+    """
+    embeddings = DeterministicFakeEmbedding(size = 32)
+    docs = [Document(page_content = f"chunk number {i}") for i in range(300)]
+    ids = [f"id-{i}" for i in range(300)]
+
+    db = build_vectorstore(docs, embeddings, ids = ids, settings = {"type": "hnsw", "hnsw_m": 16})
+    assert index_kind(db.index) == ("hnsw", "none")
+    assert db.similarity_search("chunk number 42", k = 1)[0].id == "id-42"
+
+    db.save_local(str(tmp_path))
+    restored = FAISS.load_local(str(tmp_path), embeddings, allow_dangerous_deserialization = True)
+    assert isinstance(restored.index, faiss.IndexHNSW)
+    assert restored.similarity_search("chunk number 7", k = 1)[0].id == "id-7"
+
+    rebuilt = rebuild_vectorstore(restored, embeddings, drop_ids = ["id-7"], settings = {"type": "hnsw", "hnsw_m": 16})
+    assert rebuilt.index.ntotal == 299 and "id-7" not in rebuilt.index_to_docstore_id.values()
+    assert rebuilt.similarity_search("chunk number 8", k = 1)[0].id == "id-8"
+
+    assert needs_rebuild(db, {"type": "auto", "flat_max_vectors": 1000})
+    assert not needs_rebuild(db, {"type": "hnsw"})
+    print("✅ test_vectorstore_roundtrip_and_rebuild passed!")
+
+
+def test_indexer_rebuilds_hnsw_on_removal(tmp_path, monkeypatch):
+    """
+    Replacing a file of an HNSW session rebuilds the index without the stale chunks.
+    """
+    monkeypatch.setattr(retriever_module, "get_settings", lambda section: {"top_k": 10} if section == "retriever" else {})
+    monkeypatch.setattr(index_factory, "index_settings", lambda: {"type": "hnsw", "hnsw_m": 16})
+
+    session_folder = tmp_path / "data" / "session_h"
+    session_folder.mkdir(parents = True)
+    (session_folder / "a.txt").write_text("Alpha content.")
+    (session_folder / "b.txt").write_text("Bravo content.")
+
+    kwargs = dict(session_id = "session_h", session_folder = session_folder, base_dir = tmp_path / "models", embeddings = DeterministicFakeEmbedding(size = 16))
+    update_session_index(**kwargs)
+
+    (session_folder / "a.txt").write_text("Alpha rewritten.")
+    retriever, _, _ = update_session_index(**kwargs)
+
+    assert isinstance(retriever.vectorstore.index, faiss.IndexHNSW)
+    contents = sorted(doc.page_content for doc in retriever.invoke("anything"))
+    assert contents == ["Alpha rewritten.", "Bravo content."], f"❌ Stale vectors left behind: {contents}"
+    print("✅ test_indexer_rebuilds_hnsw_on_removal passed!")
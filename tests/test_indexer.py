@@ -0,0 +1,172 @@
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from rag_pipeline.components import retriever as retriever_module
+from rag_pipeline.components import indexer
+from rag_pipeline.components.indexer import update_session_index, load_manifest, replace_dir_atomically
+
+
+# === Fake embedder that counts the texts it is asked to embed ===
+class CountingEmbeddings(DeterministicFakeEmbedding):
+    embedded: int = 0
+
+    def embed_documents(self, texts):
+        self.embedded += len(texts)
+        return super().embed_documents(texts)
+
+
+@pytest.fixture(autouse = True)
+def no_embedding_cache(monkeypatch):
+    monkeypatch.setattr(retriever_module, "get_settings", lambda section: {"top_k": 10} if section == "retriever" else {})
+
+
+def test_incremental_update_only_touches_changed_files(tmp_path, monkeypatch):
+    """
+    Unchanged files are never re-extracted or re-embedded; stale vectors are removed by id.
+    """
+    session_folder = tmp_path / "data" / "session_x"
+    session_folder.mkdir(parents = True)
+    models_dir = tmp_path / "models"
+
+    (session_folder / "a.txt").write_text("Alpha paragraph one.\n\nAlpha paragraph two.")
+    (session_folder / "b.txt").write_text("Bravo content.")
+
+    # === First upload: full build ===
+    embeddings = CountingEmbeddings(size = 16)
+    retriever, metadata, changes = update_session_index(
+        session_id = "session_x",
+        session_folder = session_folder,
+        base_dir = models_dir,
+        embeddings = embeddings
+    )
+    assert sorted(changes["added"]) == ["a.txt", "b.txt"]
+    assert embeddings.embedded == 2
+    assert len(metadata) == 2
+
+    # === Second upload: a.txt replaced, b.txt deleted, c.txt added ===
+    (session_folder / "a.txt").write_text("Alpha rewritten.")
+    (session_folder / "b.txt").unlink()
+    (session_folder / "c.txt").write_text("Charlie content.")
+
+    extracted = []
+    original_build = indexer.build_file_chunks
+    monkeypatch.setattr(
+        indexer,
+        "build_file_chunks",
+        lambda file_paths, file_hashes: extracted.extend(path.name for path in file_paths) or original_build(file_paths, file_hashes)
+    )
+
+    embeddings = CountingEmbeddings(size = 16)
+    retriever, metadata, changes = update_session_index(
+        session_id = "session_x",
+        session_folder = session_folder,
+        base_dir = models_dir,
+        embeddings = embeddings
+    )
+
+    assert changes == {"added": ["c.txt"], "updated": ["a.txt"], "removed": ["b.txt"], "unchanged": []}
+    assert sorted(extracted) == ["a.txt", "c.txt"], "❌ Only new/changed files should be extracted."
+    assert embeddings.embedded == 2, "❌ Only new/changed chunks should be embedded."
+
+    contents = sorted(doc.page_content for doc in retriever.invoke("anything"))
+    assert contents == ["Alpha rewritten.", "Charlie content."], f"❌ Stale vectors left behind: {contents}"
+    assert sorted(load_manifest(models_dir / "session_x")["files"]) == ["a.txt", "c.txt"]
+
+    # === Third upload with nothing new: no extraction, no embedding ===
+    extracted.clear()
+    embeddings = CountingEmbeddings(size = 16)
+    _, _, changes = update_session_index(
+        session_id = "session_x",
+        session_folder = session_folder,
+        base_dir = models_dir,
+        embeddings = embeddings
+    )
+    assert sorted(changes["unchanged"]) == ["a.txt", "c.txt"]
+    assert extracted == [] and embeddings.embedded == 0
+
+    # === The session folder links to its one current version; nothing else is left behind ===
+    current = (models_dir / "session_x").resolve()
+    assert (models_dir / "session_x").is_symlink()
+    assert sorted(p.name for p in models_dir.iterdir()) == sorted(["session_x", current.name])
+
+    print("✅ test_incremental_update_only_touches_changed_files passed!")
+
+
+def test_files_are_extracted_together_and_split_per_file(tmp_path, monkeypatch):
+    """
+    New files go through one extraction call (so the PDF pool can spread them), and
+    each file gets back exactly the chunks and tables it yields on its own.
+    """
+    from benchmarks.synthetic import write_synthetic_pdf
+
+    for name, n_pages in (("a.pdf", 3), ("b.pdf", 5), ("c.pdf", 2)):
+        write_synthetic_pdf(tmp_path / name, n_pages = n_pages, lines_per_page = 6, seed = n_pages)
+    (tmp_path / "d.txt").write_text("Delta paragraph.")
+    paths = sorted(tmp_path.iterdir())
+    hashes = {path.name: indexer.file_sha256(path) for path in paths}
+
+    calls = []
+    original_extract = indexer.extract_data_pipeline
+    monkeypatch.setattr(
+        indexer,
+        "extract_data_pipeline",
+        lambda session_folder, files: calls.append(files) or original_extract(session_folder = session_folder, files = files)
+    )
+
+    together = indexer.build_file_chunks(paths, hashes)
+    assert len(calls) == 1, "❌ All files should be extracted in one call."
+
+    for path in paths:
+        docs, ids, metadata = together[path.name]
+        alone_docs, alone_ids, alone_metadata = indexer.build_file_chunks([path], hashes)[path.name]
+        assert ids == alone_ids and metadata == alone_metadata
+        assert [(d.page_content, d.metadata) for d in docs] == [(d.page_content, d.metadata) for d in alone_docs]
+
+    tables = [d for d in together["b.pdf"][0] if d.metadata["type"] == "table"]
+    assert len(tables) == 5 and all(d.metadata["source"] == "b.pdf" for d in tables)
+
+    print("✅ test_files_are_extracted_together_and_split_per_file passed!")
+
+
+def test_identical_files_under_different_names(tmp_path):
+    """
+    Two files with the same content get distinct chunk ids, and removing one keeps the other.
+    """
+    session_folder = tmp_path / "data" / "session_d"
+    session_folder.mkdir(parents = True)
+    (session_folder / "copy_1.txt").write_text("Same content in both files.")
+    (session_folder / "copy_2.txt").write_text("Same content in both files.")
+
+    kwargs = dict(session_id = "session_d", session_folder = session_folder, base_dir = tmp_path / "models", embeddings = DeterministicFakeEmbedding(size = 16))
+    retriever, _, _ = update_session_index(**kwargs)
+
+    files = load_manifest(tmp_path / "models" / "session_d")["files"]
+    assert not set(files["copy_1.txt"]["chunk_ids"]) & set(files["copy_2.txt"]["chunk_ids"]), "❌ Chunk ids must differ per file."
+    assert sorted(doc.metadata["source"] for doc in retriever.invoke("anything")) == ["copy_1.txt", "copy_2.txt"]
+
+    (session_folder / "copy_1.txt").unlink()
+    retriever, _, _ = update_session_index(**kwargs)
+    assert [doc.metadata["source"] for doc in retriever.invoke("anything")] == ["copy_2.txt"]
+
+    print("✅ test_identical_files_under_different_names passed!")
+
+
+def test_index_swap_publishes_complete_versions(tmp_path):
+    """
+    Each swap replaces the session link with a complete new version and removes the
+    previous one; a folder written by earlier versions (no symlink) is migrated.
+    """
+    final_dir = tmp_path / "session_s"
+    final_dir.mkdir()
+    (final_dir / "index.faiss").write_text("v0")
+
+    for version in ("v1", "v2", "v3"):
+        tmp_dir = tmp_path / f".session_s.tmp-{version}"
+        tmp_dir.mkdir()
+        (tmp_dir / "index.faiss").write_text(version)
+        replace_dir_atomically(tmp_dir = tmp_dir, final_dir = final_dir)
+
+        assert final_dir.is_symlink() and (final_dir / "index.faiss").read_text() == version
+        assert sorted(p.name for p in tmp_path.iterdir()) == sorted(["session_s", final_dir.resolve().name]), "❌ Old versions should be removed."
+
+    print("✅ test_index_swap_publishes_complete_versions passed!")
@@ -0,0 +1,33 @@
+import asyncio
+import pytest
+
+from rag_pipeline.components.jobs import IngestionJobManager
+
+
+@pytest.mark.asyncio
+async def test_session_jobs_run_in_order_and_release_their_lock():
+    """
+    Jobs of one session never overlap, and no session lock outlives its jobs,
+    whether they complete or fail.
+    """
+    manager = IngestionJobManager(max_workers = 1)
+    running, overlaps = set(), []
+
+    async def work(job):
+        if job.session_id in running:
+            overlaps.append(job.session_id)
+        running.add(job.session_id)
+        await asyncio.sleep(0.01)
+        running.discard(job.session_id)
+        if job.session_id.endswith("_bad"):
+            raise RuntimeError("extraction failed")
+
+    jobs = [manager.create(session_id) for session_id in ("s1", "s1", "s1", "s2_bad", "s2_bad")]
+    await asyncio.gather(*(manager.run(job, work) for job in jobs))
+
+    assert overlaps == [], "❌ Jobs of the same session overlapped."
+    assert [job.status for job in jobs] == ["completed"] * 3 + ["failed"] * 2
+    assert manager._session_locks == {} and manager._session_waiters == {}, "❌ Session locks leaked."
+
+    manager.executor.shutdown(wait = False)
+    print("✅ test_session_jobs_run_in_order_and_release_their_lock passed!")
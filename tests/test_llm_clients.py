@@ -0,0 +1,131 @@
+import json
+import threading
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from langchain_core.messages import HumanMessage
+
+from rag_pipeline.components.llm_clients import LLMClientRegistry
+from rag_pipeline.schema.schema import AnswerGeneration, DocGrader, QueryRewrite
+
+
+# === Local OpenAI-compatible stub server ===
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections = set()
+    requests = 0
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        StubHandler.connections.add(self.client_address)
+        StubHandler.requests += 1
+
+        # === Answer with a JSON object matching the requested schema ===
+        schema_name = body.get("response_format", {}).get("json_schema", {}).get("name")
+        content = {"score": "Yes"} if schema_name == "DocGrader" else {"rephrased_question": "stubbed"}
+        if schema_name == "AnswerGeneration":
+            content = {"answer": "RAG retrieves documents first.", "answer_history": "RAG retrieves first."}
+
+        if body.get("stream"):
+            return self.send_stream(body, json.dumps(content))
+
+        payload = json.dumps({
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": 0,
+            "model": body["model"],
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": json.dumps(content)},
+                "finish_reason": "stop"
+            }],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2}
+        }).encode()
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def send_stream(self, body, content):
+        # === Stream the JSON text as SSE deltas of 5 characters ===
+        events = [
+            {"id": "chatcmpl-stub", "object": "chat.completion.chunk", "created": 0, "model": body["model"],
+             "choices": [{"index": 0, "delta": {"role": "assistant", "content": content[i:i + 5]}, "finish_reason": None}]}
+            for i in range(0, len(content), 5)
+        ]
+        payload = "".join(f"data: {json.dumps(event)}\n\n" for event in events) + "data: [DONE]\n\n"
+        payload = payload.encode()
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    StubHandler.connections = set()
+    StubHandler.requests = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target = server.serve_forever, daemon = True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1"
+    server.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_registry_caches_runnables_and_reuses_connections(stub_server):
+    """
+    Runnables are cached per (model, temperature, schema) and share one keep-alive connection.
+    """
+    registry = LLMClientRegistry(base_url = stub_server, api_key = "test-key")
+
+    # === Cached per key ===
+    grader_llm = registry.get_structured("gpt-4o-mini", 0.0, DocGrader)
+    assert grader_llm is registry.get_structured("gpt-4o-mini", 0.0, DocGrader), "❌ Runnable not cached."
+    assert grader_llm is not registry.get_structured("gpt-4o-mini", 0.0, QueryRewrite)
+    assert registry.get_chat_model("gpt-4o-mini", 0.0) is registry.get_chat_model("gpt-4o-mini", 0)
+
+    # === Sequential calls across schemas reuse the same pooled connection ===
+    for _ in range(3):
+        result = await grader_llm.ainvoke([HumanMessage(content = "doc")])
+        assert result.score == "Yes"
+
+    rewrite = await registry.get_structured("gpt-4o-mini", 0.0, QueryRewrite).ainvoke(
+        [HumanMessage(content = "q")]
+    )
+    assert rewrite.rephrased_question == "stubbed"
+
+    assert StubHandler.requests == 4
+    assert len(StubHandler.connections) == 1, f"❌ Expected 1 reused connection, saw {len(StubHandler.connections)}."
+
+    await registry.aclose()
+    print("✅ test_registry_caches_runnables_and_reuses_connections passed!")
+
+
+
+@pytest.mark.asyncio
+async def test_json_stream_yields_growing_partial_objects(stub_server):
+    """
+    The streaming JSON runnable yields partial dicts whose `answer` grows token by token.
+    """
+    registry = LLMClientRegistry(base_url = stub_server, api_key = "test-key")
+    llm = registry.get_json_stream("gpt-4o-mini", 0.0, AnswerGeneration)
+    assert llm is registry.get_json_stream("gpt-4o-mini", 0.0, AnswerGeneration), "❌ Runnable not cached."
+
+    answers = [
+        partial.get("answer", "")
+        async for partial in llm.astream([HumanMessage(content = "What is RAG?")])
+    ]
+
+    assert len(set(answers)) > 3, f"❌ Answer was not streamed incrementally: {answers}"
+    assert all(a.startswith(b) for a, b in zip(answers[1:], answers)), "❌ Partial answers do not grow."
+    assert answers[-1] == "RAG retrieves documents first."
+
+    await registry.aclose()
+    print("✅ test_json_stream_yields_growing_partial_objects passed!")
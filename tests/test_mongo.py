@@ -0,0 +1,128 @@
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+from pymongo.asynchronous.collection import AsyncCollection
+
+import main
+from rag_pipeline.components import mongo
+from rag_pipeline.components.mongo import InMemoryDataStore, MongoDataStore, SessionRepository, bulk_upsert
+from rag_pipeline.components.upload import upload_file_metadata
+
+
+@pytest.mark.asyncio
+async def test_in_memory_repository():
+    """
+    The in-memory stand-in upserts, bulk-upserts, reads and deletes sessions like MongoDB.
+    """
+    store = InMemoryDataStore()
+    metadata = [{"file_name": "sample.pdf", "type": "pdf", "size_kb": 100, "total_pages": 2}]
+
+    result = await upload_file_metadata("s1", metadata, repository = store)
+    assert result["session_id"] == "s1" and result["uploaded_files"] == metadata
+    assert (await store.get_file_metadata("s1"))["uploaded_files"] == metadata
+
+    count = await store.bulk_upsert_file_metadata([
+        {"session_id": "s1", "uploaded_files": []},
+        {"session_id": "s2", "uploaded_files": metadata}
+    ])
+    assert count == 2
+    assert (await store.get_file_metadata("s1"))["uploaded_files"] == [], "❌ Bulk upsert should overwrite."
+    assert "uploaded_at" in await store.get_file_metadata("s1"), "❌ Upsert should keep unset fields."
+
+    config = {"configurable": {"thread_id": "s2", "checkpoint_ns": ""}}
+    saver = store.checkpointer()
+    assert store.checkpointer() is saver, "❌ One checkpointer per data store."
+    await store.delete_session("s2")
+    assert await store.get_file_metadata("s2") is None
+    assert await saver.aget_tuple(config) is None
+
+    # === An incomplete implementation fails when it is created ===
+    class NoCheckpoints(SessionRepository):
+        async def ensure_indexes(self): ...
+    with pytest.raises(TypeError):
+        NoCheckpoints()
+
+    print("✅ test_in_memory_repository passed!")
+
+
+@pytest.mark.asyncio
+async def test_mongo_store_pool_and_indexes(monkeypatch):
+    """
+    One client with the configured pool limits; index bootstrap creates the unique
+    session_id index and the checkpoint thread-key indexes.
+    """
+    created = []
+
+    async def fake_create_index(self, keys, **kwargs):
+        created.append((self.name, keys, kwargs.get("unique")))
+
+    monkeypatch.setattr(AsyncCollection, "create_index", fake_create_index)
+
+    store = MongoDataStore(
+        uri = "mongodb://localhost:27017",
+        db_name = "rag",
+        uploads_collection = "uploads",
+        checkpoint_collection = "checkpoints",
+        writes_collection = "writes",
+        max_pool_size = 7,
+        min_pool_size = 1
+    )
+    pool = store.client.options.pool_options
+    assert (pool.max_pool_size, pool.min_pool_size) == (7, 1), "❌ Pool limits not applied."
+
+    await store.ensure_indexes()
+    assert created == [
+        ("uploads", [("session_id", 1)], True),
+        ("checkpoints", mongo.CHECKPOINT_KEYS, True),
+        ("writes", mongo.WRITES_KEYS, True)
+    ]
+
+    saver = store.checkpointer()
+    assert getattr(saver, "backing", saver).client is store.client, "❌ Checkpointer should share the client."
+    await store.aclose()
+
+    print("✅ test_mongo_store_pool_and_indexes passed!")
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_single_round_trip():
+    """
+    bulk_upsert sends every record in one unordered bulk write.
+    """
+    class FakeCollection:
+        def __init__(self):
+            self.calls = []
+
+        async def bulk_write(self, operations, ordered = True):
+            self.calls.append((operations, ordered))
+            return type("Result", (), {"upserted_count": 2, "modified_count": 1})()
+
+    collection = FakeCollection()
+    records = [{"session_id": f"s{i}", "uploaded_files": []} for i in range(3)]
+    assert await bulk_upsert(collection, records) == 3
+    assert len(collection.calls) == 1 and len(collection.calls[0][0]) == 3
+    assert collection.calls[0][1] is False
+    assert await bulk_upsert(collection, []) == 0 and len(collection.calls) == 1
+
+    print("✅ test_bulk_upsert_single_round_trip passed!")
+
+
+def test_lifespan_shares_data_store(monkeypatch):
+    """
+    The app creates one data store at startup; the graph checkpoints through it and
+    metadata uploads reach it without a client of their own.
+    """
+    monkeypatch.setattr(mongo, "get_settings", lambda section: {"backend": "memory"})
+    mongo.set_data_store(None)
+
+    with TestClient(main.app):
+        store = main.app.state.data
+        assert isinstance(store, InMemoryDataStore)
+        assert main.app.state.graph.checkpointer is store.checkpointer()
+
+        asyncio.run(upload_file_metadata("s1", [{"file_name": "a.txt"}]))
+        assert store.uploads["s1"]["uploaded_files"] == [{"file_name": "a.txt"}]
+
+    assert mongo._store is None, "❌ Shutdown should drop the data store."
+
+    print("✅ test_lifespan_shares_data_store passed!")
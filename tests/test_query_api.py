@@ -1,5 +1,8 @@
+import json
 from fastapi.testclient import TestClient
 from main import app
+from rag_pipeline.components.retriever_manager import RetrieverManager
+from rag_pipeline.components.jobs import IngestionJobManager
 
 client = TestClient(app)
 
@@ -9,13 +12,13 @@ def test_query_endpoint(monkeypatch):
     """
 
     # === Mock retriever for session ===
-    app.state.retrievers = {
-        "session_001": "mock_retriever"
-    }
+    app.state.retrievers = RetrieverManager()
+    app.state.retrievers["session_001"] = "mock_retriever"
 
     # === Mock LangGraph class ===
     class MockGraph:
-        async def ainvoke(self, input, config):
+        async def ainvoke(self, input, config, durability = None):
+            assert durability == "exit", "❌ Runs should checkpoint once by default."
             return {
                 "generated_answer": "Mock answer for testing"
             }
@@ -40,4 +43,67 @@ def test_query_endpoint(monkeypatch):
     assert "answer" in data, "❌ 'answer' key missing in response."
     assert data["answer"] == "Mock answer for testing", "❌ Mock answer mismatch."
 
-    print("✅ test_query_endpoint passed!")
\ No newline at end of file
+    print("✅ test_query_endpoint passed!")
+
+
+def test_query_endpoint_session_not_ready(tmp_path):
+    """
+    Querying a session whose first ingestion is still running returns a "not ready" response.
+    """
+    app.state.retrievers = RetrieverManager(base_dir = tmp_path)
+    app.state.jobs = IngestionJobManager(max_workers = 1)
+    app.state.jobs.create("session_busy")
+
+    response = client.post("/query/", json = {"session_id": "session_busy", "user_query": "What is RAG?"})
+    data = response.json()
+
+    assert data["status"] == "not_ready", f"❌ Expected not_ready, got {data}"
+    assert "still being ingested" in data["message"]
+
+    # === An unknown session is a plain failure ===
+    data = client.post("/query/", json = {"session_id": "session_none", "user_query": "q"}).json()
+    assert data["status"] == "failure"
+
+    print("✅ test_query_endpoint_session_not_ready passed!")
+
+
+def test_query_stream_endpoint():
+    """
+    /query/stream emits node events, answer tokens and a final `done` event with time to first token.
+    """
+    app.state.retrievers = RetrieverManager()
+    app.state.retrievers["session_001"] = "mock_retriever"
+
+    class MockStreamGraph:
+        async def astream(self, input, config, stream_mode, durability = None):
+            assert config["configurable"]["retriever"] == "mock_retriever"
+            yield "updates", {"query_rewriter_node": {"rephrased_question": "What is RAG?"}}
+            for delta in ["Mock ", "streamed ", "answer"]:
+                yield "custom", {"type": "token", "delta": delta}
+            yield "updates", {"answer_generation_node": {"generated_answer": "Mock streamed answer"}}
+
+    app.state.graph = MockStreamGraph()
+
+    response = client.post("/query/stream", json = {"session_id": "session_001", "user_query": "What is RAG?"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    # === Parse server-sent events ===
+    events = []
+    for block in response.text.strip().split("\n\n"):
+        name, data = block.split("\n", 1)
+        events.append((name[len("event: "):], json.loads(data[len("data: "):])))
+
+    names = [name for name, _ in events]
+    assert names == ["node", "token", "token", "token", "node", "done"], f"❌ Unexpected events: {names}"
+    assert "".join(data["delta"] for name, data in events if name == "token") == "Mock streamed answer"
+
+    done = events[-1][1]
+    assert done["answer"] == "Mock streamed answer"
+    assert done["ttft_ms"] is not None and done["ttft_ms"] <= done["total_ms"]
+
+    # === Unknown sessions end the stream with an error event ===
+    response = client.post("/query/stream", json = {"session_id": "session_none", "user_query": "q"})
+    assert response.text.startswith("event: error")
+
+    print("✅ test_query_stream_endpoint passed!")
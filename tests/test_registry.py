@@ -0,0 +1,84 @@
+import os
+import pytest
+from pathlib import Path
+
+from rag_pipeline.components import registry
+from rag_pipeline.components.registry import ConfigRegistry
+from rag_pipeline.components.prompts import render_prompt, compile_prompts
+from rag_pipeline.components.models import ModelConfig
+
+
+PROMPTS = """
+Prompts:
+  greeter:
+    input_variables: ["name"]
+    output_schema: "{{}}"
+    system: "You greet people."
+    template: "Hello {name}!"
+"""
+
+
+def test_registry_parses_once_and_reloads_on_mtime_change(tmp_path, monkeypatch):
+    """
+    The YAML file is parsed once and re-parsed only when its mtime changes.
+    """
+    prompts_file = tmp_path / "prompts.yaml"
+    prompts_file.write_text(PROMPTS)
+
+    # === Count YAML parses ===
+    calls = {"n": 0}
+    original = registry.yaml.safe_load
+
+    def counting_safe_load(text):
+        calls["n"] += 1
+        return original(text)
+
+    monkeypatch.setattr(registry.yaml, "safe_load", counting_safe_load)
+
+    for _ in range(5):
+        prompt = render_prompt("greeter", path = prompts_file, name = "Ada")
+
+    assert prompt["user"] == "Hello Ada!"
+    assert calls["n"] == 1, f"❌ Expected a single parse, got {calls['n']}."
+
+    # === Edit the file and bump its mtime ===
+    prompts_file.write_text(PROMPTS.replace("Hello", "Hi"))
+    stat = prompts_file.stat()
+    os.utime(prompts_file, ns = (stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    prompt = render_prompt("greeter", path = prompts_file, name = "Ada")
+    assert prompt["user"] == "Hi Ada!", "❌ Edited prompt was not reloaded."
+    assert calls["n"] == 2
+
+    print("✅ test_registry_parses_once_and_reloads_on_mtime_change passed!")
+
+
+def test_compile_prompts_validates_input_variables():
+    """
+    A template whose placeholders differ from input_variables is rejected at load time.
+    """
+    data = {
+        "Prompts": {
+            "broken": {
+                "input_variables": ["question"],
+                "system": "",
+                "template": "{question} {document}"
+            }
+        }
+    }
+
+    with pytest.raises(ValueError):
+        compile_prompts(data)
+
+    print("✅ test_compile_prompts_validates_input_variables passed!")
+
+
+def test_repo_prompts_and_models_compile():
+    """
+    Every prompt shipped in config/ must pass validation, and ModelConfig reads the shared copy.
+    """
+    compiled = ConfigRegistry().load(Path("config/prompts.yaml"), compiler = compile_prompts)
+    assert "retrieval_grader" in compiled
+
+    assert ModelConfig().config is ModelConfig().config, "❌ ModelConfig should share one parsed config."
+    print("✅ test_repo_prompts_and_models_compile passed!")
@@ -1,11 +1,15 @@
 import pytest
 from pathlib import Path
-from rag_pipeline.components.retriever import create_retriever
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from rag_pipeline.components import retriever as retriever_module
+from rag_pipeline.components.retriever import create_retriever, MANIFEST_NAME
 
-def test_create_retriever_with_texts(tmp_path):
+def test_create_retriever_with_texts(tmp_path, monkeypatch):
     """
-    Tests the create_retriever function with sample text chunks and no tables.
+    Tests the create_retriever function with sample text chunks and no tables
+    (offline: deterministic embeddings, no embedding cache).
     """
+    monkeypatch.setattr(retriever_module, "get_settings", lambda section: {"top_k": 5} if section == "retriever" else {})
 
     # === Prepare mock data ===
     texts = [
@@ -22,12 +26,19 @@ def test_create_retriever_with_texts(tmp_path):
     retriever, save_path = create_retriever(
         texts = texts,
         tables = tables,
-        session_id = "test_session"
+        session_id = "test_session",
+        embeddings = DeterministicFakeEmbedding(size = 16),
+        base_dir = tmp_path
     )
 
     # === Validate retriever and output path ===
     assert retriever is not None, "❌ Retriever should not be None."
     assert isinstance(save_path, Path), "❌ save_path must be a Path object."
     assert "test_session" in str(save_path), "❌ save_path does not contain session_id."
+    assert retriever.invoke("mock text"), "❌ Retriever should find the indexed chunk."
+
+    # === Published like the indexer's: symlink to a versioned folder, with a manifest ===
+    assert save_path.is_symlink() and (save_path / "index.faiss").exists()
+    assert (save_path / MANIFEST_NAME).exists(), "❌ create_retriever should write a manifest."
 
     print("✅ test_create_retriever_with_texts passed!")
\ No newline at end of file
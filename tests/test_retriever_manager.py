@@ -0,0 +1,162 @@
+import asyncio
+import threading
+import pytest
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from rag_pipeline.components.index_factory import MappedFAISS
+from rag_pipeline.components.retriever_manager import RetrieverManager, estimate_retriever_bytes
+
+
+def _save_session(base_dir, session_id, n_docs = 3):
+    """
+    Builds and persists a small FAISS index the same way create_retriever does.
+    """
+    docs = [Document(page_content = f"{session_id} chunk {i}") for i in range(n_docs)]
+    db = FAISS.from_documents(docs, DeterministicFakeEmbedding(size = 16))
+    db.save_local(str(base_dir / session_id))
+    return db
+
+
+def _manager(base_dir, **kwargs):
+    return RetrieverManager(
+        base_dir = base_dir,
+        top_k = 2,
+        embeddings_factory = lambda: DeterministicFakeEmbedding(size = 16),
+        **kwargs
+    )
+
+
+@pytest.mark.asyncio
+async def test_manager_restores_persisted_session_on_miss(tmp_path):
+    """
+    After a restart (empty manager) a persisted session is loaded lazily from disk.
+    """
+    _save_session(tmp_path, "session_a")
+    manager = _manager(tmp_path)
+
+    retriever = await manager.aget("session_a")
+    docs = await retriever.ainvoke("session_a chunk 1")
+    assert len(docs) == 2, "❌ Restored retriever should honour top_k."
+
+    # === Second lookup is served from memory ===
+    assert await manager.aget("session_a") is retriever
+
+    stats = manager.stats()
+    assert stats["misses"] == 1 and stats["hits"] == 1 and stats["loads"] == 1
+    assert stats["load_time_ms_total"] > 0
+
+    with pytest.raises(KeyError):
+        await manager.aget("unknown_session")
+
+    print("✅ test_manager_restores_persisted_session_on_miss passed!")
+
+
+@pytest.mark.asyncio
+async def test_manager_load_locks_are_shared_and_released(tmp_path):
+    """
+    Concurrent cold lookups load a session once; no lock outlives its waiters,
+    including failed lookups of unknown sessions.
+    """
+    _save_session(tmp_path, "session_a")
+    manager = _manager(tmp_path)
+
+    retrievers = await asyncio.gather(*(manager.aget("session_a") for _ in range(8)))
+    assert all(r is retrievers[0] for r in retrievers)
+    assert manager.stats()["loads"] == 1, "❌ Concurrent lookups should share one load."
+
+    for _ in range(3):
+        with pytest.raises(KeyError):
+            await manager.aget("unknown_session")
+
+    results = await asyncio.gather(*(manager.aget("missing") for _ in range(4)), return_exceptions = True)
+    assert all(isinstance(r, KeyError) for r in results)
+    assert manager._load_locks == {} and manager._load_waiters == {}, "❌ Load locks leaked."
+
+    print("✅ test_manager_load_locks_are_shared_and_released passed!")
+
+
+@pytest.mark.asyncio
+async def test_manager_load_does_not_overwrite_published_retriever(tmp_path, monkeypatch):
+    """
+    A retriever published by an ingestion while a disk load is in flight stays resident.
+    """
+    _save_session(tmp_path, "session_a")
+    manager = _manager(tmp_path)
+
+    loading, release = asyncio.Event(), threading.Event()
+    loop = asyncio.get_running_loop()
+    original_load = manager._load_index_dir
+
+    def slow_load(session_id):
+        loop.call_soon_threadsafe(loading.set)
+        release.wait(5)
+        return original_load(session_id)
+
+    monkeypatch.setattr(manager, "_load_index_dir", slow_load)
+
+    pending = asyncio.create_task(manager.aget("session_a"))
+    await loading.wait()
+    published = _save_session(tmp_path, "session_a").as_retriever()
+    manager["session_a"] = published
+    release.set()
+
+    assert await pending is published, "❌ A stale load replaced the published retriever."
+    assert manager.get_resident("session_a") is published
+
+    print("✅ test_manager_load_does_not_overwrite_published_retriever passed!")
+
+
+def test_manager_evicts_least_recently_used_by_count_and_bytes(tmp_path):
+    """
+    Residency is bounded both by the number of sessions and by estimated bytes.
+    """
+    for sid in ("s1", "s2", "s3"):
+        _save_session(tmp_path, sid)
+
+    # === Entry-count bound ===
+    manager = _manager(tmp_path, max_entries = 2)
+    manager.get("s1")
+    manager.get("s2")
+    manager.get("s1")          # s1 becomes most recently used
+    manager.get("s3")          # evicts s2
+
+    assert manager.get_resident("s2") is None, "❌ Coldest session should be evicted."
+    assert manager.get_resident("s1") is not None
+    assert manager.stats()["evictions"] == 1
+
+    # === Byte bound ===
+    one_session = estimate_retriever_bytes(manager.get("s1"))
+    manager = _manager(tmp_path, max_bytes = one_session * 2)
+    for sid in ("s1", "s2", "s3"):
+        manager.get(sid)
+
+    assert manager.stats()["resident_sessions"] == 2
+    assert manager.stats()["resident_bytes"] <= one_session * 2
+
+    print("✅ test_manager_evicts_least_recently_used_by_count_and_bytes passed!")
+
+
+def test_manager_memory_maps_restored_indexes(tmp_path):
+    """
+    Restored indexes are memory-mapped read-only, give the same results as a full
+    load and only their text counts towards the heap budget.
+    """
+    db = _save_session(tmp_path, "s_mmap", n_docs = 50)
+
+    mapped = _manager(tmp_path, mmap = True).get("s_mmap")
+    loaded = _manager(tmp_path, mmap = False).get("s_mmap")
+
+    assert isinstance(mapped.vectorstore, MappedFAISS)
+    assert not isinstance(loaded.vectorstore, MappedFAISS)
+    assert [d.id for d in mapped.invoke("s_mmap chunk 7")] == [d.id for d in loaded.invoke("s_mmap chunk 7")]
+
+    text_bytes = sum(len(doc.page_content) for doc in db.docstore._dict.values())
+    assert estimate_retriever_bytes(mapped) < estimate_retriever_bytes(loaded)
+    assert estimate_retriever_bytes(mapped) >= text_bytes
+
+    with pytest.raises(ValueError):
+        mapped.vectorstore.add_texts(["new chunk"])
+
+    print("✅ test_manager_memory_maps_restored_indexes passed!")
@@ -0,0 +1,195 @@
+import numpy as np
+import pytest
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from rag_pipeline.components import retriever as retriever_module
+from rag_pipeline.components.indexer import update_session_index
+from rag_pipeline.components.retriever_manager import RetrieverManager
+from rag_pipeline.components.shared_store import SessionVectorStore, SharedVectorStore
+
+
+def _add_session(store, session_id, n_docs = 20, dim = 16):
+    """
+    Embeds and stores `n_docs` chunks of a session, returning them with their vectors.
+    """
+    embeddings = DeterministicFakeEmbedding(size = dim)
+    docs = [Document(page_content = f"{session_id} chunk {i}", metadata = {"source": f"{session_id}.txt"}) for i in range(n_docs)]
+    ids = [f"{session_id}-{i}" for i in range(n_docs)]
+    vectors = np.asarray(embeddings.embed_documents([d.page_content for d in docs]), dtype = np.float32)
+    store.update_session(session_id, docs, ids, vectors, manifest = {"version": 1, "files": {f"{session_id}.txt": {"chunk_ids": ids}}})
+    return docs, ids, vectors
+
+
+def test_session_search_matches_flat_faiss(tmp_path):
+    """
+    A session view ranks and scores exactly like a per-session flat FAISS index,
+    and never returns chunks of other sessions.
+    """
+    store = SharedVectorStore(tmp_path / "shared")
+    embeddings = DeterministicFakeEmbedding(size = 16)
+    _add_session(store, "other_a")
+    docs, ids, vectors = _add_session(store, "target")
+    _add_session(store, "other_b")
+
+    view = store.session("target", embeddings)
+    faiss_db = FAISS.from_embeddings(
+        list(zip([d.page_content for d in docs], vectors.tolist())),
+        embeddings,
+        metadatas = [d.metadata for d in docs],
+        ids = ids
+    )
+
+    query = embeddings.embed_query("target chunk 7")
+    ours = view.similarity_search_with_score_by_vector(query, k = 5)
+    theirs = faiss_db.similarity_search_with_score_by_vector(query, k = 5)
+
+    assert [d.id for d, _ in ours] == [d.id for d, _ in theirs], "❌ Ranking should match flat FAISS."
+    assert np.allclose([s for _, s in ours], [s for _, s in theirs], rtol = 1e-4)
+    assert all(d.id.startswith("target-") for d, _ in ours), "❌ Results must stay within the session."
+
+    print("✅ test_session_search_matches_flat_faiss passed!")
+
+
+def test_two_instances_append_to_the_same_store(tmp_path):
+    """
+    Instances opened before the store's first write (one per worker) append after
+    each other's rows, and every session finds its own vectors.
+    """
+    path = tmp_path / "shared"
+    worker_a = SharedVectorStore(path)
+    worker_b = SharedVectorStore(path)
+    embeddings = DeterministicFakeEmbedding(size = 16)
+
+    _add_session(worker_a, "a", n_docs = 5)
+    _, ids_b, vectors_b = _add_session(worker_b, "b", n_docs = 5)
+    assert worker_b.n_rows == 10, "❌ Session b should be appended after session a."
+
+    for store in (worker_a, worker_b, SharedVectorStore(path)):
+        found, score = store.session("b", embeddings).similarity_search_with_score_by_vector(vectors_b[2].tolist(), k = 1)[0]
+        assert found.id == ids_b[2] and score < 1e-5, "❌ A session must find its own vector at distance 0."
+
+    print("✅ test_two_instances_append_to_the_same_store passed!")
+
+
+def test_torn_append_is_dropped(tmp_path):
+    """
+    Bytes of an interrupted append are truncated, so the next session's rows start
+    on a row boundary and its catalog points at its own vectors.
+    """
+    store = SharedVectorStore(tmp_path / "shared")
+    embeddings = DeterministicFakeEmbedding(size = 16)
+    _add_session(store, "a", n_docs = 5)
+
+    with open(store.vectors_path, "ab") as f:
+        f.write(b"\x00" * 24)
+
+    _, ids_b, vectors_b = _add_session(store, "b", n_docs = 5)
+    assert store.vectors_path.stat().st_size == 10 * 16 * 4, "❌ Torn bytes should be dropped."
+
+    for i in range(5):
+        found, score = store.session("b", embeddings).similarity_search_with_score_by_vector(vectors_b[i].tolist(), k = 1)[0]
+        assert found.id == ids_b[i] and score < 1e-5, "❌ Rows after a torn append are shifted."
+
+    print("✅ test_torn_append_is_dropped passed!")
+
+
+def test_update_removes_chunks_and_keeps_manifest(tmp_path):
+    """
+    Removed chunks disappear from the session view; compaction drops their rows
+    without changing search results.
+    """
+    store = SharedVectorStore(tmp_path / "shared")
+    embeddings = DeterministicFakeEmbedding(size = 16)
+    _, ids, _ = _add_session(store, "s1", n_docs = 10)
+    _add_session(store, "s2", n_docs = 10)
+
+    store.update_session("s1", [], [], np.empty((0, 16), dtype = np.float32), remove_ids = ids[:4], manifest = {"version": 1, "files": {}})
+    view = store.session("s1", embeddings)
+    assert sorted(view.docstore._dict) == sorted(ids[4:]), "❌ Removed chunks should be gone."
+    assert store.load_manifest("s1") == {"version": 1, "files": {}}
+
+    query = embeddings.embed_query("s1 chunk 5")
+    before = [d.id for d in view.similarity_search_by_vector(query, k = 3)]
+
+    assert store.compact() == 4, "❌ Compaction should drop the 4 dead rows."
+    assert store.n_rows == 16
+    after = [d.id for d in store.session("s1", embeddings).similarity_search_by_vector(query, k = 3)]
+    assert after == before
+
+    # === Reopening the store sees the same data ===
+    reopened = SharedVectorStore(tmp_path / "shared")
+    assert reopened.has_session("s2") and reopened.dim == 16
+    with pytest.raises(KeyError):
+        reopened.session("missing", embeddings)
+
+    print("✅ test_update_removes_chunks_and_keeps_manifest passed!")
+
+
+@pytest.mark.asyncio
+async def test_manager_restores_sessions_from_shared_store(tmp_path):
+    """
+    In shared mode the manager restores session retrievers from the shared store
+    (no per-session folders) and they search only their own chunks.
+    """
+    store = SharedVectorStore(tmp_path / "shared")
+    _add_session(store, "s1")
+    _add_session(store, "s2")
+
+    manager = RetrieverManager(
+        base_dir = tmp_path / "models",
+        top_k = 3,
+        embeddings_factory = lambda: DeterministicFakeEmbedding(size = 16),
+        shared_store = store
+    )
+    assert manager.on_disk("s1") and not manager.on_disk("s3")
+
+    retriever = await manager.aget("s2")
+    docs = await retriever.ainvoke("s2 chunk 3")
+    assert 0 < len(docs) <= 3
+    assert all(d.id.startswith("s2-") for d in docs), "❌ Restored retriever leaked another session's chunks."
+    assert isinstance(retriever.vectorstore, SessionVectorStore)
+    assert manager.stats()["resident_bytes"] > 0
+
+    print("✅ test_manager_restores_sessions_from_shared_store passed!")
+
+
+def test_indexer_updates_shared_store_incrementally(tmp_path, monkeypatch):
+    """
+    The indexer writes sessions into the shared store and, on re-upload, only
+    embeds changed files and removes the chunks of replaced ones.
+    """
+    monkeypatch.setattr(retriever_module, "get_settings", lambda section: {"top_k": 10} if section == "retriever" else {})
+    store = SharedVectorStore(tmp_path / "shared")
+    session_folder = tmp_path / "data" / "s1"
+    session_folder.mkdir(parents = True)
+    (session_folder / "a.txt").write_text("Alpha content.")
+    (session_folder / "b.txt").write_text("Bravo content.")
+
+    embeddings = DeterministicFakeEmbedding(size = 16)
+    retriever, metadata, changes = update_session_index(
+        session_id = "s1",
+        session_folder = session_folder,
+        base_dir = tmp_path / "models",
+        embeddings = embeddings,
+        shared_store = store
+    )
+    assert sorted(changes["added"]) == ["a.txt", "b.txt"] and len(metadata) == 2
+    assert not (tmp_path / "models").exists(), "❌ Shared mode should not write per-session folders."
+
+    (session_folder / "a.txt").write_text("Alpha rewritten.")
+    retriever, metadata, changes = update_session_index(
+        session_id = "s1",
+        session_folder = session_folder,
+        base_dir = tmp_path / "models",
+        embeddings = embeddings,
+        shared_store = store
+    )
+    assert changes["updated"] == ["a.txt"] and changes["unchanged"] == ["b.txt"]
+
+    contents = sorted(d.page_content for d in store.session("s1", embeddings).docstore._dict.values())
+    assert contents == ["Alpha rewritten.", "Bravo content."], "❌ Replaced chunks should be removed."
+    assert store.n_rows == 3, "❌ Unchanged files should not be re-appended."
+
+    print("✅ test_indexer_updates_shared_store_incrementally passed!")
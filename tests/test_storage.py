@@ -0,0 +1,80 @@
+import io
+import asyncio
+import hashlib
+import tracemalloc
+import pytest
+from fastapi import UploadFile
+
+from rag_pipeline.components.storage import (
+    UploadLimits,
+    UploadTooLarge,
+    stream_upload_to_disk,
+    commit_uploads
+)
+
+CHUNK = 64 * 1024
+
+
+class PatternFile(io.RawIOBase):
+    """
+    Readable stream of `size` bytes that never holds more than one read in memory.
+    """
+    def __init__(self, size: int):
+        self.size = size
+        self.pos = 0
+
+    def readable(self):
+        return True
+
+    def read(self, n = -1):
+        n = self.size - self.pos if n < 0 else min(n, self.size - self.pos)
+        self.pos += n
+        return bytes([self.pos % 251]) * n
+
+
+def _peak_bytes_of_upload(tmp_path, size: int) -> int:
+    upload = UploadFile(file = PatternFile(size), filename = f"file_{size}.pdf")
+    limits = UploadLimits(max_file_bytes = 1 << 40, max_request_bytes = 1 << 40, chunk_size = CHUNK)
+
+    tracemalloc.start()
+    stored = asyncio.run(stream_upload_to_disk(upload, tmp_path, limits))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    commit_uploads([stored])
+    assert stored.size == size and stored.path.stat().st_size == size
+    return peak
+
+
+def test_stream_upload_peak_memory_is_flat(tmp_path):
+    """
+    Peak memory while saving an upload stays at the chunk scale for a 1 MiB and a 64 MiB file.
+    """
+    small = _peak_bytes_of_upload(tmp_path, 1 * 1024 * 1024)
+    large = _peak_bytes_of_upload(tmp_path, 64 * 1024 * 1024)
+
+    assert large < 8 * CHUNK, f"❌ Peak memory grew with the file: {large} bytes."
+    assert large < small + 2 * CHUNK, f"❌ Peak memory not flat: {small} -> {large} bytes."
+    print("✅ test_stream_upload_peak_memory_is_flat passed!")
+
+
+def test_stream_upload_hash_and_limits(tmp_path):
+    """
+    The hash is computed during the write, and limits abort early without a partial file.
+    """
+    content = b"hello world " * 1000
+    upload = UploadFile(file = io.BytesIO(content), filename = "../../escape.txt")
+    stored = asyncio.run(stream_upload_to_disk(upload, tmp_path, UploadLimits(chunk_size = 100)))
+
+    assert stored.sha256 == hashlib.sha256(content).hexdigest(), "❌ Wrong content hash."
+    assert commit_uploads([stored]) == {"escape.txt": stored.sha256}
+    assert (tmp_path / "escape.txt").read_bytes() == content, "❌ File not written inside the folder."
+
+    ## === Per-request limit spans files ===
+    limits = UploadLimits(max_file_bytes = 10_000, max_request_bytes = 15_000, chunk_size = 1000)
+    asyncio.run(stream_upload_to_disk(UploadFile(file = io.BytesIO(b"a" * 9000), filename = "a.txt"), tmp_path, limits))
+    with pytest.raises(UploadTooLarge):
+        asyncio.run(stream_upload_to_disk(UploadFile(file = io.BytesIO(b"b" * 9000), filename = "b.txt"), tmp_path, limits))
+
+    assert not list(tmp_path.glob(".b.txt.*.part")), "❌ Partial file left behind."
+    print("✅ test_stream_upload_hash_and_limits passed!")
@@ -1,6 +1,8 @@
 from fastapi.testclient import TestClient
 from main import app
 import io
+from pathlib import Path
+from rag_pipeline.components.storage import UploadLimits
 
 client = TestClient(app)
 
@@ -10,22 +12,16 @@ def test_upload_endpoint(monkeypatch):
     Tests the /upload/ endpoint by mocking all file-processing logic.
     """
 
-    # === Mock data extraction ===
+    # === Mock incremental indexing ===
     monkeypatch.setattr(
-        "main.extract_data_pipeline",
-        lambda session_folder: (
-            [{"content": "mock text", "metadata": {"source": "mock.pdf"}}],
-            [],
-            [{"file_name": "mock.pdf"}]
+        "main.update_session_index",
+        lambda session_id, session_folder, known_hashes = None, progress = None: (
+            "mock_retriever",
+            [{"file_name": "mock.pdf"}],
+            {"added": ["mock.pdf"], "updated": [], "removed": [], "unchanged": []}
         )
     )
 
-    # === Mock retriever creation ===
-    monkeypatch.setattr(
-        "main.create_retriever",
-        lambda texts, tables, session_id = None: ("mock_retriever", "mock_path")
-    )
-
     # === Mock metadata upload ===
     async def mock_upload_metadata(session_id, file_metadata):
         return None
@@ -50,4 +46,37 @@ def test_upload_endpoint(monkeypatch):
     assert "uploaded_file" in data
     assert data["uploaded_file"].endswith(".pdf")
     assert "✅ Uploaded" in data["message"]
-    print("✅ test_upload_endpoint passed!")
\ No newline at end of file
+    assert data["job_id"], "❌ Upload should return an ingestion job id."
+
+    # === Ingestion runs as a background job; poll its status ===
+    status = client.get(f"/upload/status/{data['job_id']}").json()
+    assert status["status"] == "success"
+    assert status["job_status"] == "completed", f"❌ Job not completed: {status}"
+    assert [stage["name"] for stage in status["stages"]] == ["save", "extract", "embed", "persist", "metadata"]
+    assert status["stages"][0]["status"] == "completed" and status["stages"][0]["duration_s"] is not None
+
+    # === Unknown job ids are reported, not raised ===
+    assert client.get("/upload/status/job_missing").json()["status"] == "failure"
+    print("✅ test_upload_endpoint passed!")
+
+
+# === Upload Size Limits ===
+def test_upload_endpoint_rejects_oversized_file(monkeypatch):
+    """
+    A file above the per-file limit is rejected without leaving a partial file behind.
+    """
+    monkeypatch.setattr(
+        "main.UploadLimits",
+        lambda: UploadLimits(max_file_bytes = 1024, chunk_size = 256)
+    )
+
+    files = [("files", ("big.pdf", io.BytesIO(b"x" * 4096), "application/pdf"))]
+    data = client.post("/upload/", files = files).json()
+
+    assert data["status"] == "failure"
+    assert "per-file limit" in data["message"], f"❌ Unexpected message: {data['message']}"
+
+    session_folder = Path("data") / data["session_id"]
+    assert list(session_folder.iterdir()) == [], "❌ Partial upload was not cleaned up."
+    session_folder.rmdir()
+    print("✅ test_upload_endpoint_rejects_oversized_file passed!")